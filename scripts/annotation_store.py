@@ -0,0 +1,159 @@
+"""
+FILE: annotation_store.py
+PURPOSE: Indexed multi-annotator label store.
+         Claims get an integer index once; each annotator file is attached by
+         a sorted-array lookup into a wide (claims x annotators) int8 label
+         matrix, with MISSING where an annotator did not label a claim.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+from claims_loader import CATEGORIES, load_claims, load_annotations, DATA_DIR
+
+MISSING = -1
+
+
+class AnnotationStore:
+    """
+    Wide label matrix keyed by claim index.
+
+    labels[i, j]   -> category code given by annotator j to claim i (or MISSING)
+    boundary[i, j] -> 1/0 boundary flag (or MISSING)
+    """
+
+    def __init__(self, claim_ids):
+        self.claim_ids = np.asarray(claim_ids, dtype=str)
+        if len(np.unique(self.claim_ids)) != len(self.claim_ids):
+            raise ValueError("claim_ids must be unique")
+        self._order = np.argsort(self.claim_ids, kind='stable')
+        self._sorted_ids = self.claim_ids[self._order]
+        self.annotators = []
+        self._labels = []
+        self._boundary = []
+        self._matrix = None
+
+    @classmethod
+    def from_claims(cls, claims_df, annotator='annotator1'):
+        """Index the claims dataset and attach its own labels as the first annotator."""
+        store = cls(claims_df['claim_id'].to_numpy())
+        store.add_annotator(annotator, claims_df['claim_id'].to_numpy(), claims_df['category'],
+                            claims_df['boundary_case'] if 'boundary_case' in claims_df else None)
+        return store
+
+    def __len__(self):
+        return len(self.claim_ids)
+
+    def index_of(self, claim_ids):
+        """Claim index for each id (MISSING for ids not in the claims dataset)."""
+        claim_ids = np.asarray(claim_ids, dtype=str)
+        pos = np.searchsorted(self._sorted_ids, claim_ids)
+        pos = np.minimum(pos, len(self._sorted_ids) - 1)
+        found = self._sorted_ids[pos] == claim_ids
+        return np.where(found, self._order[pos], MISSING).astype(np.int64)
+
+    def add_annotator(self, name, claim_ids, categories, boundary=None):
+        """
+        Attach one annotator's labels. `categories` may be names or codes.
+        Returns the number of labels whose claim_id is not in the dataset.
+        """
+        if name in self.annotators:
+            raise ValueError(f"annotator '{name}' already attached")
+
+        idx = self.index_of(claim_ids)
+        hit = idx != MISSING
+
+        categories = np.asarray(categories)
+        if np.issubdtype(categories.dtype, np.integer):
+            codes = categories
+        else:
+            codes = pd.Categorical(categories, categories=CATEGORIES).codes
+        labels = np.full(len(self), MISSING, dtype=np.int8)
+        labels[idx[hit]] = codes[hit]
+
+        flags = np.full(len(self), MISSING, dtype=np.int8)
+        if boundary is not None:
+            flags[idx[hit]] = np.asarray(boundary, dtype=bool)[hit]
+
+        self.annotators.append(name)
+        self._labels.append(labels)
+        self._boundary.append(flags)
+        self._matrix = None
+        return int((~hit).sum())
+
+    def add_annotations(self, annotations_df, name=None):
+        """Attach a frame returned by claims_loader.load_annotations."""
+        name = name or annotations_df.attrs.get('annotator', f'annotator{len(self.annotators) + 1}')
+        boundary = annotations_df['boundary_case'] if 'boundary_case' in annotations_df else None
+        return self.add_annotator(name, annotations_df['claim_id'].to_numpy(),
+                                  annotations_df['category'], boundary)
+
+    def add_file(self, path, name=None):
+        annotations, errors = load_annotations(path)
+        return self.add_annotations(annotations, name), errors
+
+    def _stacked(self):
+        # Columns are stacked once per change, not once per access
+        if self._matrix is None:
+            if self._labels:
+                self._matrix = (np.column_stack(self._labels), np.column_stack(self._boundary))
+            else:
+                empty = np.empty((len(self), 0), dtype=np.int8)
+                self._matrix = (empty, empty)
+        return self._matrix
+
+    @property
+    def labels(self):
+        """(n_claims, n_annotators) int8 label matrix."""
+        return self._stacked()[0]
+
+    @property
+    def boundary(self):
+        """(n_claims, n_annotators) int8 boundary flags."""
+        return self._stacked()[1]
+
+    def column(self, name):
+        return self.annotators.index(name)
+
+    def coverage(self):
+        """Labels per annotator."""
+        return dict(zip(self.annotators, (self.labels != MISSING).sum(axis=0).tolist()))
+
+    def pair_frame(self, a, b):
+        """
+        Claims labeled by both annotators `a` and `b`, in claim order:
+        claim_index, claim_id, <a>, <b> (category names), <a>_boundary, <b>_boundary.
+        """
+        ja, jb = self.column(a), self.column(b)
+        labels, boundary = self.labels, self.boundary
+        both = np.flatnonzero((labels[:, ja] != MISSING) & (labels[:, jb] != MISSING))
+        names = np.array(CATEGORIES, dtype=object)
+        return pd.DataFrame({
+            'claim_index': both,
+            'claim_id': self.claim_ids[both],
+            a: names[labels[both, ja]],
+            b: names[labels[both, jb]],
+            f'{a}_boundary': boundary[both, ja] == 1,
+            f'{b}_boundary': boundary[both, jb] == 1,
+        })
+
+
+def main():
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: ANNOTATION STORE")
+    print("=" * 80)
+
+    claims, _ = load_claims()
+    store = AnnotationStore.from_claims(claims)
+    for path in sorted(os.listdir(DATA_DIR)):
+        if path.startswith('annotator') and path.endswith('_classifications.csv'):
+            unmatched, errors = store.add_file(os.path.join(DATA_DIR, path))
+            print(f"[+] Attached {path} ({unmatched} unmatched claim_ids, {len(errors)} invalid values)")
+
+    print(f"\nLabel matrix: {store.labels.shape[0]} claims x {store.labels.shape[1]} annotators")
+    for name, n in store.coverage().items():
+        print(f"  {name:15s} {n} labels")
+
+
+if __name__ == "__main__":
+    main()
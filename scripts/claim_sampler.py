@@ -0,0 +1,195 @@
+"""
+FILE: claim_sampler.py
+PURPOSE: Stratified claim sampling for annotation, in one streaming pass.
+         Candidate claims stream out of report_ingest; each section keeps a
+         fixed-size reservoir (Algorithm R), so every candidate in a section
+         has the same chance of being drawn whatever the report length, and
+         memory is O(quota) per report. The default quotas are the
+         methodology's 50-claim sample (Climate 20, Sustainable Finance 20,
+         Human Capital 10). Each report's draw is seeded from (seed,
+         report_id), so a season sample is reproducible and does not depend
+         on the order reports are read. Only sampled candidates get element
+         extraction / pre-labels, and rows keep the claim_id and page they
+         would have in the full ingestion.
+"""
+
+import pandas as pd
+import argparse
+import glob
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from claims_loader import REPORT_COL, load_claims
+from instrumentation import current_rss, MB
+from report_ingest import SECTION_HEADINGS, claim_rows, iter_candidates, write_claims_csv
+
+QUOTAS = {'Climate': 20, 'Sustainable Finance': 20, 'Human Capital': 10}
+SCOPES = ('report', 'season')
+
+
+class StratifiedReservoir:
+    """One uniform fixed-size reservoir per section (Algorithm R)."""
+
+    def __init__(self, quotas, rng):
+        self.quotas = dict(quotas)
+        self.rng = rng
+        self.items = {s: [] for s in self.quotas}
+        self.seen = {s: 0 for s in self.quotas}
+
+    def offer(self, section, item):
+        if section not in self.quotas:
+            return
+        seen = self.seen[section]
+        self.seen[section] = seen + 1
+        reservoir = self.items[section]
+        if seen < self.quotas[section]:
+            reservoir.append(item)
+        else:
+            j = self.rng.randrange(seen + 1)
+            if j < self.quotas[section]:
+                reservoir[j] = item
+
+    def sample(self):
+        """Sampled items of every section, in stream order."""
+        return sorted(item for items in self.items.values() for item in items)
+
+
+def report_rng(seed, report_id):
+    # String seeds are hashed with SHA-512, so this is stable across runs and platforms
+    return random.Random(f'{seed}:{report_id}')
+
+
+def report_id_of(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def iter_sampled_rows(paths, quotas=QUOTAS, seed=0, scope='report', prelabel=False, summary=None):
+    """
+    Stream claims-schema rows of a stratified sample over `paths`.
+
+    scope='report' draws the quotas from every report (memory O(quota));
+    scope='season' draws them once from all candidates of all reports,
+    seeded by `seed` alone. Rows come out in report / stream order. If a
+    list is given as `summary`, one (report_id, section, candidates,
+    sampled) tuple per report and section is appended to it.
+    """
+    if scope not in SCOPES:
+        raise ValueError(f'scope must be one of {SCOPES}')
+    season = StratifiedReservoir(quotas, random.Random(f'{seed}:season')) if scope == 'season' else None
+    report_ids = []
+    for r, path in enumerate(paths):
+        report_id = report_id_of(path)
+        report_ids.append(report_id)
+        reservoir = season or StratifiedReservoir(quotas, report_rng(seed, report_id))
+        before = dict(reservoir.seen)
+        n = 0
+        for candidate in iter_candidates(path):
+            if candidate[1] in quotas:
+                n += 1      # position among focal-section candidates, as in iter_claim_rows
+                reservoir.offer(candidate[1], (r, n, candidate))
+        if season is None:
+            yield from _rows(reservoir.sample(), report_ids, prelabel)
+        if summary is not None:
+            for section in quotas:
+                seen = reservoir.seen[section] - before[section]
+                summary.append((report_id, section, seen, min(seen, quotas[section]) if season is None else None))
+    if season is not None:
+        sample = season.sample()
+        yield from _rows(sample, report_ids, prelabel)
+        if summary is not None:
+            drawn = Counter((report_ids[r], candidate[1]) for r, _, candidate in sample)
+            summary[:] = [(rid, sec, seen, drawn[rid, sec]) for rid, sec, seen, _ in summary]
+
+
+def _rows(sample, report_ids, prelabel):
+    """Rows for sampled (report index, n, candidate) items, one report at a time."""
+    for r in sorted({item[0] for item in sample}):
+        numbered = [(n, candidate) for i, n, candidate in sample if i == r]
+        yield from claim_rows(numbered, report_ids[r], prelabel)
+
+
+def sample_reports(paths, out_path, **kwargs):
+    """Batch job: stratified sample of `paths` into one claims CSV. Returns (rows, summary frame)."""
+    summary = []
+    n = write_claims_csv(iter_sampled_rows(paths, summary=summary, **kwargs), out_path)
+    return n, pd.DataFrame(summary, columns=[REPORT_COL, 'section', 'candidates', 'sampled'])
+
+
+def write_synthetic_season(claims, out_dir, n_reports, sentences_per_section=2000, seed=0):
+    """
+    Plain-text reports (form-feed pages, CAPS section banners) built from
+    resampled verbatim claims, standing in for a season of pdftotext output.
+    """
+    rng = random.Random(seed)
+    by_section = {s: list(g['verbatim_text']) for s, g in claims.groupby('section', observed=True)}
+    banner = {section: heading.upper() for heading, section in reversed(list(SECTION_HEADINGS.items()))}
+    paths = []
+    for i in range(n_reports):
+        path = os.path.join(out_dir, f'R{i:05d}.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            for section, texts in by_section.items():
+                f.write(f'{banner[section]}\n\n')
+                for k in range(rng.randint(sentences_per_section // 2, sentences_per_section)):
+                    f.write(rng.choice(texts) + '\n\n')
+                    if k % 20 == 19:
+                        f.write('\f')
+                f.write('\f')
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seeded stratified reservoir sample of candidate claims.')
+    parser.add_argument('output', nargs='?', help='claims CSV to write')
+    parser.add_argument('reports', nargs='*', help='report .txt files or glob patterns (default: synthetic season)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scope', choices=SCOPES, default='report', help='quotas per report or for the whole season')
+    parser.add_argument('--prelabel', action='store_true', help='fill category/weight with the pre-classifier')
+    parser.add_argument('--synthetic-reports', type=int, default=100)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: STRATIFIED CLAIM SAMPLING")
+    print("=" * 80)
+
+    # Synthetic reports, an unnamed sample and the reproducibility check go away on exit
+    with tempfile.TemporaryDirectory(prefix='cscore_sample_') as work_dir:
+        run_demo(args, work_dir)
+
+
+def run_demo(args, work_dir):
+    output = args.output or os.path.join(work_dir, 'sampled_claims.csv')
+    if args.reports:
+        paths = sorted(p for pattern in args.reports for p in glob.glob(pattern))
+    else:
+        claims, _ = load_claims()
+        paths = write_synthetic_season(claims, work_dir, args.synthetic_reports)
+        print(f"[+] Synthetic season: {len(paths)} reports (temporary)")
+
+    rss_before = current_rss()
+    start = time.perf_counter()
+    n, summary = sample_reports(paths, output, seed=args.seed, scope=args.scope, prelabel=args.prelabel)
+    elapsed = time.perf_counter() - start
+    totals = summary.groupby('section', sort=False)[['candidates', 'sampled']].sum()
+    print(f"[+] Sampled {n:,} of {int(totals['candidates'].sum()):,} candidate claims from {len(paths)} reports "
+          f"in {elapsed:.1f}s (RSS {rss_before / MB:.0f} -> {current_rss() / MB:.0f} MB) "
+          f"-> {output if args.output else 'temporary CSV (pass an output path to keep it)'}")
+    for section, row in totals.iterrows():
+        print(f"  {section:20s} {row['sampled']:>7,} of {row['candidates']:>10,}")
+    short = summary[summary['candidates'] < summary['section'].map(QUOTAS)]
+    if len(short):
+        print(f"[!] {len(short)} report sections have fewer candidates than their quota (all kept)")
+
+    # Same seed, reports read in reverse order -> identical sample
+    if args.scope == 'report' and len(paths) > 1:
+        again = os.path.join(work_dir, 'resampled_claims.csv')
+        sample_reports(paths[::-1], again, seed=args.seed, prelabel=args.prelabel)
+        first = pd.read_csv(output, dtype=str).sort_values('claim_id', ignore_index=True)
+        second = pd.read_csv(again, dtype=str).sort_values('claim_id', ignore_index=True)
+        print(f"[+] Reproducible with reports read in reverse order: {first.equals(second)}")
+
+
+if __name__ == "__main__":
+    main()
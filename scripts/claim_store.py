@@ -0,0 +1,183 @@
+"""
+FILE: claim_store.py
+PURPOSE: Compact array-backed claim store.
+         Scoring columns live in contiguous fixed-width NumPy arrays; text
+         columns live in one memory-mapped UTF-8 blob indexed by offsets and
+         are only touched when a claim's text is actually requested.
+"""
+
+import numpy as np
+import json
+import os
+from claims_loader import load_claims, ELEMENT_COLUMNS, DATA_DIR
+from scoring_kernel import score_report, section_scores
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXT_COLUMNS = ['verbatim_text', 'classification_rationale', 'subsection']
+
+# Fixed-width scoring arrays
+ARRAY_DTYPES = {
+    'category': np.int8,
+    'weight': np.float32,
+    'tactic_mask': np.uint8,
+    'section': np.int16,
+    'page': np.int16,
+    'element_mask': np.uint8,
+}
+
+# float32 weights are rounded back to this many decimals before summing,
+# so 1.2 scores as 1.2 and not 1.2000000476837158
+WEIGHT_DECIMALS = 6
+
+
+class ClaimStore:
+    """
+    Scoring arrays plus a lazily opened text blob.
+
+    Build one from a loaded claims DataFrame with ClaimStore.build(df, directory)
+    and reopen it later with ClaimStore.open(directory).
+    """
+
+    def __init__(self, directory, arrays, claim_ids, section_names, text_columns):
+        self.directory = directory
+        self.arrays = arrays
+        self.claim_ids = claim_ids
+        self.section_names = section_names
+        self.text_columns = text_columns
+        self._blob = None
+        self._offsets = None
+
+    def __len__(self):
+        return len(self.claim_ids)
+
+    def __getattr__(self, name):
+        arrays = self.__dict__.get('arrays', {})
+        if name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    # --- BUILD / OPEN ---
+
+    @classmethod
+    def build(cls, df, directory, text_columns=TEXT_COLUMNS):
+        """Write the arrays and text blob for a loaded claims DataFrame."""
+        os.makedirs(directory, exist_ok=True)
+        n = len(df)
+
+        element_mask = np.zeros(n, dtype=np.uint8)
+        for bit, column in enumerate(ELEMENT_COLUMNS):
+            if column in df.columns:
+                element_mask |= (df[column].to_numpy(dtype=bool).astype(np.uint8) << bit)
+
+        arrays = {
+            'category': df['category'].cat.codes.to_numpy(),
+            'weight': df['weight'].to_numpy(),
+            'tactic_mask': df['tactic_mask'].to_numpy(),
+            'section': df['section'].cat.codes.to_numpy(),
+            'page': df['page'].to_numpy(),
+            'element_mask': element_mask,
+        }
+        for name, dtype in ARRAY_DTYPES.items():
+            arrays[name] = np.ascontiguousarray(arrays[name], dtype=dtype)
+            np.save(os.path.join(directory, f'{name}.npy'), arrays[name])
+
+        claim_ids = df['claim_id'].to_numpy(dtype='S')
+        np.save(os.path.join(directory, 'claim_id.npy'), claim_ids)
+
+        # Text blob: one UTF-8 byte string per (column, claim), offsets[c, i]..offsets[c, i + 1]
+        offsets = np.zeros((len(text_columns), n + 1), dtype=np.int64)
+        position = 0
+        with open(os.path.join(directory, 'text.bin'), 'wb') as blob:
+            for c, column in enumerate(text_columns):
+                offsets[c, 0] = position
+                encoded = [t.encode('utf-8') for t in df[column].fillna('').astype(str)]
+                lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=n)
+                offsets[c, 1:] = position + np.cumsum(lengths)
+                blob.write(b''.join(encoded))
+                position = int(offsets[c, -1])
+        np.save(os.path.join(directory, 'text_offsets.npy'), offsets)
+
+        meta = {
+            'n_claims': n,
+            'section_names': [str(s) for s in df['section'].cat.categories],
+            'text_columns': list(text_columns),
+        }
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=4)
+
+        return cls.open(directory)
+
+    @classmethod
+    def open(cls, directory, mmap_mode=None):
+        """Load the scoring arrays; the text blob stays on disk until needed."""
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+                  for name in ARRAY_DTYPES}
+        claim_ids = np.load(os.path.join(directory, 'claim_id.npy'), mmap_mode=mmap_mode)
+        return cls(directory, arrays, claim_ids, meta['section_names'], meta['text_columns'])
+
+    # --- TEXT ACCESS ---
+
+    def _open_text(self):
+        if self._blob is None:
+            path = os.path.join(self.directory, 'text.bin')
+            # np.memmap cannot map an empty file
+            self._blob = np.memmap(path, dtype=np.uint8, mode='r') if os.path.getsize(path) else np.zeros(0, np.uint8)
+            self._offsets = np.load(os.path.join(self.directory, 'text_offsets.npy'), mmap_mode='r')
+
+    def text(self, index, column='verbatim_text'):
+        """Text of one claim, decoded from the memory-mapped blob."""
+        self._open_text()
+        c = self.text_columns.index(column)
+        start, end = self._offsets[c, index], self._offsets[c, index + 1]
+        return bytes(self._blob[start:end]).decode('utf-8')
+
+    def claim_id(self, index):
+        return self.claim_ids[index].decode('utf-8')
+
+    # --- SCORING ---
+
+    def weights(self):
+        """Weights as float64, with float32 storage error rounded away."""
+        return np.round(self.weight.astype(np.float64), WEIGHT_DECIMALS)
+
+    def score(self):
+        """Report-level results in the shape of validation_results.json."""
+        results = score_report(self.category, self.weights(), self.tactic_mask)
+        scores = section_scores(self.section, len(self.section_names), self.category, self.weights())
+        results['section_scores'] = {name: float(s) for name, s in sorted(zip(self.section_names, scores))
+                                     if not np.isnan(s)}
+        return results
+
+    @property
+    def nbytes(self):
+        """Resident bytes of the scoring columns (text excluded)."""
+        return sum(a.nbytes for a in self.arrays.values())
+
+
+def main():
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: CLAIM STORE")
+    print("=" * 80)
+
+    df, errors = load_claims()
+    store_dir = os.path.join(DATA_DIR, 'claim_store')
+    store = ClaimStore.build(df, store_dir)
+    print(f"[+] Built store for {len(store)} claims in {os.path.relpath(store_dir, BASE_DIR)}")
+
+    frame_bytes = df.memory_usage(deep=True).sum()
+    print(f"  DataFrame (deep):     {frame_bytes / 1024:8.1f} KiB")
+    print(f"  Scoring arrays:       {store.nbytes / 1024:8.1f} KiB")
+    print(f"  Text blob (on disk):  {os.path.getsize(os.path.join(store_dir, 'text.bin')) / 1024:8.1f} KiB")
+
+    results = store.score()
+    print(f"\n  Final C_Score:     {results['final_c_score']:.2f}")
+    for section, score in results['section_scores'].items():
+        print(f"  {section:20s} {score:.2f}")
+    print(f"\n  {store.claim_id(0)}: {store.text(0)[:70]}...")
+
+
+if __name__ == "__main__":
+    main()
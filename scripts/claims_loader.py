@@ -0,0 +1,330 @@
+"""
+FILE: claims_loader.py
+PURPOSE: Typed, validated loader for the claims dataset and annotator files.
+         Converts boundary/element flags to booleans and category, section
+         and tactic columns to compact codes in a single vectorized pass.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+
+# --- PATH SETUP ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+# --- TAXONOMY ---
+# Order matters: the position of a category / tactic is its integer code.
+CATEGORIES = (
+    'QuantitativeTarget',
+    'VerifiedClaim',
+    'PeripheralClaim',
+    'VagueTarget',
+    'AmbiguousBaseline',
+    'OffsetsOnly',
+    'NonClaim',
+)
+NONCLAIM_CODE = CATEGORIES.index('NonClaim')
+
+# Theoretical weights (WEIGHT_JUSTIFICATION.md)
+CATEGORY_WEIGHTS = {
+    'QuantitativeTarget': 1.2,
+    'VerifiedClaim': 1.2,
+    'PeripheralClaim': 0.3,
+    'VagueTarget': -0.8,
+    'AmbiguousBaseline': -0.8,
+    'OffsetsOnly': -0.5,
+    'NonClaim': 0.0,
+}
+
+SECTIONS = ('Climate', 'Sustainable Finance', 'Human Capital')
+
+# Bit i of a tactic mask is TACTICS[i]
+TACTICS = (
+    'ScopeOmission',
+    'IntensityTricks',
+    'SelectiveDisclosure',
+    'BaselineManipulation',
+    'WeakTargets',
+    'OffsetsOnly',
+)
+TACTIC_BITS = {t: 1 << i for i, t in enumerate(TACTICS)}
+
+# Penalties as fractions (same values as c_score_calculator.py)
+TACTIC_PENALTIES = {
+    'ScopeOmission': 0.15,
+    'IntensityTricks': 0.10,
+    'SelectiveDisclosure': 0.12,
+    'BaselineManipulation': 0.08,
+    'WeakTargets': 0.11,
+    'OffsetsOnly': 0.05,
+}
+
+ELEMENT_COLUMNS = [
+    'required_elements_numeric',
+    'required_elements_deadline',
+    'required_elements_baseline',
+    'required_elements_scope',
+]
+
+# Required columns of the claims dataset and how each one is parsed
+CLAIM_SCHEMA = {
+    'claim_id': 'id',
+    'section': 'section',
+    'page': 'int',
+    'subsection': 'str',
+    'verbatim_text': 'str',
+    'category': 'category',
+    'weight': 'float',
+    'classification_rationale': 'str',
+    'boundary_case': 'bool',
+    'required_elements_numeric': 'bool',
+    'required_elements_deadline': 'bool',
+    'required_elements_baseline': 'bool',
+    'required_elements_scope': 'bool',
+    'tactic_flags': 'tactics',
+}
+
+# Optional column naming the report (company filing) a claim belongs to. Every
+# multi-report output keys on it, so they can be joined with each other
+REPORT_COL = 'report_id'
+
+# Annotator files use '<annotator>_<field>' column names
+ANNOTATION_FIELDS = {
+    'category': 'category',
+    'rationale': 'str',
+    'confidence': 'str',
+    'boundary_case': 'bool',
+}
+
+TRUE_VALUES = ('TRUE', 'T', 'YES', 'Y', '1')
+FALSE_VALUES = ('FALSE', 'F', 'NO', 'N', '0', '')
+
+ERROR_COLUMNS = ['line', 'claim_id', 'column', 'value', 'message']
+
+
+class ClaimSchemaError(ValueError):
+    """Raised when a file cannot be loaded; `errors` holds the row-level report."""
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors if errors is not None else pd.DataFrame(columns=ERROR_COLUMNS)
+
+
+def _row_errors(raw, mask, column, message):
+    """Collect one error record per row selected by `mask`."""
+    if not mask.any():
+        return None
+    bad = raw.loc[mask]
+    return pd.DataFrame({
+        'line': bad.index.to_numpy() + 2,  # header is line 1
+        'claim_id': bad['claim_id'].to_numpy() if 'claim_id' in bad else '',
+        'column': column,
+        'value': bad[column].to_numpy(),
+        'message': message,
+    })
+
+
+def parse_bool(raw_col):
+    """Map TRUE/FALSE, Yes/No, 1/0 text to booleans. Returns (values, invalid_mask)."""
+    key = raw_col.str.strip().str.upper()
+    is_true = key.isin(TRUE_VALUES)
+    invalid = ~(is_true | key.isin(FALSE_VALUES))
+    return is_true.to_numpy(), invalid.to_numpy()
+
+
+def parse_tactics(raw_col):
+    """
+    Convert comma-separated tactic flags to a uint8 bitmask.
+    Returns (mask, invalid_mask); unknown flag names mark the row invalid.
+    """
+    flags = raw_col.str.replace(' ', '', regex=False)
+    dummies = flags.str.get_dummies(sep=',')
+    mask = np.zeros(len(raw_col), dtype=np.uint8)
+    invalid = np.zeros(len(raw_col), dtype=bool)
+    for name in dummies.columns:
+        hit = dummies[name].to_numpy().astype(bool)
+        if name in TACTIC_BITS:
+            mask[hit] |= np.uint8(TACTIC_BITS[name])
+        else:
+            invalid |= hit
+    return mask, invalid
+
+
+def tactic_names(mask):
+    """Inverse of parse_tactics for a single mask value."""
+    return [t for t in TACTICS if int(mask) & TACTIC_BITS[t]]
+
+
+def format_tactics(masks):
+    """uint8 masks -> comma-separated tactic_flags strings ('' for no flags)."""
+    masks = np.asarray(masks, dtype=np.uint8)
+    table = np.array([','.join(tactic_names(m)) for m in range(256)], dtype=object)
+    return table[masks]
+
+
+def _parse_columns(raw, schema):
+    """Parse `raw` (all-text) columns per `schema`; returns (typed, error frames)."""
+    typed = {}
+    errors = []
+
+    for column, kind in schema.items():
+        col = raw[column]
+        if kind == 'id':
+            stripped = col.str.strip()
+            typed[column] = stripped
+            errors.append(_row_errors(raw, (stripped == '').to_numpy(), column, 'empty claim_id'))
+            errors.append(_row_errors(raw, stripped.duplicated(keep='first').to_numpy() & (stripped != '').to_numpy(),
+                                      column, 'duplicate claim_id'))
+        elif kind in ('int', 'float'):
+            values = pd.to_numeric(col.str.strip(), errors='coerce')
+            invalid = values.isna().to_numpy()
+            if kind == 'int':
+                invalid = invalid | (values.fillna(0) % 1 != 0).to_numpy()
+                typed[column] = values.fillna(0).astype(np.int32)
+            else:
+                typed[column] = values.astype(np.float64)
+            errors.append(_row_errors(raw, invalid, column, f'not a valid {kind}'))
+        elif kind == 'bool':
+            values, invalid = parse_bool(col)
+            typed[column] = values
+            errors.append(_row_errors(raw, invalid, column, 'not a boolean (TRUE/FALSE, Yes/No)'))
+        elif kind == 'category':
+            values = pd.Categorical(col.str.strip(), categories=CATEGORIES)
+            typed[column] = values
+            errors.append(_row_errors(raw, np.asarray(values.codes) < 0, column, 'unknown category'))
+        elif kind == 'section':
+            stripped = col.str.strip()
+            extra = sorted(set(stripped.unique()) - set(SECTIONS) - {''})
+            typed[column] = pd.Categorical(stripped, categories=list(SECTIONS) + extra)
+            errors.append(_row_errors(raw, (stripped == '').to_numpy(), column, 'empty section'))
+        elif kind == 'tactics':
+            mask, invalid = parse_tactics(col)
+            typed[column] = col.str.strip()
+            typed['tactic_mask'] = mask
+            errors.append(_row_errors(raw, invalid, column, 'unknown tactic flag'))
+        else:
+            typed[column] = col
+
+    errors = [e for e in errors if e is not None]
+    if errors:
+        errors = pd.concat(errors, ignore_index=True).sort_values(['line', 'column'], kind='stable')
+    else:
+        errors = pd.DataFrame(columns=ERROR_COLUMNS)
+    return pd.DataFrame(typed, index=raw.index), errors.reset_index(drop=True)
+
+
+def _read_text_csv(path, required):
+    """Read every column as text and check the schema before parsing."""
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = [c for c in required if c not in raw.columns]
+    if missing:
+        raise ClaimSchemaError(f"{os.path.basename(path)}: missing columns {missing}")
+    return raw
+
+
+def load_claims(path=None, strict=False):
+    """
+    Load and validate a claims dataset.
+
+    Returns (df, errors). `df` holds only valid rows, with booleans for the
+    boundary/element flags, `category`/`section` as categoricals and a uint8
+    `tactic_mask` next to the original `tactic_flags` text. `errors` lists one
+    row per problem (line, claim_id, column, value, message). With
+    strict=True any problem raises ClaimSchemaError instead.
+    """
+    if path is None:
+        path = os.path.join(DATA_DIR, 'morgan_stanley_claims_dataset.csv')
+    raw = _read_text_csv(path, CLAIM_SCHEMA)
+
+    # Optional columns (multi-report corpora) are kept as plain text
+    schema = dict(CLAIM_SCHEMA)
+    for column in raw.columns:
+        schema.setdefault(column, 'str')
+
+    df, errors = _parse_columns(raw, schema)
+    if len(errors) and strict:
+        raise ClaimSchemaError(f"{os.path.basename(path)}: {len(errors)} invalid values", errors)
+
+    bad_rows = errors['line'].to_numpy(dtype=np.int64) - 2
+    df = df.drop(index=np.unique(bad_rows)).reset_index(drop=True)
+    return df, errors
+
+
+def scoring_frame(claims):
+    """load_claims frame with category/section as plain strings, as the scoring scripts group on them."""
+    return claims.astype({'category': object, 'section': object})
+
+
+def annotator_prefix(columns):
+    """Infer the annotator name from '<annotator>_category'."""
+    prefixes = [c[:-len('_category')] for c in columns if c.endswith('_category')]
+    if len(prefixes) != 1:
+        raise ClaimSchemaError(f"cannot infer annotator from columns {list(columns)}")
+    return prefixes[0]
+
+
+def load_annotations(path, annotator=None, strict=False):
+    """
+    Load an annotator file ('claim_id', '<annotator>_category', ...).
+
+    Columns are renamed to the generic field names (category, rationale,
+    confidence, boundary_case) and the annotator name is kept in
+    df.attrs['annotator']. Returns (df, errors) like load_claims.
+    """
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+    if annotator is None:
+        annotator = annotator_prefix(raw.columns)
+
+    schema = {'claim_id': 'id'}
+    rename = {}
+    for field, kind in ANNOTATION_FIELDS.items():
+        column = f'{annotator}_{field}'
+        if column in raw.columns:
+            schema[column] = kind
+            rename[column] = field
+    if 'claim_id' not in raw.columns or f'{annotator}_category' not in raw.columns:
+        raise ClaimSchemaError(f"{os.path.basename(path)}: missing claim_id or {annotator}_category")
+
+    df, errors = _parse_columns(raw, schema)
+    if len(errors) and strict:
+        raise ClaimSchemaError(f"{os.path.basename(path)}: {len(errors)} invalid values", errors)
+
+    df = df.drop(index=np.unique(errors['line'].to_numpy(dtype=np.int64) - 2)).reset_index(drop=True)
+    df = df.rename(columns=rename)
+    df.attrs['annotator'] = annotator
+    return df, errors
+
+
+def print_errors(errors, limit=20):
+    """Print a bounded row-level error report."""
+    if len(errors) == 0:
+        print("[+] No invalid rows")
+        return
+    print(f"[!] {len(errors)} invalid values in {errors['line'].nunique()} rows:")
+    for _, e in errors.head(limit).iterrows():
+        print(f"    line {e['line']} ({e['claim_id']}): {e['column']}={e['value']!r} -> {e['message']}")
+    if len(errors) > limit:
+        print(f"    ... {len(errors) - limit} more")
+
+
+def main():
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: CLAIMS LOADER")
+    print("=" * 80)
+
+    df, errors = load_claims()
+    print(f"[+] Loaded {len(df)} valid claims")
+    print_errors(errors)
+
+    ann, ann_errors = load_annotations(os.path.join(DATA_DIR, 'annotator2_classifications.csv'))
+    print(f"[+] Loaded {len(ann)} labels from annotator '{ann.attrs['annotator']}'")
+    print_errors(ann_errors)
+
+    print("\nColumn types:")
+    print(df.dtypes.to_string())
+    print(f"\nMemory (deep): {df.memory_usage(deep=True).sum() / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+FILE: contribution_index.py
+PURPOSE: Per-claim contribution attribution.
+         A claim's contribution is the exact change in its report's C_Score
+         (and its section's score) if the claim were removed: it includes the
+         claim's weight, its effect on the adaptive n_eff and its tactic
+         penalties. All contributions follow from the per-group sums of one
+         group_aggregates pass, so every claim is attributed without
+         rescoring. Only results_export reuses its scoring pass's sums
+         (leave_one_out(..., agg=)) for the claims table's contribution
+         column. The stored index is built by ContributionIndex.build, which
+         runs its own pass; c_score_calculator.compute_scores (pandas) does
+         not feed attribution.
+         Results are stored as a columnar side table (.npz) indexed by
+         claim_id, sorted per report for top-k queries.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+from claims_loader import NONCLAIM_CODE, REPORT_COL, load_claims
+from scoring_kernel import PENALTY_TABLE, effective_denominator, final_score, group_aggregates
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+DEFAULT_PATH = os.path.join(DATA_DIR, 'contribution_index.npz')
+
+
+def _section_score(weighted_sum, n_eff):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(n_eff > 0, 100 * weighted_sum / n_eff, 0.0)
+
+
+def leave_one_out(group_ids, n_groups, category, weight, tactic_mask=None, penalized=True, agg=None):
+    """
+    (group score, per-claim contribution) where contribution = score of the
+    claim's group minus the score of that group without the claim.
+    penalized=True uses the report formula (penalties, clamp to [0, 100]);
+    False uses the section formula (100 * weighted_sum / n_eff). `agg` is
+    the scoring pass's group_aggregates for the same groups, if available.
+    """
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+    category = np.asarray(category)
+    weight = np.asarray(weight, dtype=np.float64)
+    if agg is None:
+        agg = group_aggregates(group_ids, n_groups, category, weight, tactic_mask if penalized else None)
+
+    ws_out = agg['weighted_sum'][group_ids] - weight
+    n_out = agg['n_total'][group_ids] - 1
+    nc_out = agg['n_nc'][group_ids] - (category == NONCLAIM_CODE)
+    n_eff_out = effective_denominator(n_out, nc_out)
+
+    if penalized:
+        pen_out = agg['penalty_sum'][group_ids] - PENALTY_TABLE[np.asarray(tactic_mask, dtype=np.uint8)]
+        scores = final_score(agg['weighted_sum'], agg['n_eff'], agg['penalty_sum'])
+        without = np.where(n_eff_out > 0, final_score(ws_out, np.maximum(n_eff_out, 1), pen_out), 0.0)
+    else:
+        scores = _section_score(agg['weighted_sum'], agg['n_eff'])
+        without = _section_score(ws_out, n_eff_out)
+    return scores, scores[group_ids] - without
+
+
+def compute_contributions(claims):
+    """
+    One row per claim: claim_id, report_id, section, report_contribution and
+    section_contribution (C_Score points). Also returns the report scores.
+    """
+    reports = claims[REPORT_COL].astype(str) if REPORT_COL in claims else pd.Series('report', index=claims.index)
+    report_ids, report_names = pd.factorize(reports)
+    section_ids, _ = pd.factorize(pd.MultiIndex.from_arrays([report_ids, claims['section'].astype(str)]))
+
+    category = claims['category'].cat.codes.to_numpy()
+    weight = claims['weight'].to_numpy(np.float64)
+    mask = claims['tactic_mask'].to_numpy()
+
+    report_scores, report_contribution = leave_one_out(report_ids, len(report_names), category, weight, mask)
+    _, section_contribution = leave_one_out(section_ids, section_ids.max() + 1, category, weight, penalized=False)
+
+    table = pd.DataFrame({
+        'claim_id': claims['claim_id'].astype(str).to_numpy(),
+        'report_id': np.asarray(report_names)[report_ids],
+        'section': claims['section'].astype(str).to_numpy(),
+        'report_contribution': report_contribution,
+        'section_contribution': section_contribution,
+    })
+    return table, pd.Series(report_scores, index=report_names, name='final_c_score')
+
+
+class ContributionIndex:
+    """
+    Columnar contribution table. Rows are sorted by (report, contribution),
+    so a report's most damaging claims come first and its most helpful last;
+    report_offsets delimits each report. claim_id lookups use a sorted copy.
+    """
+
+    COLUMNS = ['claim_id', 'report', 'section', 'report_contribution', 'section_contribution']
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.reports = arrays['report_names']
+        self._report_pos = {str(r): i for i, r in enumerate(self.reports.astype(str))}
+
+    @classmethod
+    def build(cls, claims):
+        table, scores = compute_contributions(claims)
+        report_codes, names = pd.factorize(table['report_id'], sort=True)
+        order = np.lexsort((table['report_contribution'].to_numpy(), report_codes))
+        claim_id = table['claim_id'].to_numpy().astype('S')[order]
+        by_id = np.argsort(claim_id, kind='stable')
+        arrays = {
+            'claim_id': claim_id,
+            'report': report_codes[order].astype(np.int32),
+            'section': table['section'].to_numpy().astype('S')[order],
+            'report_contribution': table['report_contribution'].to_numpy()[order],
+            'section_contribution': table['section_contribution'].to_numpy()[order],
+            'report_names': np.asarray(names).astype('S'),
+            'report_scores': scores.reindex(names).to_numpy(),
+            'report_offsets': np.searchsorted(report_codes[order], np.arange(len(names) + 1)),
+            'id_order': by_id,
+            'sorted_ids': claim_id[by_id],
+        }
+        return cls(arrays)
+
+    def save(self, path=DEFAULT_PATH):
+        np.savez(path, **self.arrays)
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with np.load(path) as f:
+            return cls({k: f[k] for k in f.files})
+
+    def _rows(self, idx):
+        a = self.arrays
+        return pd.DataFrame({
+            'claim_id': a['claim_id'][idx].astype(str),
+            'report_id': a['report_names'][a['report'][idx]].astype(str),
+            'section': a['section'][idx].astype(str),
+            'report_contribution': a['report_contribution'][idx],
+            'section_contribution': a['section_contribution'][idx],
+        })
+
+    def lookup(self, claim_ids):
+        """Rows for the given claim_ids (unknown ids are dropped)."""
+        keys = np.asarray(claim_ids).astype('S')
+        pos = np.searchsorted(self.arrays['sorted_ids'], keys)
+        pos = np.minimum(pos, len(self.arrays['sorted_ids']) - 1)
+        found = self.arrays['sorted_ids'][pos] == keys
+        return self._rows(self.arrays['id_order'][pos[found]])
+
+    def top_k(self, report_id, k=10, helpful=False):
+        """The k most damaging (lowest) or most helpful (highest) claims of a report."""
+        r = self._report_pos[str(report_id)]
+        start, end = self.arrays['report_offsets'][r:r + 2]
+        idx = np.arange(end - 1, max(start, end - k) - 1, -1) if helpful else np.arange(start, min(end, start + k))
+        return self._rows(idx)
+
+    def report_score(self, report_id):
+        return float(self.arrays['report_scores'][self._report_pos[str(report_id)]])
+
+    def __len__(self):
+        return len(self.arrays['claim_id'])
+
+
+def main():
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: CLAIM CONTRIBUTION INDEX")
+    print("=" * 80)
+
+    claims, _ = load_claims()
+    index = ContributionIndex.build(claims)
+    path = index.save()
+    print(f"[+] {len(index)} claim contributions -> {os.path.relpath(path, BASE_DIR)}")
+
+    report = index.reports[0].decode()
+    print(f"\nC_Score {index.report_score(report):.2f}")
+    for helpful, title in [(False, 'Most damaging claims'), (True, 'Most helpful claims')]:
+        print(f"\n{title}:")
+        for row in index.top_k(report, 5, helpful=helpful).itertuples():
+            print(f"  {row.claim_id:8s} {row.report_contribution:+7.2f} report / "
+                  f"{row.section_contribution:+8.2f} {row.section}")
+
+
+if __name__ == "__main__":
+    main()
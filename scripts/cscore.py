@@ -0,0 +1,290 @@
+"""
+FILE: cscore.py
+PURPOSE: Single entry point for the analysis pipeline.
+         Subcommands (score, calibrate, reliability, sensitivity, figures,
+         all) select targets in a small stage graph. Stages go through the
+         run_cache: a stage whose inputs, options and code are unchanged has
+         its outputs restored, and only the others are recomputed and
+         written. The claims dataset is parsed once and shared; stages run as
+         soon as the stages they depend on have finished (cached ones are
+         recomputed in memory when a changed stage needs their results),
+         independent ones concurrently on a thread pool.
+
+         Figures are rendered afterwards on the main thread (pyplot is not
+         thread-safe), from the results files the stages wrote or restored,
+         so `figures` re-plots every figure from cached results without
+         recomputing anything.
+
+         Stage timings and memory go to a sidecar next to each results JSON
+         (docs/<name>.profile.json, untracked), not into the results JSON;
+         --trace also exports every stage as one Chrome trace or JSON lines.
+
+         Usage: python scripts/cscore.py all --workers 4
+                python scripts/cscore.py score --no-figures --out-dir /tmp/run
+                python scripts/cscore.py figures
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from claims_loader import load_claims, load_annotations, print_errors, scoring_frame, ClaimSchemaError
+from instrumentation import StageProfiler
+from run_cache import ANNOTATIONS_CSV, CLAIMS_CSV, RunCache, stage_manifest, stage_key, stage_outputs
+import c_score_calculator
+import sector_calibration
+import reliability_check
+import sensitivity_analysis
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+CLAIMS_PATH = os.path.join(DATA_DIR, 'morgan_stanley_claims_dataset.csv')
+ANNOTATIONS_PATH = os.path.join(DATA_DIR, 'annotator2_classifications.csv')
+
+# Stage -> stages whose results it consumes
+DEPENDENCIES = {
+    'score': [],
+    'calibrate': ['score'],          # reuses weighted_sum / n_total
+    'reliability': [],
+    'sensitivity': [],
+    'figures': ['score', 'calibrate', 'reliability', 'sensitivity'],   # renders from their saved results
+}
+STAGE_ORDER = list(DEPENDENCIES)
+
+COMMAND_HELP = {
+    'figures': 're-plot every figure from the cached stage results',
+    'all': 'run every stage',
+}
+
+COMMANDS = {
+    'score': ['score'],
+    'calibrate': ['calibrate'],
+    'reliability': ['reliability'],
+    'sensitivity': ['sensitivity'],
+    'figures': ['figures'],
+    'all': STAGE_ORDER,
+}
+
+
+def resolve_stages(targets):
+    """Targets plus everything they depend on, in STAGE_ORDER."""
+    needed, todo = set(), list(targets)
+    while todo:
+        stage = todo.pop()
+        if stage not in needed:
+            needed.add(stage)
+            todo.extend(DEPENDENCIES[stage])
+    return [s for s in STAGE_ORDER if s in needed]
+
+
+class Dataset:
+    """Inputs shared by every stage, parsed once."""
+
+    def __init__(self, claims_path=CLAIMS_PATH, annotations_path=ANNOTATIONS_PATH, need_annotations=True):
+        self.claims, errors = load_claims(claims_path)
+        print_errors(errors)
+        self.frame = scoring_frame(self.claims)
+        self.annotator2 = None
+        if need_annotations:
+            self.annotator2, errors = load_annotations(annotations_path)
+            print_errors(errors)
+
+
+# Stage -> compute(dataset, upstream results, profiler)
+COMPUTE = {
+    'score': lambda data, up, prof, exact: c_score_calculator.compute_scores(data.frame, prof, exact),
+    'calibrate': lambda data, up, prof, exact: sector_calibration.compute_calibration(data.frame, up['score'], exact),
+    'reliability': lambda data, up, prof, exact: reliability_check.compute_reliability(data.claims, data.annotator2,
+                                                                                        prof),
+    'sensitivity': lambda data, up, prof, exact: sensitivity_analysis.compute_sensitivity(data.frame, exact),
+}
+
+
+# Stage -> plot(frame, docs_dir, data_dir, vis_dir), from the results files the stage wrote
+PLOTS = {
+    'score': lambda frame, docs, data, vis: c_score_calculator.plot_figures(
+        frame, c_score_calculator.load_results(docs), vis),
+    'calibrate': lambda frame, docs, data, vis: sector_calibration.plot_calibration(
+        sector_calibration.load_calibration(docs, data), vis),
+    'reliability': lambda frame, docs, data, vis: reliability_check.plot_reliability(
+        reliability_check.load_reliability(docs), vis),
+    'sensitivity': lambda frame, docs, data, vis: sensitivity_analysis.plot_sensitivity(
+        sensitivity_analysis.load_sensitivity(docs), vis),
+}
+
+
+def run_stages(stages, data, profiler, workers=4, exact=False):
+    """
+    Run stages over the shared dataset, each as soon as its dependencies are
+    done. Returns {stage: result}; timings go to `profiler`. exact=True
+    scores with order-independent fixed-point sums.
+    """
+    results = {}
+    remaining, running = list(stages), {}
+
+    def timed(stage):
+        with profiler.stage(stage):
+            return COMPUTE[stage](data, results, profiler, exact)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while remaining or running:
+            ready = [s for s in remaining if all(d in results for d in DEPENDENCIES[s])]
+            for stage in ready:
+                remaining.remove(stage)
+                running[pool.submit(timed, stage)] = stage
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    return results
+
+
+def write_outputs(results, profiler, out_dir=BASE_DIR):
+    """
+    Print each stage's report and write its JSON/CSV, in stage order. Every
+    results JSON gets a <name>.profile.json with the profile of the load and
+    of its stage.
+    """
+    docs_dir = os.path.join(out_dir, 'docs')
+    data_dir = os.path.join(out_dir, 'data')
+    for d in [docs_dir, data_dir]:
+        os.makedirs(d, exist_ok=True)
+
+    def profile(stage):
+        return profiler.block(['load', stage])
+
+    if 'score' in results:
+        c_score_calculator.print_results(results['score'])
+        c_score_calculator.save_results(results['score'], docs_dir, profile=profile('score'))
+
+    if 'calibrate' in results:
+        sector_calibration.print_calibration(results['calibrate'])
+        sector_calibration.save_calibration(results['calibrate'], docs_dir, data_dir, profile=profile('calibrate'))
+
+    if 'reliability' in results:
+        reliability_check.print_reliability(results['reliability'])
+        reliability_check.save_reliability(results['reliability'], docs_dir, profile=profile('reliability'))
+
+    if 'sensitivity' in results:
+        sensitivity_analysis.print_sensitivity(results['sensitivity'])
+        sensitivity_analysis.save_sensitivity(results['sensitivity'], docs_dir, profile=profile('sensitivity'))
+
+
+def render_figures(stages, frame, profiler, out_dir=BASE_DIR):
+    """Plot the figures of `stages` from the results files under out_dir, on the calling thread."""
+    docs_dir = os.path.join(out_dir, 'docs')
+    data_dir = os.path.join(out_dir, 'data')
+    vis_dir = os.path.join(out_dir, 'visualizations')
+    os.makedirs(vis_dir, exist_ok=True)
+    for stage in stages:
+        with profiler.stage(f'{stage}/figures'):
+            PLOTS[stage](frame, docs_dir, data_dir, vis_dir)
+
+
+def cache_lookup(cache, stages, args):
+    """
+    Run-cache key of every stage, as {stage: (manifest, key)}, and the cached
+    outputs of those with a complete entry, as {stage: blobs}. Figures are
+    not cached: they are rendered from the (restored) results files.
+    """
+    paths = {CLAIMS_CSV: args.claims, ANNOTATIONS_CSV: args.annotations}
+    options = {'exact': args.exact, 'figures': False}
+    keys, hits = {}, {}
+    if cache is None:
+        return keys, hits
+    for stage in stages:
+        manifest = stage_manifest(stage, paths, options)
+        keys[stage] = manifest, stage_key(manifest)
+        blobs = None if args.force else cache.lookup(stage, keys[stage][1], stage_outputs(stage, figures=False))
+        if blobs is not None:
+            hits[stage] = blobs
+    return keys, hits
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--claims', default=CLAIMS_PATH, help='claims dataset CSV')
+    common.add_argument('--annotations', default=ANNOTATIONS_PATH, help='annotator 2 classifications CSV')
+    common.add_argument('--out-dir', default=BASE_DIR, help='root for docs/, data/ and visualizations/ outputs')
+    common.add_argument('--no-figures', action='store_true', help='headless run: skip all figures')
+    common.add_argument('--workers', type=int, default=4, help='threads for independent stages')
+    common.add_argument('--record', action='store_true', help='record the scores in the results store')
+    common.add_argument('--trace', help='also export all stage timings as a Chrome trace (.json) or JSON lines (.jsonl); '
+                                          'per-stage profiles always go to docs/<name>.profile.json')
+    common.add_argument('--tracemalloc', action='store_true', help='also trace Python allocation peaks (slower)')
+    common.add_argument('--exact', action='store_true', help='order-independent fixed-point score sums')
+    common.add_argument('--force', action='store_true', help='recompute every stage, ignoring the run cache')
+    common.add_argument('--no-cache', action='store_true', help='neither read nor update the run cache')
+
+    parser = argparse.ArgumentParser(description='C_Score analysis pipeline.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command in COMMANDS:
+        commands.add_parser(command, parents=[common], help=COMMAND_HELP.get(command, f"run {command}"))
+    args = parser.parse_args()
+    if args.command == 'figures' and args.no_figures:
+        parser.error('figures renders figures; drop --no-figures')
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: PIPELINE")
+    print("=" * 80)
+
+    targets = COMMANDS[args.command]
+    if args.record and 'score' in resolve_stages(targets):
+        targets = targets + ['calibrate']       # the store records the calibrated score too
+    elif args.record:
+        parser.error('--record needs the score stage')
+    stages = [s for s in resolve_stages(targets) if s in COMPUTE]
+    # The figures stage plots every stage; other commands plot their own unless --no-figures
+    plotted = [] if args.no_figures else stages
+    cache = None if args.no_cache else RunCache()
+    profiler = StageProfiler(trace_memory=args.tracemalloc)
+    data = None
+    try:
+        keys, hits = cache_lookup(cache, stages, args)
+        # Changed stages, plus the cached results they consume, are recomputed
+        changed = [s for s in stages if s not in hits]
+        compute = resolve_stages(changed)
+        if compute or 'score' in plotted:
+            with profiler.stage('load'):
+                data = Dataset(args.claims, args.annotations, need_annotations='reliability' in compute)
+            print(f"[+] Loaded {len(data.claims)} claims; stages: {', '.join(compute) or 'none'}")
+    except (FileNotFoundError, ClaimSchemaError) as e:
+        print(f"[!] CRITICAL ERROR: {e}")
+        return
+
+    for stage in hits:
+        cache.restore(hits[stage], args.out_dir)
+    if hits:
+        print(f"[+] Restored from the run cache: {', '.join(hits)}")
+
+    results = run_stages(compute, data, profiler, args.workers, args.exact)
+    write_outputs({s: results[s] for s in changed}, profiler, args.out_dir)
+    if cache is not None:
+        for stage in changed:
+            manifest, key = keys[stage]
+            cache.store(stage, key, manifest, stage_outputs(stage, figures=False), args.out_dir)
+
+    if plotted:
+        print("\n" + "=" * 80)
+        print("FIGURES")
+        print("=" * 80)
+        render_figures(plotted, data.frame if data else None, profiler, args.out_dir)
+
+    if args.record:
+        docs_dir = os.path.join(args.out_dir, 'docs')
+        calibrated = sector_calibration.load_calibration(docs_dir, os.path.join(args.out_dir, 'data'))['fs_score']
+        c_score_calculator.record_results(c_score_calculator.load_results(docs_dir), calibrated)
+
+    if not compute and not plotted:
+        return
+
+    print("\n" + "=" * 80)
+    print("PIPELINE PROFILE")
+    print("=" * 80)
+    print(profiler.summary())
+    if args.trace:
+        profiler.export(args.trace)
+        print(f"\n[+] Trace written to {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
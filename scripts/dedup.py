@@ -0,0 +1,172 @@
+"""
+FILE: dedup.py
+PURPOSE: Near-duplicate claim detection (METHODOLOGY.md V.C.2: "redundant
+         restatements of substantively identical claims").
+         Word shingles -> MinHash signatures -> LSH banding within each
+         report, so candidate pairs are found in near-linear time instead of
+         comparing all pairs. Duplicates can be flagged or collapsed before
+         scoring.
+"""
+
+import pandas as pd
+import numpy as np
+import re
+import zlib
+from claims_loader import REPORT_COL, load_claims
+from scoring_kernel import score_report
+
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 32          # 32 bands x 4 rows: ~50% candidate rate at Jaccard 0.42, ~98% at 0.7
+THRESHOLD = 0.8     # verified Jaccard similarity for a duplicate
+PRIME = (1 << 31) - 1
+
+TOKEN = re.compile(r'[a-z0-9$%.]+')
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Set of crc32 hashes of word k-grams (the whole text if shorter than k)."""
+    tokens = TOKEN.findall(str(text).lower())
+    if len(tokens) < k:
+        grams = [' '.join(tokens)]
+    else:
+        grams = [' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams)))
+
+
+def minhash_signatures(shingle_sets, num_perm=NUM_PERM, seed=0, chunk=4096):
+    """
+    (n_texts, num_perm) uint32 MinHash signatures from universal hashes
+    (a * x + b) mod PRIME, computed over all shingles at once per chunk of texts.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, PRIME, size=num_perm, dtype=np.uint64)[:, None]
+    b = rng.integers(0, PRIME, size=num_perm, dtype=np.uint64)[:, None]
+
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint32)
+    for start in range(0, len(shingle_sets), chunk):
+        sets = shingle_sets[start:start + chunk]
+        lengths = np.array([len(s) for s in sets])
+        flat = np.concatenate(sets) % PRIME
+        hashed = (a * flat + b) % PRIME            # (num_perm, total shingles)
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        signatures[start:start + len(sets)] = np.minimum.reduceat(hashed, offsets, axis=1).T
+    return signatures
+
+
+def lsh_candidates(signatures, groups, bands=BANDS):
+    """
+    Candidate (i, j) pairs that share at least one band within the same group.
+    Each bucket links its members to the bucket's first member.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    groups = np.asarray(groups, dtype=np.int64)
+    pairs = set()
+    multipliers = np.uint64(1_000_003) ** np.arange(rows, dtype=np.uint64)
+
+    for band in range(bands):
+        block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (block * multipliers).sum(axis=1)    # wraps mod 2**64
+        order = np.lexsort((keys, groups))
+        k, g = keys[order], groups[order]
+        same = (k[1:] == k[:-1]) & (g[1:] == g[:-1])
+        if not same.any():
+            continue
+        # Bucket heads: first index of every run of equal (group, key)
+        run_start = np.concatenate([[True], ~same])
+        head = order[np.maximum.accumulate(np.where(run_start, np.arange(n), 0))]
+        for i, j in zip(head[1:][same], order[1:][same]):
+            pairs.add((min(i, j), max(i, j)))
+    return sorted(pairs)
+
+
+def jaccard(a, b):
+    inter = len(np.intersect1d(a, b, assume_unique=True))
+    return inter / (len(a) + len(b) - inter) if (len(a) + len(b)) else 1.0
+
+
+def find_duplicates(claims, threshold=THRESHOLD, bands=BANDS, num_perm=NUM_PERM, seed=0):
+    """
+    Cluster near-duplicate claims within each report.
+
+    Returns a DataFrame aligned with `claims`: cluster (index of the first claim
+    of its cluster), duplicate_of (claim_id of that claim, '' for originals)
+    and similarity (exact Jaccard with that claim; can fall below threshold
+    when the claim joined the cluster through another member).
+    """
+    if len(claims) == 0:
+        return pd.DataFrame({'cluster': np.zeros(0, dtype=np.int64), 'duplicate_of': np.zeros(0, dtype=object),
+                             'similarity': np.zeros(0)}, index=claims.index)
+    texts = claims['verbatim_text'].astype(str).to_numpy()
+    claim_ids = claims['claim_id'].astype(str).to_numpy()
+    reports = claims[REPORT_COL] if REPORT_COL in claims else pd.Series(0, index=claims.index)
+    groups = pd.factorize(reports)[0]
+
+    sets = [shingles(t) for t in texts]
+    signatures = minhash_signatures(sets, num_perm, seed)
+
+    # Union-find over verified candidate pairs; the root is always the earliest claim
+    parent = np.arange(len(texts))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in lsh_candidates(signatures, groups, bands):
+        sim = jaccard(sets[i], sets[j])
+        if sim >= threshold:
+            ri, rj = root(i), root(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+    cluster = np.array([root(i) for i in range(len(texts))], dtype=np.int64)
+    is_dup = cluster != np.arange(len(texts))
+    # A member can join through a chain of partners, so compare it with the root itself
+    similarity = np.zeros(len(texts))
+    for i in np.flatnonzero(is_dup):
+        similarity[i] = jaccard(sets[i], sets[cluster[i]])
+    return pd.DataFrame({
+        'cluster': cluster,
+        'duplicate_of': np.where(is_dup, claim_ids[cluster], ''),
+        'similarity': np.where(is_dup, similarity, 0.0),
+    }, index=claims.index)
+
+
+def flag_duplicates(claims, **kwargs):
+    """claims with duplicate_of / similarity columns added."""
+    dups = find_duplicates(claims, **kwargs)
+    return claims.assign(duplicate_of=dups['duplicate_of'], duplicate_similarity=dups['similarity'])
+
+
+def collapse_duplicates(claims, **kwargs):
+    """claims with every near-duplicate dropped (the first occurrence is kept)."""
+    dups = find_duplicates(claims, **kwargs)
+    return claims[dups['duplicate_of'] == ''].reset_index(drop=True)
+
+
+def main():
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: NEAR-DUPLICATE CLAIM DETECTION")
+    print("=" * 80)
+
+    claims, _ = load_claims()
+    flagged = flag_duplicates(claims)
+    dups = flagged[flagged['duplicate_of'] != '']
+    print(f"[+] {len(dups)} near-duplicates among {len(claims)} claims (Jaccard >= {THRESHOLD})")
+    for _, row in dups.iterrows():
+        print(f"  {row['claim_id']} ~ {row['duplicate_of']} ({row['duplicate_similarity']:.2f}): "
+              f"{row['verbatim_text'][:70]}...")
+
+    collapsed = collapse_duplicates(claims)
+    before = score_report(claims['category'].cat.codes, claims['weight'], claims['tactic_mask'])
+    after = score_report(collapsed['category'].cat.codes, collapsed['weight'], collapsed['tactic_mask'])
+    print(f"\n  weighted_sum / n_eff: {before['weighted_sum']:.2f} / {before['n_eff']}"
+          f" -> {after['weighted_sum']:.2f} / {after['n_eff']}")
+    print(f"  Final C_Score:        {before['final_c_score']:.2f} -> {after['final_c_score']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
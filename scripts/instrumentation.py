@@ -0,0 +1,213 @@
+"""
+FILE: instrumentation.py
+PURPOSE: Per-stage timing and memory instrumentation.
+         StageProfiler records wall time, thread CPU time, Python allocation
+         peak (tracemalloc) and process RSS for every stage, as a context
+         manager or decorator. The RSS peak is sampled by a background
+         thread every RSS_INTERVAL seconds while a stage is open, so spikes
+         shorter than the interval can be missed. Records are written as a
+         profile to a sidecar file next to each results JSON
+         (docs/<name>.json -> docs/<name>.profile.json, untracked, as timings
+         differ on every run); the results JSON itself carries no profile.
+         They can also be exported as a Chrome trace (chrome://tracing,
+         Perfetto) or as JSON lines. tracemalloc slows allocation-heavy
+         stages, so it only runs when trace_memory=True.
+
+         Stage names are '/'-separated ('score/penalty_parsing'); nested
+         stages are attributed to their parent's peak as well. tracemalloc
+         and RSS are process-wide, so memory figures for stages running
+         concurrently on different threads overlap.
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+MB = 1024 * 1024
+RSS_INTERVAL = 0.005    # seconds between RSS samples while a stage is open
+
+
+def current_rss():
+    """Resident set size in bytes (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class StageProfiler:
+    """
+    Collects one record per stage:
+    name, start (s since the profiler was created), wall_s, cpu_s,
+    py_alloc_peak_mb (tracemalloc peak above the stage's starting point),
+    rss_peak_mb (sampled while the stage is open), rss_end_mb, rss_delta_mb
+    (exit minus entry) and thread.
+    """
+
+    def __init__(self, trace_memory=False, rss_interval=RSS_INTERVAL):
+        self.trace_memory = trace_memory
+        self.rss_interval = rss_interval
+        self.records = []
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open = {}         # id -> frame of every open stage, on any thread
+        self._sampler = None
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _sample_rss(self):
+        """Sampler thread: raise the RSS peak of every open stage; exits when none is open."""
+        while True:
+            rss = current_rss()
+            with self._lock:
+                if not self._open:
+                    self._sampler = None
+                    return
+                for frame in self._open.values():
+                    frame['rss_peak'] = max(frame['rss_peak'], rss)
+            time.sleep(self.rss_interval)
+
+    @contextmanager
+    def stage(self, name):
+        stack = self._stack()
+        frame = {'peak': 0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['base'] = current
+        stack.append(frame)
+        rss_before = current_rss()
+        frame['rss_peak'] = rss_before
+        with self._lock:
+            self._open[id(frame)] = frame
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_rss, name='rss-sampler', daemon=True)
+                self._sampler.start()
+        cpu_start = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - cpu_start
+            stack.pop()
+            rss_after = current_rss()
+            with self._lock:
+                del self._open[id(frame)]
+                rss_peak = max(frame['rss_peak'], rss_after)
+            record = {
+                'name': name,
+                'start': start - self._t0,
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'rss_peak_mb': rss_peak / MB,
+                'rss_end_mb': rss_after / MB,
+                'rss_delta_mb': (rss_after - rss_before) / MB,
+                'thread': threading.current_thread().name,
+            }
+            if self.trace_memory:
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+                record['py_alloc_peak_mb'] = max(0, peak - frame['base']) / MB
+            with self._lock:
+                self.records.append(record)
+
+    def timed(self, name=None):
+        """Decorator form of stage()."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def block(self, prefixes=None):
+        """
+        The profile written next to a results JSON (write_profile): the
+        stages whose name starts with one of `prefixes` (all stages when
+        None), keyed by name.
+        """
+        records = [r for r in self.records
+                   if prefixes is None or any(r['name'] == p or r['name'].startswith(p + '/') for p in prefixes)]
+        return {
+            'stages': {r['name']: {k: (round(v, 6) if isinstance(v, float) else v)
+                                   for k, v in r.items() if k != 'name'} for r in records},
+            'peak_rss_mb': round(max((r['rss_peak_mb'] for r in records), default=0.0), 3),
+            'tracemalloc': self.trace_memory,
+        }
+
+    def summary(self):
+        """Printable table of the records, in start order."""
+        lines = [f"  {'stage':32s} {'wall ms':>10s} {'cpu ms':>10s} {'py peak MB':>11s} {'rss peak MB':>12s}"]
+        for r in sorted(self.records, key=lambda r: r['start']):
+            peak = f"{r['py_alloc_peak_mb']:11.2f}" if 'py_alloc_peak_mb' in r else f"{'-':>11s}"
+            lines.append(f"  {r['name']:32s} {r['wall_s'] * 1000:10.1f} {r['cpu_s'] * 1000:10.1f} "
+                         f"{peak} {r['rss_peak_mb']:12.1f}")
+        return '\n'.join(lines)
+
+    def export_chrome_trace(self, path):
+        """Complete ('X') events in the Trace Event Format."""
+        threads = {}
+        events = []
+        for r in self.records:
+            tid = threads.setdefault(r['thread'], len(threads) + 1)
+            args = {k: v for k, v in r.items() if k not in ('name', 'start', 'wall_s', 'thread')}
+            events.append({'name': r['name'], 'cat': r['name'].split('/')[0], 'ph': 'X', 'pid': os.getpid(),
+                           'tid': tid, 'ts': r['start'] * 1e6, 'dur': r['wall_s'] * 1e6, 'args': args})
+        events += [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                   for name, tid in threads.items()]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def export_jsonl(self, path):
+        with open(path, 'w') as f:
+            for r in sorted(self.records, key=lambda r: r['start']):
+                f.write(json.dumps(r) + '\n')
+
+    def export(self, path):
+        """JSON lines for *.jsonl paths, Chrome trace otherwise."""
+        if path.endswith('.jsonl'):
+            self.export_jsonl(path)
+        else:
+            self.export_chrome_trace(path)
+
+
+def profile_path(results_path):
+    """docs/validation_results.json -> docs/validation_results.profile.json"""
+    return os.path.splitext(results_path)[0] + '.profile.json'
+
+
+def write_profile(results_path, profile):
+    """Write a profile to its sidecar next to the results JSON (profile_path); returns the path."""
+    path = profile_path(results_path)
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+    return path
+
+
+def stage(profiler, name):
+    """profiler.stage(name), or a no-op when profiling is off (profiler=None)."""
+    return profiler.stage(name) if profiler is not None else nullcontext()
@@ -0,0 +1,211 @@
+"""
+FILE: peer_percentiles.py
+PURPOSE: Sector peer-group percentiles from mergeable score sketches.
+         One sketch per sector profile in SECTOR_CALIBRATION. C_Scores live on
+         the bounded range [0, 100], so the sketch is a fixed-bin histogram:
+         constant memory per sector, rank error bounded by the bin width
+         (0.01 points by default) and merges that are exact (bin counts add),
+         unlike t-digest/KLL whose merges are approximate. Sketches built in
+         parallel workers therefore combine to exactly the serial result and
+         no global sort of the universe is needed.
+"""
+
+import numpy as np
+import pandas as pd
+import argparse
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from sector_calibration import SECTOR_CALIBRATION
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+DOCS_DIR = os.path.join(BASE_DIR, 'docs')
+CALIBRATION_PATH = os.path.join(DOCS_DIR, 'sector_calibration_results.json')
+DEFAULT_PATH = os.path.join(DATA_DIR, 'peer_sketches.npz')
+
+SCORE_RANGE = (0.0, 100.0)
+BINS = 10_000
+SECTORS = list(SECTOR_CALIBRATION)
+
+
+class ScoreSketch:
+    """Fixed-bin histogram over [low, high]; out-of-range scores go to the end bins."""
+
+    def __init__(self, low=SCORE_RANGE[0], high=SCORE_RANGE[1], bins=BINS, counts=None):
+        self.low, self.high, self.bins = float(low), float(high), int(bins)
+        self.counts = np.zeros(self.bins, dtype=np.int64) if counts is None else counts
+        self._cum = None
+
+    def _bin(self, scores):
+        scaled = (np.asarray(scores, dtype=np.float64) - self.low) * (self.bins / (self.high - self.low))
+        return np.clip(scaled.astype(np.int64), 0, self.bins - 1)
+
+    def add(self, scores):
+        self.counts += np.bincount(self._bin(scores), minlength=self.bins)
+        self._cum = None
+        return self
+
+    def merge(self, other):
+        if (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError('cannot merge sketches with different binning')
+        self.counts += other.counts
+        self._cum = None
+        return self
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def _cumulative(self):
+        if self._cum is None:
+            self._cum = np.concatenate([[0], np.cumsum(self.counts)])
+        return self._cum
+
+    def percentile_rank(self, scores):
+        """
+        Percent of the group below each score, counting half of the score's
+        own bin (mid-rank). Works on scalars and arrays.
+        """
+        cum = self._cumulative()
+        b = self._bin(scores)
+        n = cum[-1]
+        ranks = 100.0 * (cum[b] + 0.5 * self.counts[b]) / n if n else np.full(np.shape(b), np.nan)
+        return ranks if np.ndim(ranks) else float(ranks)
+
+    def quantile(self, q):
+        """Score at quantile q in [0, 1] (lower edge of the bin holding it)."""
+        cum = self._cumulative()
+        b = np.searchsorted(cum[1:], np.asarray(q, dtype=np.float64) * cum[-1], side='left')
+        values = self.low + np.minimum(b, self.bins - 1) * (self.high - self.low) / self.bins
+        return values if np.ndim(values) else float(values)
+
+
+class PeerGroups:
+    """One ScoreSketch per sector."""
+
+    def __init__(self, sectors=SECTORS, **sketch_args):
+        self.sketch_args = sketch_args
+        self.sketches = {s: ScoreSketch(**sketch_args) for s in sectors}
+
+    def add(self, sectors, scores):
+        sectors = pd.Series(np.asarray(sectors, dtype=object))
+        scores = np.asarray(scores, dtype=np.float64)
+        codes, names = pd.factorize(sectors)
+        for code, sector in enumerate(names):
+            if sector not in self.sketches:
+                raise KeyError(f'unknown sector profile: {sector}')
+            self.sketches[sector].add(scores[codes == code])
+        return self
+
+    def merge(self, other):
+        for sector, sketch in other.sketches.items():
+            self.sketches[sector].merge(sketch)
+        return self
+
+    def percentile(self, sector, score):
+        return self.sketches[sector].percentile_rank(score)
+
+    def percentiles(self, sectors, scores):
+        """Vectorized sector percentile for every (sector, score) pair."""
+        sectors = np.asarray(sectors, dtype=object)
+        scores = np.asarray(scores, dtype=np.float64)
+        out = np.full(len(scores), np.nan)
+        for sector, sketch in self.sketches.items():
+            hit = sectors == sector
+            if hit.any():
+                out[hit] = sketch.percentile_rank(scores[hit])
+        return out
+
+    def summary(self, quantiles=(0.1, 0.25, 0.5, 0.75, 0.9)):
+        rows = {s: dict(n=k.n, **{f'p{int(q * 100)}': k.quantile(q) for q in quantiles})
+                for s, k in self.sketches.items() if k.n}
+        return pd.DataFrame(rows).T
+
+    def save(self, path=DEFAULT_PATH):
+        np.savez(path, sectors=np.array(list(self.sketches), dtype='S'),
+                 counts=np.stack([k.counts for k in self.sketches.values()]),
+                 binning=np.array([self.sketch_args.get('low', SCORE_RANGE[0]),
+                                   self.sketch_args.get('high', SCORE_RANGE[1]),
+                                   self.sketch_args.get('bins', BINS)]))
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with np.load(path) as f:
+            low, high, bins = f['binning']
+            groups = cls([s.decode() for s in f['sectors']], low=low, high=high, bins=int(bins))
+            for sector, counts in zip(groups.sketches, f['counts']):
+                groups.sketches[sector].counts = counts.astype(np.int64)
+        return groups
+
+
+def _build_chunk(args):
+    sectors, scores = args
+    return PeerGroups().add(sectors, scores)
+
+
+def build_parallel(sectors, scores, workers=4, chunk_size=50_000):
+    """Sketch chunks in worker processes and merge; equal to a serial build."""
+    sectors = np.asarray(sectors, dtype=object)
+    scores = np.asarray(scores, dtype=np.float64)
+    chunks = [(sectors[i:i + chunk_size], scores[i:i + chunk_size]) for i in range(0, len(scores), chunk_size)]
+    groups = PeerGroups()
+    with ProcessPoolExecutor(workers) as pool:
+        for part in pool.map(_build_chunk, chunks):
+            groups.merge(part)
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sector peer percentiles from mergeable sketches.')
+    parser.add_argument('--universe', type=int, default=200_000, help='size of the synthetic demo universe')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--out', help='where to save the synthetic sketches (default: temporary; '
+                                      f'{os.path.relpath(DEFAULT_PATH, BASE_DIR)} is left untouched)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: SECTOR PEER PERCENTILES")
+    print("=" * 80)
+
+    # Synthetic universe (demo only): sector-dependent score distributions
+    rng = np.random.default_rng(0)
+    sectors = rng.choice(SECTORS, size=args.universe)
+    centre = pd.Series(np.linspace(45, 70, len(SECTORS)), index=SECTORS)[sectors].to_numpy()
+    scores = np.clip(rng.normal(centre, 15), 0, 100)
+
+    parallel = build_parallel(sectors, scores, args.workers)
+    serial = PeerGroups().add(sectors, scores)
+    exact = all(np.array_equal(parallel.sketches[s].counts, serial.sketches[s].counts) for s in SECTORS)
+    print(f"[+] {args.universe:,} synthetic reports sketched in parallel; merge equals serial build: {exact}")
+
+    sample = np.arange(0, args.universe, args.universe // 1000)
+    true_rank = np.array([100 * (np.mean(peers < scores[i]) + 0.5 * np.mean(peers == scores[i]))
+                          for i in sample for peers in [scores[sectors == sectors[i]]]])
+    err = np.abs(parallel.percentiles(sectors[sample], scores[sample]) - true_rank).max()
+    print(f"[+] Max percentile error vs exact ranks (1,000 sampled reports): {err:.3f} points")
+    print(f"[+] Memory per sector: {parallel.sketches[SECTORS[0]].counts.nbytes / 1024:.0f} KB")
+    # Synthetic sketches never go to DEFAULT_PATH, which PeerGroups.load() reads by default
+    with tempfile.TemporaryDirectory(prefix='cscore_peers_') as work_dir:
+        path = parallel.save(args.out or os.path.join(work_dir, 'peer_sketches.npz'))
+        reloaded = PeerGroups.load(path)
+        same = all(np.array_equal(reloaded.sketches[s].counts, parallel.sketches[s].counts) for s in SECTORS)
+        print(f"[+] Sketches saved to {path if args.out else 'a temporary file (pass --out to keep them)'}; "
+              f"reload equals saved: {same}")
+
+    print("\nSector score distribution (synthetic):")
+    print(parallel.summary().round(2).to_string())
+
+    if not os.path.exists(CALIBRATION_PATH):
+        print(f"\n[!] {os.path.relpath(CALIBRATION_PATH, BASE_DIR)} not found; run sector_calibration.py first")
+        return
+    with open(CALIBRATION_PATH) as f:
+        ms_score = json.load(f)['morgan_stanley_calibrated']['c_score']
+    print(f"\nMorgan Stanley ({ms_score:.2f}, financial services calibration) among synthetic financial services "
+          f"peers: {parallel.percentile('financial_services', ms_score):.1f}th percentile")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+FILE: pre_classifier.py
+PURPOSE: Rule-based claim pre-classifier.
+         Runs the METHODOLOGY.md decision tree (section V.D.1) over
+         verbatim_text with precompiled patterns and suggests a category and
+         weight for every claim, in the annotator file format so the
+         suggestions can be scored against human labels. The rules were
+         written with the labeled sample in view, so agreement on it is an
+         in-sample figure.
+"""
+
+import pandas as pd
+import numpy as np
+import argparse
+import re
+import os
+from claims_loader import CATEGORIES, CATEGORY_WEIGHTS, load_claims, load_annotations, DATA_DIR
+from element_extractor import extract_elements
+from reliability_check import compute_reliability
+
+ANNOTATOR = 'preclassifier'
+
+
+def compile_terms(terms):
+    """One case-insensitive alternation for a list of phrases (longest first)."""
+    alternation = '|'.join(sorted((re.escape(t).replace(r'\ ', r'\s+') for t in terms), key=len, reverse=True))
+    return re.compile(rf'\b(?:{alternation})\b', re.IGNORECASE)
+
+
+# General vocabularies only: a phrase that singles out one sentence of the
+# labeled sample would make the agreement figures below meaningless.
+
+# STEP 2: hedging language -> automatic VagueTarget
+HEDGING_TERMS = [
+    'aim to', 'aims to', 'aiming to', 'aiming', 'strive', 'strives to', 'striving',
+    'seek to', 'seeks to', 'work toward', 'working toward', 'work towards', 'working towards',
+    'making progress toward', 'make progress toward', 'aspire', 'aspires to',
+    'endeavor', 'endeavour', 'hope to', 'intend to', 'remain focused on', 'we believe',
+]
+
+FORWARD_TERMS = [
+    'will', 'target', 'targets', 'targeting', 'goal', 'goals', 'committed to',
+    'commitment', 'plan to', 'plans to', 'objective', 'objectives', 'ambition',
+    'ambitions', 'net-zero by', 'on track to',
+]
+
+RETROSPECTIVE_TERMS = [
+    'achieved', 'maintained', 'mobilized', 'reached', 'reduced', 'increased', 'delivered',
+    'exceeded', 'completed', 'invested', 'raised', 'to date',
+]
+
+PROCESS_TERMS = [
+    'board', 'governance', 'oversight', 'committee', 'framework', 'risk management',
+    'policy', 'policies', 'tcfd', 'methodology', 'due diligence', 'certified',
+    'certification', 'assurance',
+]
+
+OFFSET_TERMS = ['offset', 'offsets', 'carbon credits', 'credits', 'carbon neutral', 'neutrality']
+
+# Statements that open with a quantity ("Over 60% of our ...", "In 2023, ...") report a state
+STATE = re.compile(r'^\W*(?:[\w$~>%.,+]+\s+){0,3}?of our\b|^\W*in\s+(?:\w+\s+)?20\d\d\b|^\W*[~>$£€]?\d',
+                   re.IGNORECASE)
+COMPARATIVE = re.compile(r'\b(?:approximately|about|roughly|more than|nearly|over)\s+(?:half|a third|a quarter)\b'
+                         r'|\bmajority\b|\bmost of\b', re.IGNORECASE)
+
+PATTERNS = {
+    'hedging': compile_terms(HEDGING_TERMS),
+    'forward': compile_terms(FORWARD_TERMS),
+    'retrospective': compile_terms(RETROSPECTIVE_TERMS),
+    'process': compile_terms(PROCESS_TERMS),
+    'offsets': compile_terms(OFFSET_TERMS),
+    'state': STATE,
+    'comparative': COMPARATIVE,
+}
+
+
+def detect_features(texts, n_jobs=1):
+    """
+    Boolean feature columns, one vectorized regex scan per pattern.
+    The required elements (numeric, deadline, baseline, scope) come from
+    element_extractor.
+    """
+    texts = pd.Series(texts, dtype=str).fillna('')
+    features = pd.DataFrame({name: texts.str.contains(pattern).to_numpy() for name, pattern in PATTERNS.items()},
+                            index=texts.index)
+    elements = extract_elements(texts, n_jobs=n_jobs)
+    for column in elements.columns:
+        features[column.replace('required_elements_', '')] = elements[column].to_numpy()
+    return features
+
+
+def classify(texts, features=None, n_jobs=1):
+    """
+    Apply the decision tree. Returns a DataFrame with category, weight,
+    rationale (the step that fired), confidence and boundary_case.
+    """
+    f = detect_features(texts, n_jobs) if features is None else features
+    n_elements = f[['numeric', 'deadline', 'baseline', 'scope']].sum(axis=1).to_numpy()
+
+    # STEP 1: past-tense outcomes and reported states win over forward-looking vocabulary
+    retrospective = f['retrospective'].to_numpy() | f['state'].to_numpy()
+    forward = f['forward'].to_numpy() & ~retrospective | f['hedging'].to_numpy()
+    retro = ~forward
+
+    steps = [
+        (forward & f['hedging'].to_numpy(), 'VagueTarget', 'STEP 2: hedging language'),
+        (forward & (n_elements >= 3), 'QuantitativeTarget', 'STEP 3: >= 3 of 4 required elements'),
+        (forward & f['process'].to_numpy(), 'PeripheralClaim', 'STEP 4: process/governance, not performance'),
+        (forward, 'VagueTarget', 'STEP 4: forward-looking without required elements'),
+        (retro & f['numeric'].to_numpy() & f['baseline'].to_numpy(), 'VerifiedClaim',
+         'STEP 5: numeric outcome with baseline'),
+        (retro & (f['numeric'].to_numpy() | f['comparative'].to_numpy()) & ~f['baseline'].to_numpy(),
+         'AmbiguousBaseline', 'STEP 6: metric without baseline year'),
+        (retro & f['offsets'].to_numpy(), 'OffsetsOnly', 'STEP 7: offsets/credits only'),
+        (retro & f['process'].to_numpy(), 'PeripheralClaim', 'STEP 8: verifiable governance claim'),
+    ]
+    conditions = [c for c, _, _ in steps]
+    category = np.select(conditions, [cat for _, cat, _ in steps], default='NonClaim')
+    rationale = np.select(conditions, [r for _, _, r in steps], default='STEP 8: no verifiable assertion')
+
+    # Hedging on an otherwise complete target is the documented boundary case
+    boundary = f['hedging'].to_numpy() & (n_elements >= 3)
+    confidence = np.where(boundary | (category == 'NonClaim'), 'Medium', 'High')
+
+    return pd.DataFrame({
+        'category': category,
+        'weight': pd.Series(category).map(CATEGORY_WEIGHTS).to_numpy(),
+        'rationale': rationale,
+        'confidence': confidence,
+        'boundary_case': boundary,
+    }, index=f.index)
+
+
+def to_annotator_frame(claim_ids, suggestions, annotator=ANNOTATOR):
+    """Suggestions in the annotator2_classifications.csv layout (plus weight)."""
+    out = pd.DataFrame({'claim_id': np.asarray(claim_ids)})
+    for field in ('category', 'rationale', 'confidence'):
+        out[f'{annotator}_{field}'] = suggestions[field].to_numpy()
+    out[f'{annotator}_boundary_case'] = np.where(suggestions['boundary_case'].to_numpy(), 'Yes', 'No')
+    out[f'{annotator}_weight'] = suggestions['weight'].to_numpy()
+    return out
+
+
+def to_annotations(claim_ids, suggestions, annotator=ANNOTATOR):
+    """Suggestions as a claims_loader.load_annotations frame."""
+    annotations = pd.DataFrame({
+        'claim_id': np.asarray(claim_ids),
+        'category': pd.Categorical(suggestions['category'], categories=CATEGORIES),
+        'boundary_case': suggestions['boundary_case'].to_numpy(),
+    })
+    annotations.attrs['annotator'] = annotator
+    return annotations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rule-based pre-classification of the claims dataset.')
+    parser.add_argument('--out', help='write the suggestions as an annotator file (CSV)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: RULE-BASED PRE-CLASSIFIER")
+    print("=" * 80)
+
+    claims, _ = load_claims()
+    suggestions = classify(claims['verbatim_text'])
+    print(f"[+] Pre-labeled {len(claims)} claims")
+    if args.out:
+        to_annotator_frame(claims['claim_id'], suggestions).to_csv(args.out, index=False)
+        print(f"[+] Suggestions -> {args.out}")
+    print("\nSuggested categories:")
+    print(suggestions['category'].value_counts().to_string())
+
+    # Agreement with each human, computed by reliability_check like annotator 1 vs 2
+    annotator2, _ = load_annotations(os.path.join(DATA_DIR, 'annotator2_classifications.csv'))
+    as_labels = claims.drop(columns=['category', 'boundary_case']).merge(
+        annotator2[['claim_id', 'category', 'boundary_case']], on='claim_id')
+    annotations = to_annotations(claims['claim_id'], suggestions)
+
+    # The rules were written with these 50 claims in view: this is not a held-out estimate
+    print("\nAgreement with human annotators (in-sample):")
+    for human, labels in (('annotator1', claims), ('annotator2', as_labels)):
+        overall = compute_reliability(labels, annotations)['results']['overall']
+        majority = labels['category'].value_counts().iloc[0] / len(labels)
+        print(f"  {human}: agreement {overall['simple_agreement'] * 100:.1f}% "
+              f"(always '{labels['category'].value_counts().index[0]}': {majority * 100:.1f}%), "
+              f"κ = {overall['cohens_kappa']:.3f}, α = {overall['krippendorffs_alpha']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+FILE: raster_heatmap.py
+PURPOSE: Universe-scale heatmaps (company x tactic, company x scenario,
+         company x section) rendered from the results store.
+         Cells are streamed from SQLite in chunks and accumulated straight
+         into a fixed-resolution raster: companies are ranked by C_Score and
+         binned into at most RASTER_ROWS rows, each pixel holding the mean of
+         its companies. No pivot DataFrame is built, so memory is bounded by
+         the raster and one chunk, whatever the number of companies. Small
+         matrices keep the annotated seaborn heatmap; past ANNOT_LIMIT cells
+         annotations are dropped and the raster is drawn with imshow.
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from claims_loader import TACTICS
+from results_store import ResultsStore, report_record, DEFAULT_PROFILE, DEFAULT_SCENARIO
+
+RASTER_ROWS = 1000
+ANNOT_LIMIT = 400
+CHUNK_SIZE = 20_000
+
+# kind -> (table, column field, value field, fill for companies without a row)
+MATRICES = {
+    'tactic': ('tactic_results', 'tactic', 'count', 0.0),
+    'penalty': ('tactic_results', 'tactic', 'penalty', 0.0),
+    'scenario': ('report_results', 'scenario', 'c_score', None),
+    'section': ('section_results', 'section', 'score', None),
+}
+
+RANKED = ("WITH ranked AS ("
+          "SELECT company, ROW_NUMBER() OVER (ORDER BY c_score, company) - 1 AS rank FROM report_results "
+          "WHERE year=? AND profile_version=? AND scenario=?) ")
+
+
+def draw_heatmap(data, ax, annot_limit=ANNOT_LIMIT, cmap='viridis', cbar_label=None, fmt='.1f', **kwargs):
+    """
+    Annotated sns.heatmap for data with at most annot_limit cells (extra
+    kwargs go to seaborn); a plain imshow raster with a colorbar otherwise.
+    data is a DataFrame, or a (matrix, row_labels, col_labels) tuple.
+    """
+    if hasattr(data, 'to_numpy'):
+        matrix, rows, cols = data.to_numpy(dtype=float), list(data.index), list(data.columns)
+    else:
+        matrix, rows, cols = data
+    if matrix.size <= annot_limit:
+        sns.heatmap(data if hasattr(data, 'to_numpy') else matrix, annot=True, fmt=fmt, cmap=cmap,
+                    xticklabels=cols, yticklabels=rows, cbar_kws={'label': cbar_label} if cbar_label else None,
+                    ax=ax, **kwargs)
+        return ax
+
+    image = ax.imshow(np.ma.masked_invalid(matrix), aspect='auto', interpolation='nearest', cmap=cmap,
+                      vmin=kwargs.get('vmin'), vmax=kwargs.get('vmax'))
+    plt.colorbar(image, ax=ax, label=cbar_label)
+    ax.set_xticks(range(len(cols)), cols)
+    ticks = np.linspace(0, len(rows) - 1, min(len(rows), 10)).astype(int)
+    ax.set_yticks(ticks, [rows[i] for i in ticks])
+    ax.grid(False)
+    return ax
+
+
+class RasterAccumulator:
+    """Sum/count raster over (company rank, column) cells, rows binned to height."""
+
+    def __init__(self, n_rows, n_cols, height=RASTER_ROWS):
+        self.n_rows, self.n_cols = n_rows, n_cols
+        self.height = min(height, n_rows)
+        self.sums = np.zeros(self.height * n_cols)
+        self.counts = np.zeros(self.height * n_cols, dtype=np.int64)
+
+    def row_bin(self, ranks):
+        return np.asarray(ranks, dtype=np.int64) * self.height // self.n_rows
+
+    def add(self, ranks, cols, values):
+        flat = self.row_bin(ranks) * self.n_cols + np.asarray(cols, dtype=np.int64)
+        self.sums += np.bincount(flat, weights=values, minlength=self.sums.size)
+        self.counts += np.bincount(flat, minlength=self.counts.size)
+
+    def row_edges(self):
+        """First company rank of every raster row, plus n_rows."""
+        return np.searchsorted(self.row_bin(np.arange(self.n_rows)), np.arange(self.height + 1))
+
+    def raster(self, fill=None):
+        """
+        Mean per pixel. With fill, companies that have no row for a column
+        count as fill (e.g. 0 detections); otherwise such pixels are NaN.
+        """
+        sums = self.sums.reshape(self.height, self.n_cols)
+        counts = self.counts.reshape(self.height, self.n_cols)
+        if fill is not None:
+            per_row = np.diff(self.row_edges())[:, None]
+            return (sums + fill * (per_row - counts)) / per_row
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+
+def raster_from_store(store, kind='tactic', year=2023, profile_version=DEFAULT_PROFILE,
+                      scenario=DEFAULT_SCENARIO, height=RASTER_ROWS, chunk_size=CHUNK_SIZE):
+    """
+    (raster, row_labels, columns) for one matrix kind. Rows are companies
+    ranked by their `scenario` C_Score (ascending); when there are more than
+    `height` companies each row covers a rank range.
+    """
+    table, col_field, value_field, fill = MATRICES[kind]
+    key = (year, profile_version, scenario)
+    n_rows = store.conn.execute('SELECT COUNT(*) FROM report_results WHERE year=? AND profile_version=? '
+                                'AND scenario=?', key).fetchone()[0]
+    if n_rows == 0:
+        raise ValueError(f'no results for {key}')
+
+    col_filter = '' if kind == 'scenario' else ' AND t.scenario=?'
+    params = key + (year, profile_version) + (() if kind == 'scenario' else (scenario,))
+    columns = [r[0] for r in store.conn.execute(
+        f'SELECT DISTINCT {col_field} FROM {table} t WHERE year=? AND profile_version=?{col_filter} '
+        f'ORDER BY {col_field}', params[3:])]
+    if kind in ('tactic', 'penalty'):
+        columns = [t for t in TACTICS if t in columns] + [t for t in columns if t not in TACTICS]
+    col_code = {c: i for i, c in enumerate(columns)}
+
+    acc = RasterAccumulator(n_rows, len(columns), height)
+    cursor = store.conn.cursor()
+    cursor.row_factory = None      # plain tuples; sqlite3.Row is slow at this volume
+    cursor.execute(
+        RANKED + f'SELECT r.rank, t.{col_field}, t.{value_field} FROM {table} t JOIN ranked r USING (company) '
+                 f'WHERE t.year=? AND t.profile_version=?{col_filter}', params)
+    while True:
+        chunk = cursor.fetchmany(chunk_size)
+        if not chunk:
+            break
+        ranks, cols, values = zip(*chunk)
+        acc.add(ranks, [col_code[c] for c in cols], np.asarray(values, dtype=np.float64))
+
+    if acc.height == n_rows:
+        rows = [r[0] for r in store.conn.execute(RANKED + 'SELECT company FROM ranked ORDER BY rank', key)]
+    else:
+        edges = acc.row_edges()
+        rows = [f'{lo + 1}-{hi}' for lo, hi in zip(edges[:-1], edges[1:])]
+    return acc.raster(fill), rows, columns
+
+
+def plot_raster(raster, rows, columns, path, title, cbar_label, annot_limit=ANNOT_LIMIT, cmap='Greens'):
+    with plt.style.context('seaborn-v0_8-darkgrid', after_reset=True):
+        fig, ax = plt.subplots(figsize=(10, 10 if len(rows) > 40 else 6))
+        draw_heatmap((raster, rows, columns), ax, annot_limit, cmap=cmap, cbar_label=cbar_label)
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+        ax.set_ylabel('Company (ranked by C_Score)', fontsize=12, fontweight='bold')
+        plt.xticks(rotation=45, ha='right')
+        plt.tight_layout()
+        plt.savefig(path, dpi=150)
+        plt.close('all')
+    return path
+
+
+def synthetic_universe(store, n_companies, year=2023, seed=0, batch=10_000):
+    """Fill a store with n_companies synthetic reports (demo data)."""
+    rng = np.random.default_rng(seed)
+    shifts = {'Conservative': 4.0, DEFAULT_SCENARIO: 0.0, 'Aggressive': -6.0}
+    for start in range(0, n_companies, batch):
+        records = []
+        for i in range(start, min(start + batch, n_companies)):
+            base = float(np.clip(rng.normal(60, 18), 0, 100))
+            tactics = {t: int(c) for t, c in zip(TACTICS, rng.poisson((100 - base) / 40, len(TACTICS))) if c}
+            sections = {s: float(base + d) for s, d in zip(['Climate', 'Human Capital', 'Sustainable Finance'],
+                                                           rng.normal(0, 10, 3))}
+            for scenario, shift in shifts.items():
+                res = {'final_c_score': float(np.clip(base + shift, 0, 100)), 'section_scores': sections,
+                       'penalties_applied': tactics if scenario == DEFAULT_SCENARIO else {}}
+                records.append(report_record(res, f'Company {i:06d}', year, scenario=scenario))
+        store.insert_results(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Raster heatmaps of the results store.')
+    parser.add_argument('--companies', type=int, default=50_000, help='size of the synthetic demo universe')
+    parser.add_argument('--db', help='existing results store (default: a temporary synthetic one)')
+    parser.add_argument('--out-dir', default=None)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: UNIVERSE RASTER HEATMAPS")
+    print("=" * 80)
+
+    # The synthetic store and unnamed outputs go away on exit
+    with tempfile.TemporaryDirectory(prefix='cscore_raster_') as work_dir:
+        run_demo(args, work_dir)
+
+
+def run_demo(args, work_dir):
+    out_dir = args.out_dir or work_dir
+    os.makedirs(out_dir, exist_ok=True)
+    db = args.db or os.path.join(work_dir, 'universe.sqlite')
+    with ResultsStore(db) as store:
+        if not args.db:
+            start = time.perf_counter()
+            synthetic_universe(store, args.companies)
+            print(f"[+] {args.companies:,} synthetic companies written to a temporary store "
+                  f"({time.perf_counter() - start:.1f}s)")
+
+        for kind, title, label in [('tactic', 'Greenwashing Tactics by Company', 'Mean detections'),
+                                   ('scenario', 'C_Score by Weight Scenario', 'Mean C_Score')]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            raster, rows, columns = raster_from_store(store, kind)
+            path = plot_raster(raster, rows, columns, os.path.join(out_dir, f'{kind}_raster.png'), title, label)
+            peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+            print(f"[+] {kind:8s} raster {raster.shape[0]}x{raster.shape[1]} in "
+                  f"{time.perf_counter() - start:.1f}s (py peak {peak:.1f} MB) -> "
+                  f"{path if args.out_dir else 'temporary PNG (pass --out-dir to keep it)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,16 @@ PURPOSE: Inter-Rater Reliability Analysis (Annotator 1 vs Annotator 2).
 
 import pandas as pd
 import numpy as np
-from sklearn.metrics import cohen_kappa_score, confusion_matrix
+from sklearn.metrics import cohen_kappa_score
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 import json
+from claims_loader import CATEGORIES, REPORT_COL, load_claims, load_annotations, print_errors, ClaimSchemaError
+from annotation_store import AnnotationStore
+from instrumentation import StageProfiler, stage, write_profile
+from results_export import ResultsWriter, BATCH_ROWS
+from grouped_reliability import ALL, KAPPA_ACCEPTABLE, grouped_reliability
 
 # --- 1. DYNAMIC PATH SETUP ---
 # This determines the root folder automatically based on where this script is located
@@ -20,146 +25,26 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 VIS_DIR = os.path.join(BASE_DIR, 'visualizations')
 DOCS_DIR = os.path.join(BASE_DIR, 'docs')
 
+DETAILS_FILE = 'inter_rater_disagreements.jsonl'
+TOP_N = 10      # disagreement pairs printed; every disagreement goes to DETAILS_FILE
+
+DETAIL_FIELDS = [('claim_id', 'string'), ('annotator1', 'string'), ('annotator2', 'string'),
+                 ('ann1_boundary', 'bool'), ('ann2_boundary', 'bool'), ('verbatim_text', 'string')]
+
 # Create output directories if they don't exist
 for d in [VIS_DIR, DOCS_DIR]:
     os.makedirs(d, exist_ok=True)
 
-# Set style
-plt.style.use('seaborn-v0_8-muted')
-
-print("="*80)
-print("INTER-RATER RELIABILITY ANALYSIS")
-print("C_Score Framework - Morgan Stanley Dataset")
-print("="*80)
-
-# --- 2. LOAD DATA ---
-try:
-    original = pd.read_csv(os.path.join(DATA_DIR, 'morgan_stanley_claims_dataset.csv'))
-    annotator2 = pd.read_csv(os.path.join(DATA_DIR, 'annotator2_classifications.csv'))
-except FileNotFoundError as e:
-    print(f"[!] CRITICAL ERROR: Input files missing in {DATA_DIR}")
-    print(f"    Ensure 'morgan_stanley_claims_dataset.csv' and 'annotator2_classifications.csv' are in the /data folder.")
-    exit()
-
-# Merge datasets
-comparison = original[['claim_id', 'verbatim_text', 'category', 'boundary_case']].copy()
-comparison.columns = ['claim_id', 'verbatim_text', 'annotator1_category', 'annotator1_boundary']
-comparison = comparison.merge(annotator2[['claim_id', 'annotator2_category', 'annotator2_boundary_case']], 
-                              on='claim_id')
-comparison.columns = ['claim_id', 'verbatim_text', 'annotator1', 'ann1_boundary', 'annotator2', 'ann2_boundary']
-
-# Calculate agreement
-comparison['agree'] = comparison['annotator1'] == comparison['annotator2']
-total_claims = len(comparison)
-agreements = comparison['agree'].sum()
-disagreements = total_claims - agreements
-simple_agreement = agreements / total_claims
-
-print(f"\n{'─'*80}")
-print("1. SIMPLE AGREEMENT")
-print(f"{'─'*80}")
-print(f"Total claims: {total_claims}")
-print(f"Agreements: {agreements} ({simple_agreement*100:.1f}%)")
-print(f"Disagreements: {disagreements} ({(1-simple_agreement)*100:.1f}%)")
-
-# Cohen's Kappa
-kappa = cohen_kappa_score(comparison['annotator1'], comparison['annotator2'])
-
-print(f"\n{'─'*80}")
-print("2. COHEN'S KAPPA (Agreement Adjusted for Chance)")
-print(f"{'─'*80}")
-print(f"κ = {kappa:.3f}")
-
-# Interpretation
-if kappa < 0: interpretation = "Poor (worse than chance)"
-elif kappa < 0.20: interpretation = "Slight agreement"
-elif kappa < 0.40: interpretation = "Fair agreement"
-elif kappa < 0.60: interpretation = "Moderate agreement"
-elif kappa < 0.80: interpretation = "Substantial agreement"
-else: interpretation = "Almost perfect agreement"
-
-print(f"Interpretation: {interpretation}")
-print(f"\nBenchmark for publication:")
-print(f"  κ > 0.70: Acceptable for research (SUBSTANTIAL)")
-print(f"  κ > 0.80: Excellent (ALMOST PERFECT)")
-print(f"  Current: κ = {kappa:.3f} → {interpretation.upper()}")
-
-#  DISAGREEMENT & BOUNDARY ANALYSIS ---
-print(f"\n{'─'*80}")
-print("DISAGREEMENT & BOUNDARY ANALYSIS")
-print(f"{'─'*80}")
-
-disagreements_df = comparison[~comparison['agree']].copy()
-boundary_either = comparison[(comparison['ann1_boundary']) | (comparison['ann2_boundary'])]
-boundary_both = comparison[(comparison['ann1_boundary']) & (comparison['ann2_boundary'])]
-boundary_agreement = boundary_either['agree'].mean() if len(boundary_either) > 0 else 0.0
-
-if len(disagreements_df) > 0:
-    print(f"\nDisagreements by category pair:")
-    for idx, row in disagreements_df.iterrows():
-        print(f"\n  Claim {row['claim_id']}:")
-        print(f"    Annotator 1: {row['annotator1']}")
-        print(f"    Annotator 2: {row['annotator2']}")
-        print(f"    Text: {row['verbatim_text'][:100]}...")
-        if row['ann1_boundary'] or row['ann2_boundary']:
-            print(f"    ⚠️ BOUNDARY CASE (flagged by at least one annotator)")
-else:
-    print("No disagreements!")
-
-# Disagreement analysis
-print(f"\n{'─'*80}")
-print("3. DISAGREEMENT ANALYSIS")
-print(f"{'─'*80}")
-
-disagreements_df = comparison[~comparison['agree']].copy()
-if len(disagreements_df) > 0:
-    print(f"\nDisagreements by category pair:")
-    for idx, row in disagreements_df.iterrows():
-        print(f"\n  Claim {row['claim_id']}:")
-        print(f"    Annotator 1: {row['annotator1']}")
-        print(f"    Annotator 2: {row['annotator2']}")
-        print(f"    Text: {row['verbatim_text'][:100]}...")
-        if row['ann1_boundary'] or row['ann2_boundary']:
-            print(f"    ⚠️ BOUNDARY CASE (flagged by at least one annotator)")
-else:
-    print("No disagreements!")
-
-# Category-specific agreement
-print(f"\n{'─'*80}")
-print("4. PER-CATEGORY AGREEMENT")
-print(f"{'─'*80}")
-
-categories = sorted(set(comparison['annotator1'].unique()) | set(comparison['annotator2'].unique()))
-print(f"\nCategories in dataset: {', '.join(categories)}")
-
-category_agreement = {}
-for cat in categories:
-    ann1_cat = comparison[comparison['annotator1'] == cat]
-    precision = (ann1_cat['agree'].sum() / len(ann1_cat)) * 100 if len(ann1_cat) > 0 else np.nan
-    
-    ann2_cat = comparison[comparison['annotator2'] == cat]
-    recall = (ann2_cat['agree'].sum() / len(ann2_cat)) * 100 if len(ann2_cat) > 0 else np.nan
-    
-    category_agreement[cat] = {
-        'annotator1_count': len(ann1_cat),
-        'annotator2_count': len(ann2_cat),
-        'precision': precision,
-        'recall': recall
-    }
-
-agreement_df = pd.DataFrame(category_agreement).T
-print("\n", agreement_df.to_string())
 
-# Confusion matrix
-print(f"\n{'─'*80}")
-print("5. CONFUSION MATRIX")
-print(f"{'─'*80}")
+# Kappa interpretation (Landis & Koch)
+def interpret_kappa(kappa):
+    if kappa < 0: return "Poor (worse than chance)"
+    elif kappa < 0.20: return "Slight agreement"
+    elif kappa < 0.40: return "Fair agreement"
+    elif kappa < 0.60: return "Moderate agreement"
+    elif kappa < 0.80: return "Substantial agreement"
+    else: return "Almost perfect agreement"
 
-cm = confusion_matrix(comparison['annotator1'], comparison['annotator2'], labels=categories)
-cm_df = pd.DataFrame(cm, index=categories, columns=categories)
-print("\nRows = Annotator 1, Columns = Annotator 2")
-print("Diagonal values = agreements\n")
-print(cm_df.to_string())
 
 # Krippendorff's Alpha Function (User Provided)
 def krippendorff_alpha_nominal(data1, data2):
@@ -194,110 +79,381 @@ def krippendorff_alpha_nominal(data1, data2):
     
     return alpha
 
-alpha = krippendorff_alpha_nominal(comparison['annotator1'].values, comparison['annotator2'].values)
-
-print(f"\n{'─'*80}")
-print("8. KRIPPENDORFF'S ALPHA")
-print(f"{'─'*80}")
-print(f"α = {alpha:.3f}")
-
-# --- VISUALIZATIONS ---
-print(f"\n{'─'*80}")
-print("GENERATING VISUALIZATIONS")
-print(f"{'─'*80}")
-
-# Visualization 1: Confusion Matrix Heatmap
-fig, ax = plt.subplots(figsize=(10, 8))
-sns.heatmap(cm_df, annot=True, fmt='d', cmap='Blues', cbar_kws={'label': 'Count'},
-            linewidths=0.5, linecolor='gray', ax=ax)
-ax.set_title('Inter-Rater Confusion Matrix\n(Diagonal = Agreement)', 
-             fontsize=14, fontweight='bold', pad=20)
-ax.set_xlabel('Annotator 2 Classification', fontsize=12, fontweight='bold')
-ax.set_ylabel('Annotator 1 Classification', fontsize=12, fontweight='bold')
-plt.xticks(rotation=45, ha='right')
-plt.yticks(rotation=0)
-plt.tight_layout()
-
-# Save to Visualization Folder
-save_path_12 = os.path.join(VIS_DIR, '12_confusion_matrix.png')
-plt.savefig(save_path_12, dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {save_path_12}")
-
-# Visualization 2: Agreement Metrics
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-
-# Simple agreement vs kappa
-metrics = ['Simple\nAgreement', "Cohen's κ", "Krippendorff's α"]
-values = [simple_agreement, kappa, alpha]
-colors = ['#3498db', '#2ecc71', '#9b59b6']
-bars = ax1.bar(metrics, values, color=colors, alpha=0.8)
-
-ax1.set_ylabel('Agreement Score', fontsize=12, fontweight='bold')
-ax1.set_title('Inter-Rater Reliability Metrics', fontsize=14, fontweight='bold', pad=20)
-ax1.set_ylim([0, 1])
-ax1.axhline(y=0.70, color='orange', linestyle='--', linewidth=2, alpha=0.7, label='Acceptable (0.70)')
-ax1.axhline(y=0.80, color='green', linestyle='--', linewidth=2, alpha=0.7, label='Excellent (0.80)')
-ax1.legend()
-ax1.grid(axis='y', alpha=0.3)
-
-for bar, val in zip(bars, values):
-    height = bar.get_height()
-    ax1.text(bar.get_x() + bar.get_width()/2., height + 0.02,
-             f'{val:.3f}', ha='center', va='bottom', fontweight='bold', fontsize=11)
-
-# Per-category agreement
-cats_with_data = agreement_df[agreement_df['annotator1_count'] > 0].index
-precisions = agreement_df.loc[cats_with_data, 'precision'].values
-x_pos = np.arange(len(cats_with_data))
-
-bars2 = ax2.barh(x_pos, precisions, color='steelblue', alpha=0.8)
-ax2.set_yticks(x_pos)
-ax2.set_yticklabels(cats_with_data, fontsize=10)
-ax2.set_xlabel('Agreement Rate (%)', fontsize=12, fontweight='bold')
-ax2.set_title('Agreement Rate by Category', fontsize=14, fontweight='bold', pad=20)
-ax2.set_xlim([0, 110])
-ax2.axvline(x=80, color='green', linestyle='--', linewidth=1, alpha=0.5, label='80% threshold')
-ax2.legend()
-ax2.grid(axis='x', alpha=0.3)
-
-for i, (bar, val) in enumerate(zip(bars2, precisions)):
-    if not np.isnan(val):
-        ax2.text(val + 2, i, f'{val:.1f}%', va='center', fontweight='bold', fontsize=9)
-
-plt.tight_layout()
-# Save to Visualization Folder
-save_path_13 = os.path.join(VIS_DIR, '13_agreement_metrics.png')
-plt.savefig(save_path_13, dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {save_path_13}")
-
-# Save detailed results to JSON
-results = {
-    'overall': {
-        'total_claims': int(total_claims),
-        'agreements': int(agreements),
-        'disagreements': int(disagreements),
-        'simple_agreement': float(simple_agreement),
-        'cohens_kappa': float(kappa),
-        'krippendorffs_alpha': float(alpha),
-        'interpretation': interpretation
-    },
-    'disagreements': disagreements_df[['claim_id', 'annotator1', 'annotator2', 'verbatim_text']].to_dict('records'),
-    'category_agreement': agreement_df.to_dict(),
-    'boundary_cases': {
-        'flagged_by_either': int(len(boundary_either)),
-        'flagged_by_both': int(len(boundary_both)),
-        'agreement_on_boundary': float(boundary_agreement) if len(boundary_either) > 0 else None
+
+def disagreement_analysis(comparison, categories):
+    """
+    One vectorized pass over the comparison: disagreements counted per
+    (annotator1, annotator2) category pair, with how many of them either /
+    both annotators flagged as boundary cases, and the overall boundary-case
+    statistics. Returns (pairs DataFrame sorted by count, boundary dict).
+    """
+    n_cat = len(categories)
+    a1 = pd.Categorical(comparison['annotator1'], categories=categories).codes.astype(np.int64)
+    a2 = pd.Categorical(comparison['annotator2'], categories=categories).codes.astype(np.int64)
+    b1 = comparison['ann1_boundary'].to_numpy(bool)
+    b2 = comparison['ann2_boundary'].to_numpy(bool)
+    disagree, either, both = a1 != a2, b1 | b2, b1 & b2
+
+    pair = (a1 * n_cat + a2)[disagree]
+    counts = [np.bincount(pair, weights=w, minlength=n_cat * n_cat).astype(np.int64)
+              for w in (None, either[disagree], both[disagree])]
+    nonzero = np.flatnonzero(counts[0])
+    names = np.array(categories, dtype=object)
+    pairs = pd.DataFrame({
+        'annotator1': names[nonzero // n_cat],
+        'annotator2': names[nonzero % n_cat],
+        'count': counts[0][nonzero],
+        'share': counts[0][nonzero] / max(int(disagree.sum()), 1),
+        'boundary_either': counts[1][nonzero],
+        'boundary_both': counts[2][nonzero],
+    }).sort_values(['count', 'annotator1', 'annotator2'], ascending=[False, True, True], ignore_index=True)
+
+    n_either = int(either.sum())
+    boundary = {
+        'flagged_by_either': n_either,
+        'flagged_by_both': int(both.sum()),
+        'agreement_on_boundary': float((either & ~disagree).sum() / n_either) if n_either else None,
+    }
+    return pairs, boundary
+
+
+def compute_reliability(original, annotator2, profiler=None):
+    """
+    Agreement statistics between the dataset labels (annotator 1) and
+    annotator 2. Both frames come from claims_loader. Returns a dict with the
+    comparison table, the statistics and the inter_rater_reliability.json
+    payload under 'results'.
+    """
+    # Join annotators by claim index (columns are addressed by annotator name, not position)
+    store = AnnotationStore.from_claims(original, annotator='annotator1')
+    unmatched = store.add_annotations(annotator2, name='annotator2')
+
+    comparison = store.pair_frame('annotator1', 'annotator2').rename(columns={
+        'annotator1_boundary': 'ann1_boundary',
+        'annotator2_boundary': 'ann2_boundary',
+    })
+    comparison.insert(2, 'verbatim_text', original['verbatim_text'].to_numpy()[comparison['claim_index']])
+
+    # Calculate agreement
+    comparison['agree'] = comparison['annotator1'] == comparison['annotator2']
+    total_claims = len(comparison)
+    agreements = comparison['agree'].sum()
+    disagreements = total_claims - agreements
+    simple_agreement = agreements / total_claims
+
+    # Cohen's Kappa
+    with stage(profiler, 'reliability/kappa'):
+        kappa = cohen_kappa_score(comparison['annotator1'], comparison['annotator2'])
+    interpretation = interpret_kappa(kappa)
+
+    # Per-group confusion tensor (whole dataset, sections, reports if present)
+    with stage(profiler, 'reliability/groups'):
+        groupings = (ALL, 'section') + ((REPORT_COL,) if REPORT_COL in original else ())
+        group_stats, tensor, keys = grouped_reliability(comparison, original, groupings)
+
+    # Category-specific agreement and confusion matrix, from the whole-dataset slice
+    categories = sorted(set(comparison['annotator1'].unique()) | set(comparison['annotator2'].unique()))
+    codes = [CATEGORIES.index(cat) for cat in categories]
+    cm = tensor[keys.index((ALL, ALL))][np.ix_(codes, codes)]
+    ann1_count, ann2_count, agreed = cm.sum(axis=1), cm.sum(axis=0), np.diag(cm)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        agreement_df = pd.DataFrame({
+            'annotator1_count': ann1_count.astype(float),
+            'annotator2_count': ann2_count.astype(float),
+            'precision': np.where(ann1_count > 0, agreed / ann1_count * 100, np.nan),
+            'recall': np.where(ann2_count > 0, agreed / ann2_count * 100, np.nan),
+        }, index=categories)
+    cm_df = pd.DataFrame(cm, index=categories, columns=categories)
+    by_group = group_stats[group_stats['grouping'] != ALL].copy()
+    by_group['interpretation'] = [interpret_kappa(k) if not np.isnan(k) else None for k in by_group['kappa']]
+
+    with stage(profiler, 'reliability/alpha'):
+        alpha = krippendorff_alpha_nominal(comparison['annotator1'].values, comparison['annotator2'].values)
+
+    with stage(profiler, 'reliability/disagreements'):
+        pairs, boundary = disagreement_analysis(comparison, categories)
+
+    results = {
+        'overall': {
+            'total_claims': int(total_claims),
+            'agreements': int(agreements),
+            'disagreements': int(disagreements),
+            'simple_agreement': float(simple_agreement),
+            'cohens_kappa': float(kappa),
+            'krippendorffs_alpha': float(alpha),
+            'interpretation': interpretation
+        },
+        'disagreement_pairs': pairs.to_dict('records'),
+        'disagreement_details': DETAILS_FILE,
+        'category_agreement': agreement_df.to_dict(),
+        'confusion_matrix': {'categories': categories, 'counts': cm.astype(int).tolist()},
+        'boundary_cases': boundary,
+        'by_group': {
+            grouping: frame.drop(columns='grouping').astype(object).where(frame.notna(), None).to_dict('records')
+            for grouping, frame in by_group.groupby('grouping', sort=False)
+        }
     }
-}
-
-# Save to Docs Folder (Correct location for reports)
-json_path = os.path.join(DOCS_DIR, 'inter_rater_reliability.json')
-with open(json_path, 'w') as f:
-    json.dump(results, f, indent=2)
-
-print(f"\n{'─'*80}")
-print("ANALYSIS COMPLETE")
-print(f"{'─'*80}")
-print(f"📊 Final Kappa: {kappa:.3f}")
-print(f"📁 Images saved to: {VIS_DIR}")
-print(f"📁 JSON saved to:   {DOCS_DIR}")
\ No newline at end of file
+
+    return {
+        'unmatched': unmatched,
+        'comparison': comparison,
+        'disagreement_pairs': pairs,
+        'simple_agreement': simple_agreement,
+        'kappa': kappa,
+        'alpha': alpha,
+        'categories': categories,
+        'agreement_df': agreement_df,
+        'cm_df': cm_df,
+        'by_group': by_group,
+        'results': results,
+    }
+
+
+def print_disagreements(pairs, boundary, top_n=TOP_N):
+    """Top-N disagreement pairs and the boundary-case summary (claim details are in DETAILS_FILE)."""
+    if len(pairs) > 0:
+        print(f"\nDisagreements by category pair (top {min(top_n, len(pairs))} of {len(pairs)}):")
+        print(f"  {'Annotator 1':22s} {'Annotator 2':22s} {'Count':>6s} {'Share':>7s} {'Boundary':>9s}")
+        for row in pairs.head(top_n).itertuples():
+            print(f"  {row.annotator1:22s} {row.annotator2:22s} {row.count:6d} {row.share:7.1%} {row.boundary_either:9d}")
+        if len(pairs) > top_n:
+            print(f"  ... {int(pairs['count'].iloc[top_n:].sum())} more disagreements in {len(pairs) - top_n} other pairs")
+    else:
+        print("No disagreements!")
+
+    print(f"\nBoundary cases flagged by either annotator: {boundary['flagged_by_either']} "
+          f"(both: {boundary['flagged_by_both']})")
+    if boundary['agreement_on_boundary'] is not None:
+        print(f"Agreement on boundary cases: {boundary['agreement_on_boundary']*100:.1f}%")
+
+
+def print_group_reliability(by_group, top_n=TOP_N):
+    """Per-group κ/α; groupings with more than top_n groups show the least reliable ones."""
+    for grouping, frame in by_group.groupby('grouping', sort=False):
+        flagged = int(frame['flagged'].sum())
+        print(f"\nBy {grouping} ({len(frame)} groups, {flagged} below κ = {KAPPA_ACCEPTABLE:.2f}):")
+        if len(frame) > top_n:
+            frame = frame.nsmallest(top_n, 'kappa')
+        for row in frame.itertuples():
+            kappa = f"{row.kappa:.3f}" if not np.isnan(row.kappa) else "  n/a"
+            print(f"  {str(row.group):22s} n={row.n_claims:<5d} agreement {row.simple_agreement*100:5.1f}%  "
+                  f"κ = {kappa}  α = {row.alpha:.3f}{'  ⚠️ BELOW BENCHMARK' if row.flagged else ''}")
+
+
+def print_reliability(rel):
+    overall = rel['results']['overall']
+    kappa, interpretation = rel['kappa'], overall['interpretation']
+    simple_agreement = rel['simple_agreement']
+
+    if rel['unmatched']:
+        print(f"[!] {rel['unmatched']} annotator 2 labels refer to unknown claim_ids")
+
+    print(f"\n{'─'*80}")
+    print("1. SIMPLE AGREEMENT")
+    print(f"{'─'*80}")
+    print(f"Total claims: {overall['total_claims']}")
+    print(f"Agreements: {overall['agreements']} ({simple_agreement*100:.1f}%)")
+    print(f"Disagreements: {overall['disagreements']} ({(1-simple_agreement)*100:.1f}%)")
+
+    print(f"\n{'─'*80}")
+    print("2. COHEN'S KAPPA (Agreement Adjusted for Chance)")
+    print(f"{'─'*80}")
+    print(f"κ = {kappa:.3f}")
+    print(f"Interpretation: {interpretation}")
+    print(f"\nBenchmark for publication:")
+    print(f"  κ > 0.70: Acceptable for research (SUBSTANTIAL)")
+    print(f"  κ > 0.80: Excellent (ALMOST PERFECT)")
+    print(f"  Current: κ = {kappa:.3f} → {interpretation.upper()}")
+
+    print(f"\n{'─'*80}")
+    print("3. DISAGREEMENT & BOUNDARY ANALYSIS")
+    print(f"{'─'*80}")
+    print_disagreements(rel['disagreement_pairs'], rel['results']['boundary_cases'])
+
+    print(f"\n{'─'*80}")
+    print("4. PER-CATEGORY AGREEMENT")
+    print(f"{'─'*80}")
+    print(f"\nCategories in dataset: {', '.join(rel['categories'])}")
+    print("\n", rel['agreement_df'].to_string())
+
+    print(f"\n{'─'*80}")
+    print("5. CONFUSION MATRIX")
+    print(f"{'─'*80}")
+    print("\nRows = Annotator 1, Columns = Annotator 2")
+    print("Diagonal values = agreements\n")
+    print(rel['cm_df'].to_string())
+
+    print(f"\n{'─'*80}")
+    print("6. RELIABILITY BY SECTION AND REPORT")
+    print(f"{'─'*80}")
+    print_group_reliability(rel['by_group'])
+
+    print(f"\n{'─'*80}")
+    print("8. KRIPPENDORFF'S ALPHA")
+    print(f"{'─'*80}")
+    print(f"α = {rel['alpha']:.3f}")
+
+
+def plot_reliability(rel, vis_dir=VIS_DIR):
+    """Figures 12 and 13."""
+    cm_df, agreement_df = rel['cm_df'], rel['agreement_df']
+
+    print(f"\n{'─'*80}")
+    print("GENERATING VISUALIZATIONS")
+    print(f"{'─'*80}")
+
+    with plt.style.context('seaborn-v0_8-muted', after_reset=True):
+        # Visualization 1: Confusion Matrix Heatmap
+        fig, ax = plt.subplots(figsize=(10, 8))
+        sns.heatmap(cm_df, annot=True, fmt='d', cmap='Blues', cbar_kws={'label': 'Count'},
+                    linewidths=0.5, linecolor='gray', ax=ax)
+        ax.set_title('Inter-Rater Confusion Matrix\n(Diagonal = Agreement)',
+                     fontsize=14, fontweight='bold', pad=20)
+        ax.set_xlabel('Annotator 2 Classification', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Annotator 1 Classification', fontsize=12, fontweight='bold')
+        plt.xticks(rotation=45, ha='right')
+        plt.yticks(rotation=0)
+        plt.tight_layout()
+
+        # Save to Visualization Folder
+        save_path_12 = os.path.join(vis_dir, '12_confusion_matrix.png')
+        plt.savefig(save_path_12, dpi=300, bbox_inches='tight')
+        print(f"✓ Saved: {save_path_12}")
+
+        # Visualization 2: Agreement Metrics
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+
+        # Simple agreement vs kappa
+        metrics = ['Simple\nAgreement', "Cohen's κ", "Krippendorff's α"]
+        values = [rel['simple_agreement'], rel['kappa'], rel['alpha']]
+        colors = ['#3498db', '#2ecc71', '#9b59b6']
+        bars = ax1.bar(metrics, values, color=colors, alpha=0.8)
+
+        ax1.set_ylabel('Agreement Score', fontsize=12, fontweight='bold')
+        ax1.set_title('Inter-Rater Reliability Metrics', fontsize=14, fontweight='bold', pad=20)
+        ax1.set_ylim([0, 1])
+        ax1.axhline(y=0.70, color='orange', linestyle='--', linewidth=2, alpha=0.7, label='Acceptable (0.70)')
+        ax1.axhline(y=0.80, color='green', linestyle='--', linewidth=2, alpha=0.7, label='Excellent (0.80)')
+        ax1.legend()
+        ax1.grid(axis='y', alpha=0.3)
+
+        for bar, val in zip(bars, values):
+            height = bar.get_height()
+            ax1.text(bar.get_x() + bar.get_width()/2., height + 0.02,
+                     f'{val:.3f}', ha='center', va='bottom', fontweight='bold', fontsize=11)
+
+        # Per-category agreement
+        cats_with_data = agreement_df[agreement_df['annotator1_count'] > 0].index
+        precisions = agreement_df.loc[cats_with_data, 'precision'].values
+        x_pos = np.arange(len(cats_with_data))
+
+        bars2 = ax2.barh(x_pos, precisions, color='steelblue', alpha=0.8)
+        ax2.set_yticks(x_pos)
+        ax2.set_yticklabels(cats_with_data, fontsize=10)
+        ax2.set_xlabel('Agreement Rate (%)', fontsize=12, fontweight='bold')
+        ax2.set_title('Agreement Rate by Category', fontsize=14, fontweight='bold', pad=20)
+        ax2.set_xlim([0, 110])
+        ax2.axvline(x=80, color='green', linestyle='--', linewidth=1, alpha=0.5, label='80% threshold')
+        ax2.legend()
+        ax2.grid(axis='x', alpha=0.3)
+
+        for i, (bar, val) in enumerate(zip(bars2, precisions)):
+            if not np.isnan(val):
+                ax2.text(val + 2, i, f'{val:.1f}%', va='center', fontweight='bold', fontsize=9)
+
+        plt.tight_layout()
+        # Save to Visualization Folder
+        save_path_13 = os.path.join(vis_dir, '13_agreement_metrics.png')
+        plt.savefig(save_path_13, dpi=300, bbox_inches='tight')
+        print(f"✓ Saved: {save_path_13}")
+        plt.close('all')
+
+
+def save_reliability(rel, docs_dir=DOCS_DIR, profile=None):
+    # Save to Docs Folder (Correct location for reports)
+    json_path = os.path.join(docs_dir, 'inter_rater_reliability.json')
+    with open(json_path, 'w') as f:
+        json.dump(rel['results'], f, indent=2)
+    if profile:
+        write_profile(json_path, profile)
+    details_path = os.path.join(docs_dir, DETAILS_FILE)
+    n = write_disagreement_details(rel['comparison'], details_path)
+    print(f"✓ Saved: {details_path} ({n} disagreements)")
+
+
+def load_reliability(docs_dir=DOCS_DIR):
+    """The figure inputs of compute_reliability, rebuilt from a saved inter_rater_reliability.json."""
+    with open(os.path.join(docs_dir, 'inter_rater_reliability.json')) as f:
+        results = json.load(f)
+    overall, matrix = results['overall'], results['confusion_matrix']
+    return {
+        'simple_agreement': overall['simple_agreement'],
+        'kappa': overall['cohens_kappa'],
+        'alpha': overall['krippendorffs_alpha'],
+        'agreement_df': pd.DataFrame(results['category_agreement']),
+        'cm_df': pd.DataFrame(matrix['counts'], index=matrix['categories'], columns=matrix['categories']),
+        'results': results,
+    }
+
+
+def write_disagreement_details(comparison, path, batch_rows=BATCH_ROWS):
+    """Stream every disagreement (claim, both labels, boundary flags, text) to JSON Lines."""
+    rows = np.flatnonzero(~comparison['agree'].to_numpy())
+    columns = [name for name, _ in DETAIL_FIELDS]
+    with ResultsWriter(path, DETAIL_FIELDS, 'jsonl', batch_rows) as writer:
+        for start in range(0, len(rows), batch_rows):
+            writer.write(comparison.iloc[rows[start:start + batch_rows]][columns])
+    return writer.rows_written
+
+
+def load_inputs(claims_path=None, annotations_path=None):
+    """
+    Load the dataset and annotator 2 labels. Returns (original, annotator2),
+    or None after printing the problem.
+    """
+    # Boundary flags are normalized to booleans by the loader (TRUE/FALSE and Yes/No)
+    try:
+        original, original_errors = load_claims(claims_path or os.path.join(DATA_DIR, 'morgan_stanley_claims_dataset.csv'))
+        annotator2, annotator2_errors = load_annotations(annotations_path or os.path.join(DATA_DIR, 'annotator2_classifications.csv'))
+    except FileNotFoundError as e:
+        print(f"[!] CRITICAL ERROR: Input files missing in {DATA_DIR}")
+        print(f"    Ensure 'morgan_stanley_claims_dataset.csv' and 'annotator2_classifications.csv' are in the /data folder.")
+        return None
+    except ClaimSchemaError as e:
+        print(f"[!] CRITICAL ERROR: {e}")
+        return None
+
+    print_errors(original_errors)
+    print_errors(annotator2_errors)
+    return original, annotator2
+
+
+def main():
+    print("="*80)
+    print("INTER-RATER RELIABILITY ANALYSIS")
+    print("C_Score Framework - Morgan Stanley Dataset")
+    print("="*80)
+
+    profiler = StageProfiler()
+    with profiler.stage('load'):
+        inputs = load_inputs()
+    if inputs is None:
+        return
+
+    with profiler.stage('reliability'):
+        rel = compute_reliability(*inputs, profiler=profiler)
+    print_reliability(rel)
+    with profiler.stage('reliability/figures'):
+        plot_reliability(rel)
+    save_reliability(rel, profile=profiler.block(['load', 'reliability']))
+
+    print(f"\n{'─'*80}")
+    print("ANALYSIS COMPLETE")
+    print(f"{'─'*80}")
+    print(f"📊 Final Kappa: {rel['kappa']:.3f}")
+    print(f"📁 Images saved to: {VIS_DIR}")
+    print(f"📁 JSON saved to:   {DOCS_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+FILE: report_diff.py
+PURPOSE: Year-over-year claim matching and incremental C_Score diff.
+         Matches claims of two claims files by TF-IDF cosine similarity
+         within blocks (report_id, section), classifies every claim as added,
+         removed, changed or unchanged, and attributes each report's C_Score
+         delta to those changes by updating its aggregates with the changed
+         claims only. Files without a report_id column are one report.
+"""
+
+import pandas as pd
+import numpy as np
+import argparse
+import json
+from sklearn.feature_extraction.text import TfidfVectorizer
+from claims_loader import CATEGORIES, REPORT_COL, load_claims, print_errors
+from scoring_kernel import effective_denominator, final_score, group_aggregates
+
+# Claims are only compared with claims sharing these columns (when present)
+BLOCK_COLUMNS = [REPORT_COL, 'section']
+MATCH_THRESHOLD = 0.5
+
+STATUSES = ['added', 'removed', 'changed-category', 'changed-penalty', 'unchanged']
+
+
+def _block_keys(df):
+    columns = [c for c in BLOCK_COLUMNS if c in df.columns]
+    if not columns:
+        return pd.Series('', index=df.index)
+    return df[columns].astype(str).agg('|'.join, axis=1)
+
+
+def match_claims(old, new, threshold=MATCH_THRESHOLD):
+    """
+    One-to-one claim matching. Returns (old_idx, new_idx, similarity) arrays
+    of positional indices, greedily taking the most similar pairs first.
+    """
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, min_df=1)
+    vectorizer.fit(pd.concat([old['verbatim_text'], new['verbatim_text']]).astype(str))
+    old_vec = vectorizer.transform(old['verbatim_text'].astype(str))
+    new_vec = vectorizer.transform(new['verbatim_text'].astype(str))
+
+    # Blocking index: block key -> positions in each file
+    old_blocks = pd.Series(np.arange(len(old))).groupby(_block_keys(old).to_numpy()).apply(np.asarray)
+    new_blocks = pd.Series(np.arange(len(new))).groupby(_block_keys(new).to_numpy()).apply(np.asarray)
+
+    pairs_old, pairs_new, pairs_sim = [], [], []
+    for key, o in old_blocks.items():
+        if key not in new_blocks.index:
+            continue
+        n = new_blocks[key]
+        sim = (old_vec[o] @ new_vec[n].T).toarray()   # rows are L2-normalized: cosine
+        i, j = np.nonzero(sim >= threshold)
+        pairs_old.append(o[i])
+        pairs_new.append(n[j])
+        pairs_sim.append(sim[i, j])
+
+    if not pairs_old:
+        return np.array([], int), np.array([], int), np.array([])
+    cand_old, cand_new, cand_sim = map(np.concatenate, (pairs_old, pairs_new, pairs_sim))
+
+    order = np.argsort(-cand_sim, kind='stable')
+    used_old, used_new = np.zeros(len(old), bool), np.zeros(len(new), bool)
+    keep = []
+    for k in order:
+        if not used_old[cand_old[k]] and not used_new[cand_new[k]]:
+            used_old[cand_old[k]] = used_new[cand_new[k]] = True
+            keep.append(k)
+    keep = np.array(keep, dtype=int)
+    return cand_old[keep], cand_new[keep], cand_sim[keep]
+
+
+def _scoring_fields(df):
+    return df['category'].cat.codes.to_numpy(), df['weight'].to_numpy(np.float64), df['tactic_mask'].to_numpy()
+
+
+def _report_keys(df):
+    return df[REPORT_COL].astype(str).to_numpy() if REPORT_COL in df.columns else np.full(len(df), '', dtype=object)
+
+
+def _scores(parts):
+    """C_Score per report of a signed sum of group_aggregates; NaN for reports without claims."""
+    total = {k: sum(sign * agg[k] for sign, agg in parts) for k in ('n_total', 'n_nc', 'weighted_sum', 'penalty_sum')}
+    score = final_score(total['weighted_sum'], effective_denominator(total['n_total'], total['n_nc']),
+                        total['penalty_sum'])
+    return np.where(total['n_total'] > 0, score, np.nan)
+
+
+def diff_reports(old, new, threshold=MATCH_THRESHOLD):
+    """
+    Returns (changes, attribution).
+
+    changes: one row per claim with report_id, status, old/new claim_id,
+    similarity, old/new category and weight.
+    attribution: one row per report with its C_Score before/after, the delta
+    contributed by removed, added and changed claims (applied in that order
+    to the old aggregates) and the claim count per status. A report present
+    in only one file has NaN for the missing score and the deltas.
+    """
+    old_idx, new_idx, sim = match_claims(old, new, threshold)
+    old_cat, old_w, old_m = _scoring_fields(old)
+    new_cat, new_w, new_m = _scoring_fields(new)
+
+    removed = np.setdiff1d(np.arange(len(old)), old_idx)
+    added = np.setdiff1d(np.arange(len(new)), new_idx)
+    category_changed = old_cat[old_idx] != new_cat[new_idx]
+    penalty_changed = ~category_changed & ((old_w[old_idx] != new_w[new_idx]) | (old_m[old_idx] != new_m[new_idx]))
+    changed = category_changed | penalty_changed
+
+    old_report, new_report = _report_keys(old), _report_keys(new)
+    report_ids, reports = pd.factorize(np.concatenate([old_report, new_report]), sort=True)
+    old_rid, new_rid = report_ids[:len(old)], report_ids[len(old):]
+
+    names = np.array(CATEGORIES + ('',), dtype=object)   # code -1 -> ''
+    changes = pd.concat([
+        pd.DataFrame({
+            REPORT_COL: old_report[old_idx],
+            'status': np.select([category_changed, penalty_changed], ['changed-category', 'changed-penalty'],
+                                'unchanged'),
+            'old_claim_id': old['claim_id'].to_numpy()[old_idx],
+            'new_claim_id': new['claim_id'].to_numpy()[new_idx],
+            'similarity': sim,
+            'old_category': names[old_cat[old_idx]],
+            'new_category': names[new_cat[new_idx]],
+            'old_weight': old_w[old_idx],
+            'new_weight': new_w[new_idx],
+        }),
+        pd.DataFrame({REPORT_COL: old_report[removed], 'status': 'removed', 'old_claim_id': old['claim_id'].to_numpy()[removed],
+                      'old_category': names[old_cat[removed]], 'old_weight': old_w[removed]}),
+        pd.DataFrame({REPORT_COL: new_report[added], 'status': 'added', 'new_claim_id': new['claim_id'].to_numpy()[added],
+                      'new_category': names[new_cat[added]], 'new_weight': new_w[added]}),
+    ], ignore_index=True)
+
+    # Incremental attribution per report: only removed / added / changed claims touch the aggregates
+    def aggregates(rows, rid, category, weight, mask):
+        return group_aggregates(rid[rows], len(reports), category[rows], weight[rows], mask[rows])
+
+    o, n = old_idx[changed], new_idx[changed]
+    state = [(1, aggregates(slice(None), old_rid, old_cat, old_w, old_m))]
+    before = _scores(state)
+    state.append((-1, aggregates(removed, old_rid, old_cat, old_w, old_m)))
+    after_removed = _scores(state)
+    state.append((1, aggregates(added, new_rid, new_cat, new_w, new_m)))
+    after_added = _scores(state)
+    state += [(-1, aggregates(o, old_rid, old_cat, old_w, old_m)), (1, aggregates(n, new_rid, new_cat, new_w, new_m))]
+    after = _scores(state)
+
+    counts = (changes.groupby(REPORT_COL)['status'].value_counts().unstack(fill_value=0)
+              .reindex(index=reports, columns=STATUSES, fill_value=0))
+    attribution = pd.concat([
+        pd.DataFrame({
+            REPORT_COL: reports,
+            'c_score_before': before,
+            'c_score_after': after,
+            'delta': after - before,
+            'delta_removed': after_removed - before,
+            'delta_added': after_added - after_removed,
+            'delta_changed': after - after_added,
+        }),
+        counts.reset_index(drop=True),
+    ], axis=1)
+    return changes, attribution
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Match claims across two years and explain the C_Score change.')
+    parser.add_argument('old', help='claims CSV of the earlier report')
+    parser.add_argument('new', help='claims CSV of the later report')
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD, help='minimum TF-IDF cosine for a match')
+    parser.add_argument('--out', help='write the per-claim change table to this CSV')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: YEAR-OVER-YEAR REPORT DIFF")
+    print("=" * 80)
+
+    old, old_errors = load_claims(args.old)
+    new, new_errors = load_claims(args.new)
+    print_errors(old_errors)
+    print_errors(new_errors)
+
+    changes, attribution = diff_reports(old, new, args.threshold)
+    for _, report in attribution.head(20).iterrows():
+        name = report[REPORT_COL] or 'Report'
+        if np.isnan(report['c_score_before']):
+            print(f"\n{name}: new report, C_Score {report['c_score_after']:.2f}")
+            continue
+        if np.isnan(report['c_score_after']):
+            print(f"\n{name}: dropped report, C_Score was {report['c_score_before']:.2f}")
+            continue
+        print(f"\n{name} C_Score: {report['c_score_before']:.2f} -> {report['c_score_after']:.2f} "
+              f"({report['delta']:+.2f})")
+        for step in ('removed', 'added', 'changed'):
+            print(f"  {step:10s} {report['delta_' + step]:+.2f}")
+    if len(attribution) > 20:
+        print(f"\n... {len(attribution) - 20} more reports")
+    print("\nClaims by status:")
+    print(json.dumps(attribution[STATUSES].sum().astype(int).to_dict(), indent=2))
+
+    moved = changes[changes['status'].str.startswith('changed')]
+    for _, row in moved.head(20).iterrows():
+        report = f"{row[REPORT_COL]} " if row[REPORT_COL] else ''
+        print(f"  {report}{row['old_claim_id']} -> {row['new_claim_id']}: {row['old_category']} -> {row['new_category']}")
+
+    if args.out:
+        changes.to_csv(args.out, index=False)
+        print(f"\n[+] Change table saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+FILE: report_ingest.py
+PURPOSE: Streaming ingestion of extracted plain-text reports.
+         Reads reports page by page (form feeds separate pages, as written by
+         pdftotext), detects section/subsection headings, segments sentences
+         into candidate claims and streams them out as claims-schema rows
+         with page provenance. No document is held in memory as a whole.
+
+         Without --prelabel the category, weight and rationale columns are
+         left blank for annotators, and claims_loader.load_claims rejects
+         such rows (category is required). Fill them by annotation, or run
+         with --prelabel, before loading the file for scoring.
+"""
+
+import pandas as pd
+import argparse
+import csv
+import glob
+import os
+import re
+from claims_loader import CLAIM_SCHEMA, ELEMENT_COLUMNS, REPORT_COL, SECTIONS
+from element_extractor import extract_elements
+from pre_classifier import classify
+
+OUTPUT_COLUMNS = list(CLAIM_SCHEMA) + [REPORT_COL]
+
+# Heading text -> report section (see section_for)
+SECTION_HEADINGS = {
+    'climate': 'Climate',
+    'sustainable finance': 'Sustainable Finance',
+    'sustainable investing': 'Sustainable Finance',
+    'human capital': 'Human Capital',
+    'our people': 'Human Capital',
+    'diversity': 'Human Capital',
+}
+
+MAX_HEADING_WORDS = 8
+MIN_CLAIM_WORDS = 6
+MAX_CLAIM_WORDS = 80
+BATCH_SIZE = 1000
+
+# Abbreviations that end in '.' without ending a sentence
+ABBREVIATIONS = re.compile(r'\b(?:U\.S|U\.K|e\.g|i\.e|Inc|Co|Corp|Ltd|No|vs|approx|St|Mr|Ms|Dr)\.$')
+SENTENCE_END = re.compile(r'(?<=[.!?])["\')\]]?\s+(?=["“(]?[A-Z0-9$£€~>])')
+LINE_BREAK_HYPHEN = re.compile(r'(?<=[A-Za-z])-\n(?=[a-z])(?!(?:and|or|to)\b)')
+PAGE_NUMBER = re.compile(r'^\s*(?:page\s+)?\d{1,3}\s*$', re.IGNORECASE)
+
+
+def iter_pages(path, first_page=1):
+    """Yield (page_number, lines) one page at a time."""
+    page, lines = first_page, []
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            *before, last = line.split('\f')
+            for chunk in before:
+                lines.append(chunk)
+                yield page, lines
+                page, lines = page + 1, []
+            lines.append(last)
+    if any(l.strip() for l in lines):
+        yield page, lines
+
+
+def is_heading(line):
+    """Short line without sentence punctuation in Title Case or CAPS."""
+    text = line.strip()
+    words = text.split()
+    if not words or len(words) > MAX_HEADING_WORDS or text[-1] in '.,;:!?' or PAGE_NUMBER.match(text):
+        return False
+    capitalized = sum(w[0].isupper() or not w[0].isalpha() for w in words)
+    return text.isupper() or capitalized >= max(1, len(words) - 1)
+
+
+def section_for(heading):
+    """
+    Section named by a heading: an exact match ('Human Capital'), or a CAPS
+    banner containing one ('CLIMATE & ENVIRONMENT'). Other headings such as
+    'Climate Strategy' are subsections.
+    """
+    lowered = heading.lower()
+    if lowered in SECTION_HEADINGS:
+        return SECTION_HEADINGS[lowered]
+    if heading.isupper():
+        for key, section in SECTION_HEADINGS.items():
+            if key in lowered:
+                return section
+    return None
+
+
+def split_sentences(text):
+    """Split a paragraph into sentences, keeping abbreviations together."""
+    parts = SENTENCE_END.split(text)
+    sentences = []
+    for part in parts:
+        if sentences and ABBREVIATIONS.search(sentences[-1]):
+            sentences[-1] = f'{sentences[-1]} {part}'
+        else:
+            sentences.append(part)
+    return [s.strip() for s in sentences if s.strip()]
+
+
+def iter_candidates(path, first_page=1):
+    """
+    Yield (page, section, subsection, sentence) for every candidate claim.
+    A sentence that runs over a page break is attributed to its first page.
+    """
+    section, subsection = '', ''
+    buffer, buffer_page = [], None
+
+    def flush():
+        # Re-join words hyphenated across a line break ("emis-" / "sions"), but keep
+        # real hyphens ("long- and short-term") and suspended ones at a line end
+        text = LINE_BREAK_HYPHEN.sub('', '\n'.join(buffer))
+        text = re.sub(r'\s+', ' ', text).strip()
+        for sentence in split_sentences(text):
+            if MIN_CLAIM_WORDS <= len(sentence.split()) <= MAX_CLAIM_WORDS:
+                yield buffer_page, section, subsection, sentence
+
+    for page, lines in iter_pages(path, first_page):
+        for line in lines:
+            stripped = line.strip()
+            if not stripped or PAGE_NUMBER.match(stripped):
+                if not stripped and buffer:
+                    yield from flush()
+                    buffer, buffer_page = [], None
+                continue
+            if is_heading(stripped):
+                if buffer:
+                    yield from flush()
+                    buffer, buffer_page = [], None
+                found = section_for(stripped)
+                if found:
+                    section, subsection = found, ''
+                else:
+                    subsection = stripped.title() if stripped.isupper() else stripped
+                continue
+            if buffer_page is None:
+                buffer_page = page
+            buffer.append(stripped)
+    if buffer:
+        yield from flush()
+
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_claim_rows(path, report_id=None, sections=SECTIONS, prelabel=False, first_page=1):
+    """
+    Stream claims-schema rows (dicts) for one report.
+
+    Only candidates under one of `sections` are kept (None keeps everything).
+    Required elements come from element_extractor; with prelabel=True the
+    category/weight/rationale are filled by the rule-based pre-classifier,
+    otherwise they are left blank for annotators.
+    """
+    report_id = report_id or os.path.splitext(os.path.basename(path))[0]
+    candidates = (c for c in iter_candidates(path, first_page) if sections is None or c[1] in sections)
+    for batch in _batched(enumerate(candidates, 1), BATCH_SIZE):
+        yield from claim_rows(batch, report_id, prelabel)
+
+
+def claim_rows(numbered, report_id, prelabel=False):
+    """
+    Claims-schema rows for (n, candidate) pairs, where n is the candidate's
+    1-based position in its report (the claim_id suffix).
+    """
+    texts = pd.Series([c[3] for _, c in numbered])
+    elements = extract_elements(texts)
+    labels = classify(texts) if prelabel else None
+    for i, (n, (page, section, subsection, sentence)) in enumerate(numbered):
+        row = {
+            'claim_id': f'{report_id}_{n:04d}',
+            'section': section,
+            'page': page,
+            'subsection': subsection,
+            'verbatim_text': sentence,
+            'category': labels['category'].iat[i] if prelabel else '',
+            'weight': labels['weight'].iat[i] if prelabel else '',
+            'classification_rationale': labels['rationale'].iat[i] if prelabel else '',
+            'boundary_case': 'TRUE' if prelabel and labels['boundary_case'].iat[i] else 'FALSE',
+            'tactic_flags': '',
+            REPORT_COL: report_id,
+        }
+        for column in ELEMENT_COLUMNS:
+            row[column] = 'TRUE' if elements[column].iat[i] else 'FALSE'
+        yield row
+
+
+def write_claims_csv(rows, out_path):
+    """Write rows as they arrive; returns the number written."""
+    n = 0
+    with open(out_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            n += 1
+    return n
+
+
+def ingest_reports(paths, out_path, **kwargs):
+    """Batch job: every report in `paths` streamed into one claims CSV."""
+    rows = (row for path in paths for row in iter_claim_rows(path, **kwargs))
+    return write_claims_csv(rows, out_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream plain-text reports into candidate claim rows.')
+    parser.add_argument('output', help='claims CSV to write')
+    parser.add_argument('reports', nargs='+', help='report .txt files or glob patterns')
+    parser.add_argument('--prelabel', action='store_true', help='fill category/weight with the pre-classifier '
+                        '(otherwise blank, and the file is not loadable by load_claims until annotated)')
+    parser.add_argument('--all-sections', action='store_true', help='keep candidates outside the focal sections')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: REPORT INGESTION")
+    print("=" * 80)
+
+    paths = sorted(p for pattern in args.reports for p in glob.glob(pattern))
+    n = ingest_reports(paths, args.output, prelabel=args.prelabel,
+                       sections=None if args.all_sections else SECTIONS)
+    print(f"[+] {n} candidate claims from {len(paths)} reports -> {args.output}")
+    if not args.prelabel:
+        print("[!] category/weight are blank: annotate them (or re-run with --prelabel) before load_claims")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+FILE: results_export.py
+PURPOSE: Streaming batch export of report, section and claim-level results.
+         Claims are scored chunk by chunk (whole reports per chunk) and each
+         result table is appended to its own file as the chunks finish:
+         Arrow IPC record batches (file format, so dashboards can memory-map
+         the output and read it with zero copies) or JSON Lines. Only one
+         chunk and one pending batch per table are in memory at any time.
+         Arrow output needs pyarrow; JSON Lines needs nothing extra.
+"""
+
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import os
+import tempfile
+import time
+from claims_loader import REPORT_COL, load_claims, format_tactics
+from scoring_kernel import classify_tier, final_score, group_aggregates
+from instrumentation import current_rss, MB
+from contribution_index import leave_one_out
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:     # Arrow output is optional; JSON Lines always works
+    pa = None
+
+BATCH_ROWS = 65_536
+
+FORMATS = {'.arrow': 'arrow', '.arrows': 'arrow', '.feather': 'arrow', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+# table -> [(column, type)]
+TABLES = {
+    'reports': [(REPORT_COL, 'string'), ('c_score', 'float64'), ('tier', 'string'), ('weighted_sum', 'float64'),
+                ('n_total', 'int64'), ('n_eff', 'int64'), ('penalty_sum', 'float64')],
+    'sections': [(REPORT_COL, 'string'), ('section', 'string'), ('score', 'float64'), ('n_total', 'int64')],
+    'claims': [('claim_id', 'string'), (REPORT_COL, 'string'), ('section', 'string'), ('category', 'string'),
+               ('weight', 'float64'), ('tactic_flags', 'string'), ('report_contribution', 'float64')],
+}
+
+
+def arrow_schema(fields):
+    types = {'string': pa.string(), 'float64': pa.float64(), 'int64': pa.int64(), 'bool': pa.bool_()}
+    return pa.schema([(name, types[kind]) for name, kind in fields])
+
+
+class ResultsWriter:
+    """
+    Append-only writer for one result table. Rows are buffered and written
+    every batch_rows rows as one Arrow record batch or a block of JSON
+    lines. The format follows the file extension (see FORMATS).
+    """
+
+    def __init__(self, path, fields, fmt=None, batch_rows=BATCH_ROWS):
+        self.path, self.fields, self.batch_rows = path, fields, batch_rows
+        self.fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+        if self.fmt not in ('arrow', 'jsonl'):
+            raise ValueError(f'unknown results format for {path}')
+        if self.fmt == 'arrow' and pa is None:
+            raise ImportError('pyarrow is required for Arrow IPC output (write .jsonl instead)')
+        self.columns = [name for name, _ in fields]
+        self.pending, self.n_pending, self.rows_written = [], 0, 0
+        if self.fmt == 'arrow':
+            self.schema = arrow_schema(fields)
+            self.sink = pa.OSFile(path, 'wb')
+            self.writer = pa.ipc.new_file(self.sink, self.schema)
+        else:
+            self.sink = open(path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, frame):
+        """Queue a DataFrame (or dict of columns) of rows."""
+        frame = pd.DataFrame(frame)[self.columns]
+        self.pending.append(frame)
+        self.n_pending += len(frame)
+        if self.n_pending >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        frame = pd.concat(self.pending, ignore_index=True) if len(self.pending) > 1 else self.pending[0]
+        if self.fmt == 'arrow':
+            self.writer.write_batch(pa.RecordBatch.from_pandas(frame, schema=self.schema, preserve_index=False))
+        else:
+            # stdlib json: shortest round-trip floats (pandas' to_json rounds them)
+            records = frame.astype(object).where(frame.notna(), None).to_dict('records')
+            self.sink.writelines(json.dumps(r) + '\n' for r in records)
+        self.rows_written += len(frame)
+        self.pending, self.n_pending = [], 0
+
+    def close(self):
+        self.flush()
+        if self.fmt == 'arrow':
+            self.writer.close()
+        self.sink.close()
+
+
+def score_chunk(claims, exact=False):
+    """
+    Result tables for a chunk of claims (load_claims frame) holding whole
+    reports: {'reports', 'sections', 'claims'} DataFrames with the TABLES columns.
+    """
+    reports = claims[REPORT_COL].astype(str) if REPORT_COL in claims else pd.Series('report', index=claims.index)
+    report_ids, report_names = pd.factorize(reports)
+    sections = claims['section'].astype(str)
+    section_ids, section_keys = pd.factorize(pd.MultiIndex.from_arrays([report_ids, sections]))
+    category = claims['category'].cat.codes.to_numpy()
+    weight = claims['weight'].to_numpy(np.float64)
+    mask = claims['tactic_mask'].to_numpy()
+
+    agg = group_aggregates(report_ids, len(report_names), category, weight, mask, exact=exact)
+    _, contribution = leave_one_out(report_ids, len(report_names), category, weight, mask, agg=agg)
+    scores = final_score(agg['weighted_sum'], agg['n_eff'], agg['penalty_sum'])
+    sec = group_aggregates(section_ids, len(section_keys), category, weight, exact=exact)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sec_scores = 100 * sec['weighted_sum'] / sec['n_eff']
+
+    names = np.asarray(report_names)
+    return {
+        'reports': pd.DataFrame({
+            REPORT_COL: names, 'c_score': scores, 'tier': classify_tier(scores),
+            'weighted_sum': agg['weighted_sum'], 'n_total': agg['n_total'], 'n_eff': agg['n_eff'],
+            'penalty_sum': agg['penalty_sum'],
+        }),
+        'sections': pd.DataFrame({
+            REPORT_COL: names[section_keys.get_level_values(0)], 'section': section_keys.get_level_values(1),
+            'score': sec_scores, 'n_total': sec['n_total'],
+        }),
+        'claims': pd.DataFrame({
+            'claim_id': claims['claim_id'].astype(str).to_numpy(), REPORT_COL: names[report_ids],
+            'section': sections.to_numpy(), 'category': claims['category'].astype(str).to_numpy(),
+            'weight': weight, 'tactic_flags': format_tactics(mask), 'report_contribution': contribution,
+        }),
+    }
+
+
+def export_stream(chunks, out_dir, fmt='arrow', tables=tuple(TABLES), batch_rows=BATCH_ROWS, exact=False):
+    """
+    Score every chunk of claims and append its rows to <out_dir>/<table>.<fmt>.
+    exact=True uses fixed-point sums (scoring_kernel), so scores do not
+    depend on claim order within a report. Returns {table: (path, rows written)}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    ext = '.arrow' if fmt == 'arrow' else '.jsonl'
+    writers = {t: ResultsWriter(os.path.join(out_dir, t + ext), TABLES[t], fmt, batch_rows) for t in tables}
+    try:
+        for chunk in chunks:
+            results = score_chunk(chunk, exact)
+            for table, writer in writers.items():
+                writer.write(results[table])
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return {t: (w.path, w.rows_written) for t, w in writers.items()}
+
+
+def read_arrow(path):
+    """Memory-mapped pyarrow Table over an exported .arrow file (zero-copy)."""
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+def iter_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def synthetic_chunks(claims, n_reports, reports_per_chunk=1000, seed=0):
+    """Chunks of synthetic reports resampled from the labeled claims (demo data)."""
+    rng = np.random.default_rng(seed)
+    per_report = len(claims)
+    for start in range(0, n_reports, reports_per_chunk):
+        n = min(reports_per_chunk, n_reports - start)
+        rows = claims.iloc[rng.integers(0, len(claims), n * per_report)].reset_index(drop=True)
+        report = np.repeat(np.arange(start, start + n), per_report)
+        rows[REPORT_COL] = pd.Series(report).map('R{:07d}'.format)
+        rows['claim_id'] = rows[REPORT_COL] + '_' + pd.Series(np.tile(np.arange(per_report), n)).map('{:03d}'.format)
+        yield rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream batch results to Arrow IPC or JSON Lines.')
+    parser.add_argument('--reports', type=int, default=20_000, help='synthetic reports in the batch demo')
+    parser.add_argument('--format', choices=['arrow', 'jsonl'], default='arrow' if pa is not None else 'jsonl')
+    parser.add_argument('--out-dir', default=None, help='keep the exports here (default: temporary)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: STREAMING RESULTS EXPORT")
+    print("=" * 80)
+    if pa is None:
+        print("[!] pyarrow not installed: Arrow IPC output unavailable, writing JSON Lines")
+        args.format = 'jsonl'
+
+    # Exports go away on exit unless --out-dir is given
+    with tempfile.TemporaryDirectory(prefix='cscore_export_') as work_dir:
+        run_demo(args, args.out_dir or work_dir)
+
+
+def run_demo(args, out_dir):
+    claims, _ = load_claims()
+
+    single = export_stream([claims], os.path.join(out_dir, 'dataset'), args.format)
+    path = single['reports'][0]
+    report = read_arrow(path).to_pylist()[0] if args.format == 'arrow' else next(iter_jsonl(path))
+    print(f"[+] Dataset: C_Score {report['c_score']:.2f} ({report['tier']}) -> "
+          f"{os.path.dirname(path) if args.out_dir else 'temporary'}")
+
+    rss_before = current_rss()
+    start = time.perf_counter()
+    written = export_stream(synthetic_chunks(claims, args.reports), os.path.join(out_dir, 'batch'), args.format)
+    elapsed = time.perf_counter() - start
+    print(f"[+] Batch of {args.reports:,} synthetic reports in {elapsed:.1f}s "
+          f"(RSS {rss_before / MB:.0f} -> {current_rss() / MB:.0f} MB):")
+    for table, (path, rows) in written.items():
+        print(f"  {table:9s} {rows:>10,} rows  {os.path.getsize(path) / 1024 / 1024:8.1f} MB  "
+              f"{path if args.out_dir else os.path.basename(path)}")
+    if not args.out_dir:
+        print("[+] Exports were temporary (pass --out-dir to keep them)")
+
+
+if __name__ == "__main__":
+    main()
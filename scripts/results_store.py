@@ -0,0 +1,205 @@
+"""
+FILE: results_store.py
+PURPOSE: Persistent company x year results store (SQLite).
+         Keeps report, section and tactic-level results per company, year,
+         profile version and scenario, so runs accumulate a history instead
+         of overwriting docs/validation_results.json. Batches are written in
+         one transaction with executemany; queries are served by indexes.
+"""
+
+import sqlite3
+import argparse
+import json
+import os
+from claims_loader import TACTIC_PENALTIES
+from scoring_kernel import classify_tier
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+DOCS_DIR = os.path.join(BASE_DIR, 'docs')
+DEFAULT_DB = os.path.join(DATA_DIR, 'results.sqlite')
+
+DEFAULT_PROFILE = 'theoretical-v1'
+DEFAULT_SCENARIO = 'baseline'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_results (
+    company          TEXT    NOT NULL,
+    year             INTEGER NOT NULL,
+    profile_version  TEXT    NOT NULL,
+    scenario         TEXT    NOT NULL,
+    sector           TEXT,
+    report_id        TEXT,
+    c_score          REAL    NOT NULL,
+    tier             TEXT    NOT NULL,
+    calibrated_score REAL,
+    weighted_sum     REAL,
+    n_total          INTEGER,
+    n_eff            INTEGER,
+    penalty_sum      REAL,
+    PRIMARY KEY (company, year, profile_version, scenario)
+);
+CREATE INDEX IF NOT EXISTS idx_report_sector_score
+    ON report_results (sector, year, profile_version, scenario, c_score);
+CREATE INDEX IF NOT EXISTS idx_report_year_score
+    ON report_results (year, profile_version, scenario, c_score);
+
+CREATE TABLE IF NOT EXISTS section_results (
+    company          TEXT    NOT NULL,
+    year             INTEGER NOT NULL,
+    profile_version  TEXT    NOT NULL,
+    scenario         TEXT    NOT NULL,
+    section          TEXT    NOT NULL,
+    score            REAL    NOT NULL,
+    PRIMARY KEY (company, year, profile_version, scenario, section)
+);
+CREATE INDEX IF NOT EXISTS idx_section_score
+    ON section_results (section, year, score);
+
+CREATE TABLE IF NOT EXISTS tactic_results (
+    company          TEXT    NOT NULL,
+    year             INTEGER NOT NULL,
+    profile_version  TEXT    NOT NULL,
+    scenario         TEXT    NOT NULL,
+    tactic           TEXT    NOT NULL,
+    count            INTEGER NOT NULL,
+    penalty          REAL    NOT NULL,
+    PRIMARY KEY (company, year, profile_version, scenario, tactic)
+);
+CREATE INDEX IF NOT EXISTS idx_tactic_year
+    ON tactic_results (tactic, year);
+"""
+
+
+def report_record(results, company, year, sector=None, profile_version=DEFAULT_PROFILE,
+                  scenario=DEFAULT_SCENARIO, report_id=None, calibrated_score=None):
+    """Wrap a validation_results.json-shaped dict with its store key."""
+    return {
+        'company': company,
+        'year': int(year),
+        'profile_version': profile_version,
+        'scenario': scenario,
+        'sector': sector,
+        'report_id': report_id,
+        'calibrated_score': calibrated_score,
+        'results': results,
+    }
+
+
+class ResultsStore:
+    """SQLite-backed results history. Use as a context manager."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # --- WRITES ---
+
+    def insert_results(self, records):
+        """
+        Bulk upsert of report_record() dicts (and their section and tactic
+        rows) in a single transaction. Returns the number of reports written.
+        """
+        reports, sections, tactics = [], [], []
+        for r in records:
+            res = r['results']
+            key = (r['company'], r['year'], r['profile_version'], r['scenario'])
+            score = float(res['final_c_score'])
+            reports.append(key + (r['sector'], r['report_id'], score, classify_tier(score), r['calibrated_score'],
+                                  res.get('weighted_sum'), res.get('n_total'), res.get('n_eff'),
+                                  res.get('penalty_sum')))
+            sections.extend(key + (s, float(v)) for s, v in res.get('section_scores', {}).items())
+            tactics.extend(key + (t, int(c), c * TACTIC_PENALTIES.get(t, 0.0))
+                           for t, c in res.get('penalties_applied', {}).items())
+
+        with self.conn:
+            # Replacing a report replaces its section and tactic rows as well
+            self.conn.executemany(
+                'DELETE FROM section_results WHERE company=? AND year=? AND profile_version=? AND scenario=?',
+                [rep[:4] for rep in reports])
+            self.conn.executemany(
+                'DELETE FROM tactic_results WHERE company=? AND year=? AND profile_version=? AND scenario=?',
+                [rep[:4] for rep in reports])
+            self.conn.executemany('INSERT OR REPLACE INTO report_results VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)', reports)
+            self.conn.executemany('INSERT OR REPLACE INTO section_results VALUES (?,?,?,?,?,?)', sections)
+            self.conn.executemany('INSERT OR REPLACE INTO tactic_results VALUES (?,?,?,?,?,?,?)', tactics)
+        return len(reports)
+
+    # --- QUERIES ---
+
+    def _rows(self, sql, params):
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def top_k_least_credible(self, sector, year, k=10, profile_version=DEFAULT_PROFILE, scenario=DEFAULT_SCENARIO):
+        """The k lowest C_Scores in a sector (served by idx_report_sector_score)."""
+        return self._rows(
+            'SELECT company, c_score, tier, calibrated_score FROM report_results '
+            'WHERE sector=? AND year=? AND profile_version=? AND scenario=? '
+            'ORDER BY c_score ASC LIMIT ?',
+            (sector, year, profile_version, scenario, k))
+
+    def score_range(self, low, high, year, sector=None, profile_version=DEFAULT_PROFILE, scenario=DEFAULT_SCENARIO):
+        """Companies with low <= c_score < high, optionally within one sector."""
+        sql = ('SELECT company, sector, c_score, tier FROM report_results '
+               'WHERE year=? AND profile_version=? AND scenario=? AND c_score >= ? AND c_score < ?')
+        params = [year, profile_version, scenario, low, high]
+        if sector is not None:
+            sql += ' AND sector=?'
+            params.append(sector)
+        return self._rows(sql + ' ORDER BY c_score', params)
+
+    def tier_migrations(self, year_from, year_to, profile_version=DEFAULT_PROFILE, scenario=DEFAULT_SCENARIO):
+        """Companies whose tier changed between two years."""
+        return self._rows(
+            'SELECT a.company, a.sector, a.tier AS tier_from, b.tier AS tier_to, '
+            '       a.c_score AS score_from, b.c_score AS score_to '
+            'FROM report_results a JOIN report_results b '
+            '  ON a.company = b.company AND a.profile_version = b.profile_version AND a.scenario = b.scenario '
+            'WHERE a.year=? AND b.year=? AND a.profile_version=? AND a.scenario=? AND a.tier != b.tier '
+            'ORDER BY b.c_score - a.c_score',
+            (year_from, year_to, profile_version, scenario))
+
+    def history(self, company, profile_version=DEFAULT_PROFILE, scenario=DEFAULT_SCENARIO):
+        """One company's scores by year."""
+        return self._rows(
+            'SELECT year, c_score, tier, calibrated_score FROM report_results '
+            'WHERE company=? AND profile_version=? AND scenario=? ORDER BY year',
+            (company, profile_version, scenario))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record docs/validation_results.json in a results store.')
+    parser.add_argument('--db', default=':memory:',
+                        help=f'store to write (e.g. {os.path.relpath(DEFAULT_DB, BASE_DIR)}); default: in-memory demo')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: RESULTS STORE")
+    print("=" * 80)
+
+    json_path = os.path.join(DOCS_DIR, 'validation_results.json')
+    with open(json_path) as f:
+        results = json.load(f)
+
+    with ResultsStore(args.db) as store:
+        n = store.insert_results([report_record(results, 'Morgan Stanley', 2023, sector='financial_services')])
+        print(f"[+] Recorded {n} report(s) in {args.db if args.db == ':memory:' else os.path.relpath(args.db)}")
+        print("\nLeast credible financial services companies (2023):")
+        for row in store.top_k_least_credible('financial_services', 2023):
+            print(f"  {row['company']:30s} {row['c_score']:6.2f}  {row['tier']}")
+
+
+if __name__ == "__main__":
+    main()
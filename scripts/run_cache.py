@@ -0,0 +1,259 @@
+"""
+FILE: run_cache.py
+PURPOSE: Content-addressed cache for the analysis stages.
+         Every stage gets a manifest key hashed from its input files, the
+         shared scoring/penalty config and the source of the script plus the
+         local modules it imports. Outputs (JSON, CSV, PNG) are stored once
+         by content hash; a rerun with an unchanged key restores them instead
+         of recomputing, and only stages whose key changed are rerun.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import runpy
+import shutil
+import sys
+import time
+from claims_loader import CATEGORY_WEIGHTS, TACTIC_PENALTIES
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPTS_DIR)
+CACHE_DIR = os.path.join(BASE_DIR, '.cscore_cache')
+
+CLAIMS_CSV = 'data/morgan_stanley_claims_dataset.csv'
+ANNOTATIONS_CSV = 'data/annotator2_classifications.csv'
+
+# Stage -> script, input files and output files (relative to BASE_DIR)
+STAGES = {
+    'score': {
+        'script': 'c_score_calculator.py',
+        'inputs': [CLAIMS_CSV],
+        'outputs': ['docs/validation_results.json',
+                    'visualizations/01_category_distribution.png',
+                    'visualizations/02_weight_contribution.png',
+                    'visualizations/03_section_comparison.png',
+                    'visualizations/05_comparative_scores.png'],
+    },
+    'calibrate': {
+        'script': 'sector_calibration.py',
+        'inputs': [CLAIMS_CSV],
+        'outputs': ['docs/sector_calibration_results.json',
+                    'data/sector_calibration_table.csv',
+                    'visualizations/09_sector_calibration_heatmap.png',
+                    'visualizations/10_morgan_stanley_calibrated.png',
+                    'visualizations/11_sector_multipliers.png'],
+    },
+    'reliability': {
+        'script': 'reliability_check.py',
+        'inputs': [CLAIMS_CSV, ANNOTATIONS_CSV],
+        'outputs': ['docs/inter_rater_reliability.json',
+                    'docs/inter_rater_disagreements.jsonl',
+                    'visualizations/12_confusion_matrix.png',
+                    'visualizations/13_agreement_metrics.png'],
+    },
+    'sensitivity': {
+        'script': 'sensitivity_analysis.py',
+        'inputs': [CLAIMS_CSV],
+        'outputs': ['docs/normalized_sensitivity_results.json',
+                    'visualizations/14_normalized_sensitivity.png',
+                    'visualizations/15_normalized_section_sensitivity.png'],
+    },
+}
+
+# Run options that change a stage's outputs; the standalone scripts use these
+DEFAULT_OPTIONS = {'exact': False, 'figures': True}
+
+CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def local_imports(script):
+    """The script plus every module in scripts/ it imports, transitively."""
+    seen, todo = set(), [script]
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        with open(os.path.join(SCRIPTS_DIR, name), encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                modules = [node.module]
+            elif isinstance(node, ast.Import):
+                modules = [a.name for a in node.names]
+            else:
+                continue
+            for module in modules:
+                path = module.split('.')[0] + '.py'
+                if os.path.exists(os.path.join(SCRIPTS_DIR, path)):
+                    todo.append(path)
+    return sorted(seen)
+
+
+def config_digest():
+    """Hash of the shared scoring config (category weights, tactic penalties)."""
+    config = {'category_weights': CATEGORY_WEIGHTS, 'tactic_penalties': TACTIC_PENALTIES}
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def stage_manifest(stage, paths=None, options=None):
+    """
+    Everything the stage's key depends on, as {label: sha256}. `paths` maps
+    STAGES input names to the files actually read (default: the repo's);
+    `options` overrides DEFAULT_OPTIONS.
+    """
+    spec = STAGES[stage]
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    manifest = {'config': config_digest(),
+                'options': hashlib.sha256(json.dumps(options, sort_keys=True).encode('utf-8')).hexdigest()}
+    for rel in spec['inputs']:
+        path = (paths or {}).get(rel, os.path.join(BASE_DIR, rel))
+        manifest[f'input:{rel}'] = file_digest(path) if os.path.exists(path) else 'missing'
+    for module in local_imports(spec['script']):
+        manifest[f'code:{module}'] = file_digest(os.path.join(SCRIPTS_DIR, module))
+    return manifest
+
+
+def stage_key(manifest):
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class RunCache:
+    """objects/<sha256> holds output blobs; manifests/<stage>/<key>.json maps outputs to blobs."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.objects = os.path.join(directory, 'objects')
+
+    def _manifest_path(self, stage, key):
+        return os.path.join(self.directory, 'manifests', stage, f'{key}.json')
+
+    def lookup(self, stage, key, outputs=None):
+        """Output -> blob mapping for a complete cache entry (holding every one of `outputs`), else None."""
+        path = self._manifest_path(stage, key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            entry = json.load(f)
+        blobs = entry['outputs']
+        if outputs is not None and not set(outputs) <= set(blobs):
+            return None
+        if not all(os.path.exists(os.path.join(self.objects, b)) for b in blobs.values()):
+            return None
+        return blobs
+
+    def restore(self, blobs, base_dir=BASE_DIR):
+        """Copy cached outputs into place, skipping files that are already identical."""
+        for rel, blob in blobs.items():
+            dest = os.path.join(base_dir, rel)
+            if os.path.exists(dest) and file_digest(dest) == blob:
+                continue
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copyfile(os.path.join(self.objects, blob), dest)
+
+    def store(self, stage, key, manifest, outputs, base_dir=BASE_DIR):
+        """Add the stage's current outputs (relative to base_dir) to the cache under `key`."""
+        os.makedirs(self.objects, exist_ok=True)
+        blobs = {}
+        for rel in outputs:
+            src = os.path.join(base_dir, rel)
+            if not os.path.exists(src):
+                continue
+            blob = file_digest(src)
+            dest = os.path.join(self.objects, blob)
+            if not os.path.exists(dest):
+                shutil.copyfile(src, dest)
+            blobs[rel] = blob
+        path = self._manifest_path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'stage': stage, 'key': key, 'inputs': manifest, 'outputs': blobs,
+                       'created': time.strftime('%Y-%m-%dT%H:%M:%S')}, f, indent=2)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def stage_outputs(stage, figures=True):
+    """The stage's outputs, without the figures when figures=False."""
+    return [rel for rel in STAGES[stage]['outputs'] if figures or not rel.startswith('visualizations/')]
+
+
+def run_script(script):
+    """Run a stage script as __main__ with its default arguments."""
+    path = os.path.join(SCRIPTS_DIR, script)
+    argv, sys.argv = sys.argv, [path]
+    try:
+        runpy.run_path(path, run_name='__main__')
+    finally:
+        sys.argv = argv
+
+
+def run_stage(stage, compute=None, cache=None, force=False):
+    """
+    Restore the stage's outputs from the cache, or compute and cache them.
+    `compute` defaults to running the stage script as __main__.
+    Returns 'hit' or 'miss'.
+    """
+    cache = cache or RunCache()
+    spec = STAGES[stage]
+    manifest = stage_manifest(stage)
+    key = stage_key(manifest)
+
+    blobs = None if force else cache.lookup(stage, key, spec['outputs'])
+    if blobs is not None:
+        cache.restore(blobs)
+        return 'hit'
+
+    if compute is None:
+        if SCRIPTS_DIR not in sys.path:
+            sys.path.insert(0, SCRIPTS_DIR)
+        compute = lambda: run_script(spec['script'])
+    compute()
+    cache.store(stage, key, manifest, spec['outputs'])
+    return 'miss'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run analysis stages through the content-addressed cache.')
+    parser.add_argument('stages', nargs='*', help=f'stages to run: {", ".join(STAGES)} (default: all)')
+    parser.add_argument('--force', action='store_true', help='recompute even if the cache has the outputs')
+    parser.add_argument('--clear', action='store_true', help='delete the cache and exit')
+    args = parser.parse_args()
+
+    unknown = [s for s in args.stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    cache = RunCache()
+    if args.clear:
+        cache.clear()
+        print(f"[+] Cleared {os.path.relpath(cache.directory, BASE_DIR)}")
+        return
+
+    status = {}
+    for stage in args.stages or list(STAGES):
+        start = time.perf_counter()
+        outcome = run_stage(stage, cache=cache, force=args.force)
+        status[stage] = (outcome, time.perf_counter() - start)
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: RUN CACHE")
+    print("=" * 80)
+    for stage, (outcome, seconds) in status.items():
+        print(f"  {stage:12s} {outcome:5s} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+FILE: scoring_kernel.py
+PURPOSE: Vectorized C_Score kernel over compact claim arrays
+         (category codes, weights, tactic bitmasks, group ids).
+         Reproduces the formulas in c_score_calculator.py.
+
+         exact=True switches the weight and penalty sums to fixed-point
+         integers (multiples of 1 / FIXED_SCALE). Integer sums do not depend
+         on summation order, so chunked, parallel and serial runs give
+         bit-identical scores, including scores that sit on a tier
+         threshold. verify_equivalence() checks this for any split.
+"""
+
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from claims_loader import CATEGORIES, NONCLAIM_CODE, TACTICS, TACTIC_BITS, TACTIC_PENALTIES, load_claims
+
+# Penalty fraction for every possible uint8 tactic mask, summed in TACTICS order
+PENALTY_TABLE = np.array([
+    sum(TACTIC_PENALTIES[t] for t in TACTICS if mask & TACTIC_BITS[t])
+    for mask in range(256)
+], dtype=np.float64)
+
+# Fixed-point unit for exact reductions: weights and penalty fractions have at
+# most 6 decimals. Group sums stay exact while |sum| < 2**53 / FIXED_SCALE (~9e9).
+FIXED_SCALE = 10 ** 6
+
+
+def to_fixed(values):
+    """Values as int64 multiples of 1 / FIXED_SCALE."""
+    return np.rint(np.asarray(values, dtype=np.float64) * FIXED_SCALE).astype(np.int64)
+
+
+def from_fixed(total):
+    total = np.asarray(total, dtype=np.float64) / FIXED_SCALE
+    return total if total.ndim else float(total)
+
+
+PENALTY_TABLE_FIXED = to_fixed(PENALTY_TABLE)
+
+
+def exact_sum(values):
+    """Order-independent sum of values with at most 6 decimals."""
+    return from_fixed(to_fixed(values).sum())
+
+
+# Credibility tiers (lower bound, name), as in sensitivity_analysis.py
+TIERS = [
+    (80, 'Exceptional Credibility'),
+    (60, 'High Credibility'),
+    (40, 'Moderate Credibility'),
+    (20, 'Low Credibility'),
+    (0, 'Very Low Credibility'),
+]
+_TIER_BOUNDS = np.array([b for b, _ in reversed(TIERS)][1:], dtype=np.float64)
+_TIER_NAMES = np.array([t for _, t in reversed(TIERS)], dtype=object)
+
+
+def classify_tier(score):
+    """Tier name for a score (or an array of scores); bounds are inclusive."""
+    names = _TIER_NAMES[np.searchsorted(_TIER_BOUNDS, np.asarray(score, dtype=np.float64), side='right')]
+    return names if np.ndim(score) else str(names)
+
+
+def effective_denominator(n_total, n_nc):
+    """
+    Adaptive denominator (Eq. 2): n_total - n_nc, unless NonClaims are more
+    than half of the claims, in which case int(0.5 * n_total). This is the
+    canonical n_eff: always an integer. Works on scalars and arrays.
+    """
+    n_total = np.asarray(n_total, dtype=np.int64)
+    n_nc = np.asarray(n_nc, dtype=np.int64)
+    n_eff = np.where(n_nc <= 0.5 * n_total, n_total - n_nc, n_total // 2)
+    return n_eff if n_eff.ndim else int(n_eff)
+
+
+def final_score(weighted_sum, n_eff, penalty_sum):
+    """100 * (weighted_sum / n_eff - penalty_sum), clamped to [0, 100]."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw = 100 * (np.asarray(weighted_sum, dtype=np.float64) / n_eff - penalty_sum)
+    return np.clip(np.nan_to_num(raw), 0.0, 100.0)
+
+
+def tactic_counts(tactic_mask):
+    """Number of claims carrying each tactic flag."""
+    tactic_mask = np.asarray(tactic_mask, dtype=np.uint8)
+    return {t: int(np.count_nonzero(tactic_mask & TACTIC_BITS[t])) for t in TACTICS}
+
+
+def score_report(category, weight, tactic_mask, exact=False):
+    """
+    Score one report. Returns the same fields as validation_results.json
+    (without section_scores).
+    """
+    category = np.asarray(category)
+    weight = np.asarray(weight, dtype=np.float64)
+    tactic_mask = np.asarray(tactic_mask, dtype=np.uint8)
+
+    if exact:
+        weighted_sum = from_fixed(to_fixed(weight).sum())
+        penalty_sum = from_fixed(PENALTY_TABLE_FIXED[tactic_mask].sum())
+    else:
+        weighted_sum = float(weight.sum())
+        penalty_sum = float(PENALTY_TABLE[tactic_mask].sum())
+    n_total = int(len(category))
+    n_nc = int(np.count_nonzero(category == NONCLAIM_CODE))
+    n_eff = effective_denominator(n_total, n_nc)
+    avg_fraction = weighted_sum / n_eff if n_eff else 0.0
+
+    return {
+        'weighted_sum': weighted_sum,
+        'n_total': n_total,
+        'n_eff': n_eff,
+        'avg_fraction': avg_fraction,
+        'penalties_applied': {t: c for t, c in tactic_counts(tactic_mask).items() if c},
+        'penalty_sum': penalty_sum,
+        'final_c_score': float(final_score(weighted_sum, n_eff, penalty_sum)),
+    }
+
+
+def group_aggregates(group_ids, n_groups, category, weight, tactic_mask=None, exact=False):
+    """
+    Per-group sufficient statistics in one bincount pass each:
+    weighted_sum, n_total, n_nc and penalty_sum (arrays of length n_groups).
+    With exact=True the sums are fixed-point; the integer totals are kept as
+    weighted_fixed / penalty_fixed so partial aggregates merge exactly
+    (merge_aggregates).
+    """
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+    category = np.asarray(category)
+    agg = {
+        'n_total': np.bincount(group_ids, minlength=n_groups).astype(np.int64),
+        'n_nc': np.bincount(group_ids, weights=(category == NONCLAIM_CODE), minlength=n_groups).astype(np.int64),
+    }
+    mask = None if tactic_mask is None else np.asarray(tactic_mask, dtype=np.uint8)
+    if exact:
+        # Integer-valued float64 bincounts are exact below 2**53
+        agg['weighted_fixed'] = np.bincount(group_ids, weights=to_fixed(weight), minlength=n_groups).astype(np.int64)
+        agg['penalty_fixed'] = (np.zeros(n_groups, dtype=np.int64) if mask is None else
+                                np.bincount(group_ids, weights=PENALTY_TABLE_FIXED[mask],
+                                            minlength=n_groups).astype(np.int64))
+        return _derive(agg)
+    agg['weighted_sum'] = np.bincount(group_ids, weights=np.asarray(weight, dtype=np.float64), minlength=n_groups)
+    if mask is not None:
+        agg['penalty_sum'] = np.bincount(group_ids, weights=PENALTY_TABLE[mask], minlength=n_groups)
+    else:
+        agg['penalty_sum'] = np.zeros(n_groups)
+    agg['n_eff'] = effective_denominator(agg['n_total'], agg['n_nc'])
+    return agg
+
+
+def _derive(agg):
+    agg['weighted_sum'] = from_fixed(agg['weighted_fixed'])
+    agg['penalty_sum'] = from_fixed(agg['penalty_fixed'])
+    agg['n_eff'] = effective_denominator(agg['n_total'], agg['n_nc'])
+    return agg
+
+
+def merge_aggregates(parts):
+    """Combine exact group_aggregates of disjoint claim chunks (same group ids)."""
+    parts = list(parts)
+    return _derive({k: sum(p[k] for p in parts) for k in ('n_total', 'n_nc', 'weighted_fixed', 'penalty_fixed')})
+
+
+def section_scores(section_ids, n_sections, category, weight, exact=False):
+    """
+    Section C_Scores as in c_score_calculator.py Figure 3:
+    100 * weighted_sum / n_eff per section, no penalty and no clamping.
+    Sections without claims are NaN.
+    """
+    agg = group_aggregates(section_ids, n_sections, category, weight, exact=exact)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = 100 * (agg['weighted_sum'] / agg['n_eff'])
+    scores[agg['n_total'] == 0] = np.nan
+    return scores
+
+
+def category_codes(labels):
+    """Map category names to int8 codes (-1 for unknown labels)."""
+    lookup = {c: i for i, c in enumerate(CATEGORIES)}
+    return np.array([lookup.get(l, -1) for l in labels], dtype=np.int8)
+
+
+class ScoreAggregates:
+    """
+    Running sufficient statistics of one report (weighted_sum, n_total, n_nc,
+    penalty_sum, tactic counts). Claims can be added or removed in batches
+    and the C_Score re-derived without rescoring the other claims. With
+    exact=True the sums are fixed-point, so removing a batch restores the
+    previous state bit for bit.
+    """
+
+    def __init__(self, exact=False):
+        self.exact = exact
+        self.weighted_sum = 0.0
+        self.n_total = 0
+        self.n_nc = 0
+        self.penalty_sum = 0.0
+        self.weighted_fixed = 0
+        self.penalty_fixed = 0
+        self.tactic_counts = np.zeros(len(TACTICS), dtype=np.int64)
+
+    @classmethod
+    def from_arrays(cls, category, weight, tactic_mask, exact=False):
+        agg = cls(exact)
+        agg.add(category, weight, tactic_mask)
+        return agg
+
+    def copy(self):
+        other = ScoreAggregates(self.exact)
+        other.__dict__.update(self.__dict__)
+        other.tactic_counts = self.tactic_counts.copy()
+        return other
+
+    def add(self, category, weight, tactic_mask, sign=1):
+        """Add (sign=1) or remove (sign=-1) a batch of claims."""
+        category = np.atleast_1d(np.asarray(category))
+        tactic_mask = np.atleast_1d(np.asarray(tactic_mask, dtype=np.uint8))
+        if self.exact:
+            self.weighted_fixed += sign * int(to_fixed(weight).sum())
+            self.penalty_fixed += sign * int(PENALTY_TABLE_FIXED[tactic_mask].sum())
+            self.weighted_sum = from_fixed(self.weighted_fixed)
+            self.penalty_sum = from_fixed(self.penalty_fixed)
+        else:
+            self.weighted_sum += sign * float(np.sum(weight, dtype=np.float64))
+            self.penalty_sum += sign * float(PENALTY_TABLE[tactic_mask].sum())
+        self.n_total += sign * len(category)
+        self.n_nc += sign * int(np.count_nonzero(category == NONCLAIM_CODE))
+        self.tactic_counts += sign * np.array([np.count_nonzero(tactic_mask & TACTIC_BITS[t]) for t in TACTICS])
+        return self
+
+    def remove(self, category, weight, tactic_mask):
+        return self.add(category, weight, tactic_mask, sign=-1)
+
+    @property
+    def n_eff(self):
+        return effective_denominator(self.n_total, self.n_nc)
+
+    def score(self):
+        n_eff = self.n_eff
+        return float(final_score(self.weighted_sum, n_eff, self.penalty_sum)) if n_eff else 0.0
+
+
+def verify_equivalence(group_ids, n_groups, category, weight, tactic_mask=None, chunk_counts=(2, 3, 8, 32),
+                       workers=4, seed=0):
+    """
+    Check that exact aggregation is bit-identical to the serial pass when the
+    claims are shuffled, split into chunks and aggregated on worker threads.
+    The same splits are run in float mode to show the drift exact mode
+    removes. Returns {'identical', 'runs': [...], 'float_max_diff'}.
+    """
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+    category = np.asarray(category)
+    weight = np.asarray(weight, dtype=np.float64)
+    mask = np.zeros(len(group_ids), dtype=np.uint8) if tactic_mask is None else np.asarray(tactic_mask, np.uint8)
+
+    def scores(agg):
+        return final_score(agg['weighted_sum'], agg['n_eff'], agg['penalty_sum'])
+
+    serial = group_aggregates(group_ids, n_groups, category, weight, mask, exact=True)
+    serial_float = scores(group_aggregates(group_ids, n_groups, category, weight, mask))
+    rng = np.random.default_rng(seed)
+    runs, float_diff = [], 0.0
+    with ThreadPoolExecutor(workers) as pool:
+        for n_chunks in chunk_counts:
+            order = rng.permutation(len(group_ids))
+            chunks = np.array_split(order, n_chunks)
+            parts = list(pool.map(lambda idx: group_aggregates(group_ids[idx], n_groups, category[idx],
+                                                               weight[idx], mask[idx], exact=True), chunks))
+            merged = merge_aggregates(parts)
+            identical = all(np.array_equal(merged[k], serial[k]) for k in serial) and \
+                np.array_equal(scores(merged), scores(serial))
+            runs.append({'chunks': n_chunks, 'workers': workers, 'identical': bool(identical)})
+
+            # Float mode on the same split: per-chunk sums added in chunk order
+            float_parts = [group_aggregates(group_ids[idx], n_groups, category[idx], weight[idx], mask[idx])
+                           for idx in chunks]
+            float_merged = {k: sum(p[k] for p in float_parts) for k in ('weighted_sum', 'penalty_sum', 'n_total', 'n_nc')}
+            float_merged['n_eff'] = effective_denominator(float_merged['n_total'], float_merged['n_nc'])
+            float_diff = max(float_diff, float(np.abs(scores(float_merged) - serial_float).max(initial=0.0)))
+    return {'identical': all(r['identical'] for r in runs), 'runs': runs, 'float_max_diff': float_diff}
+
+
+def main():
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: EXACT REDUCTION CHECK")
+    print("=" * 80)
+
+    claims, _ = load_claims()
+    category = claims['category'].cat.codes.to_numpy()
+    weight = claims['weight'].to_numpy(np.float64)
+    mask = claims['tactic_mask'].to_numpy()
+    serial = score_report(category, weight, mask)
+    exact = score_report(category, weight, mask, exact=True)
+    print(f"[+] Dataset: float {serial['final_c_score']!r} / exact {exact['final_c_score']!r} "
+          f"(weighted_sum {serial['weighted_sum']!r} / {exact['weighted_sum']!r})")
+
+    # Synthetic universe: 10,000 reports resampled from the dataset claims
+    rng = np.random.default_rng(0)
+    n_reports, per_report = 10_000, len(claims)
+    pick = rng.integers(0, len(claims), n_reports * per_report)
+    groups = np.repeat(np.arange(n_reports), per_report)
+    check = verify_equivalence(groups, n_reports, category[pick], weight[pick], mask[pick])
+    for run in check['runs']:
+        print(f"  {run['chunks']:3d} shuffled chunks on {run['workers']} threads: "
+              f"{'bit-identical' if run['identical'] else 'DIFFERS'}")
+    print(f"[+] Exact mode bit-identical across all splits: {check['identical']}")
+    print(f"[+] Float mode drift on the same splits: up to {check['float_max_diff']:.3g} C_Score points")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+FILE: scoring_service.py
+PURPOSE: Local HTTP scoring service (asyncio, standard library only).
+         POST a claim set and get its C_Score back as JSON shaped like
+         validation_results.json. Concurrent requests are coalesced into
+         micro-batches (up to MAX_BATCH requests or MAX_DELAY_MS of waiting)
+         and each batch is scored in one pass of the vectorized kernel in a
+         worker pool.
+
+         Endpoints:
+           POST /score      {"claims": [...]}
+           POST /sections   {"claims": [...]}            section rollup
+           POST /calibrate  {"claims": [...], "sector": "financial_services"}
+           POST /whatif     {"claims": [...], "weights": {"VagueTarget": -1.0}}
+           GET  /health, GET /stats
+
+         A claim is {"category", "section", "weight" (optional, defaults to
+         the category weight), "tactic_flags" (comma-separated or a list)}.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from claims_loader import CATEGORIES, CATEGORY_WEIGHTS, TACTICS, TACTIC_BITS, parse_tactics
+from scoring_kernel import category_codes, final_score, group_aggregates, section_scores
+from sector_calibration import SECTOR_CALIBRATION, BASELINE_PENALTIES, classify_calibrated
+
+HOST = '127.0.0.1'
+PORT = 8765
+MAX_BATCH = 64
+MAX_DELAY_MS = 5
+MAX_BODY = 32 * 1024 * 1024
+
+KINDS = {'/score': 'score', '/sections': 'sections', '/calibrate': 'calibrate', '/whatif': 'whatif'}
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(ValueError):
+    """A request that cannot be scored; reported as HTTP 400."""
+
+
+def _number(value, what):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"{what} must be a number, got {value!r}") from None
+    if isinstance(value, bool) or not np.isfinite(number):
+        raise RequestError(f"{what} must be a finite number, got {value!r}")
+    return number
+
+
+def _claim(i, claim):
+    """A claim with its fields coerced to the types evaluate_batch expects."""
+    if not isinstance(claim, dict):
+        raise RequestError(f"claim {i} must be an object")
+    category, flags = claim.get('category'), claim.get('tactic_flags')
+    if not isinstance(category, str):
+        raise RequestError(f"claim {i}: 'category' must be a string")
+    if isinstance(flags, (list, tuple)) and all(isinstance(f, str) for f in flags):
+        flags = ','.join(flags)
+    elif flags is not None and not isinstance(flags, str):
+        raise RequestError(f"claim {i}: 'tactic_flags' must be a string or a list of strings")
+    weight = claim.get('weight')
+    return {
+        'category': category,
+        'section': str(claim.get('section', '')),
+        'weight': None if weight in (None, '') else _number(weight, f"claim {i}: 'weight'"),
+        'tactic_flags': flags or '',
+    }
+
+
+def _validate(kind, payload):
+    """
+    The request's payload with every claim (and what-if weight) coerced;
+    raises RequestError for a request that cannot be scored.
+    """
+    claims = payload.get('claims') if isinstance(payload, dict) else None
+    if not isinstance(claims, list) or not claims:
+        raise RequestError("'claims' must be a non-empty list")
+    valid = dict(payload, claims=[_claim(i, c) for i, c in enumerate(claims)])
+    if kind == 'calibrate' and payload.get('sector', 'financial_services') not in SECTOR_CALIBRATION:
+        raise RequestError(f"unknown sector: {payload.get('sector')}")
+    if kind == 'whatif':
+        weights = payload.get('weights')
+        if not isinstance(weights, dict) or any(c not in CATEGORY_WEIGHTS for c in weights):
+            raise RequestError("'weights' must map category names to weights")
+        valid['weights'] = {c: _number(w, f"weight of {c}") for c, w in weights.items()}
+    return valid
+
+
+def evaluate_batch(requests):
+    """
+    Score a batch of (kind, payload) requests in one vectorized pass.
+    Returns one result dict per request, or {'error': message} for requests
+    that fail validation (with 'status': 500 when assembling one request's
+    result fails; the other requests are unaffected).
+    """
+    responses = [None] * len(requests)
+    valid, claim_lists, payloads = [], [], {}
+    for i, (kind, payload) in enumerate(requests):
+        try:
+            payloads[i] = _validate(kind, payload)
+            claim_lists.append(payloads[i]['claims'])
+            valid.append(i)
+        except RequestError as e:
+            responses[i] = {'error': str(e)}
+    if not valid:
+        return responses
+
+    n_req = len(valid)
+    lengths = np.array([len(c) for c in claim_lists])
+    group = np.repeat(np.arange(n_req), lengths)
+    claims = [c for claim_list in claim_lists for c in claim_list]
+
+    labels = [c['category'] for c in claims]
+    category = category_codes(labels)
+    bad = np.bincount(group, weights=(category < 0), minlength=n_req) > 0
+
+    # Per-claim weight, else the category weight; what-if requests use their own table
+    default = np.array([CATEGORY_WEIGHTS[c] for c in CATEGORIES] + [0.0])
+    table = np.tile(default, (n_req, 1))
+    override = np.zeros(n_req, dtype=bool)
+    for g, i in enumerate(valid):
+        if requests[i][0] == 'whatif':
+            override[g] = True
+            for name, w in payloads[i]['weights'].items():
+                table[g, CATEGORIES.index(name)] = w
+    given = np.array([np.nan if c['weight'] is None else c['weight'] for c in claims])
+    looked_up = table[group, category]          # code -1 -> the trailing 0.0
+    weight = np.where(override[group] | np.isnan(given), looked_up, given)
+
+    tactic_mask, invalid_flags = parse_tactics(pd.Series([c['tactic_flags'] for c in claims], dtype=object))
+    bad |= np.bincount(group, weights=invalid_flags, minlength=n_req) > 0
+
+    agg = group_aggregates(group, n_req, category, weight, tactic_mask)
+    scores = final_score(agg['weighted_sum'], agg['n_eff'], agg['penalty_sum'])
+    counts = {t: np.bincount(group, weights=(tactic_mask & TACTIC_BITS[t]) > 0, minlength=n_req).astype(int)
+              for t in TACTICS}
+
+    # Section rollup over (request, section) pairs
+    section_labels = np.array([c['section'] for c in claims], dtype=object)
+    pair_ids, pairs = pd.factorize(pd.MultiIndex.from_arrays([group, section_labels]))
+    pair_scores = section_scores(pair_ids, len(pairs), category, weight)
+    sections = [{} for _ in range(n_req)]
+    for (g, name), value in zip(pairs, pair_scores):
+        sections[g][name] = float(value)
+
+    for g, i in enumerate(valid):
+        if bad[g]:
+            responses[i] = {'error': 'unknown category or tactic flag'}
+            continue
+        # A failure here belongs to this request only
+        try:
+            kind, payload = requests[i][0], payloads[i]
+            n_eff = int(agg['n_eff'][g])
+            result = {
+                'weighted_sum': float(agg['weighted_sum'][g]),
+                'n_total': int(agg['n_total'][g]),
+                'n_eff': n_eff,
+                'avg_fraction': float(agg['weighted_sum'][g] / n_eff) if n_eff else 0.0,
+                'penalties_applied': {t: int(counts[t][g]) for t in TACTICS if counts[t][g]},
+                'penalty_sum': float(agg['penalty_sum'][g]),
+                'final_c_score': float(scores[g]),
+                'section_scores': dict(sorted(sections[g].items())),
+            }
+            if kind == 'calibrate':
+                sector = payload.get('sector', 'financial_services')
+                raw = 100 * result['weighted_sum'] / result['n_total']
+                baseline = sum(abs(BASELINE_PENALTIES[t]) * counts[t][g] for t in TACTICS)
+                calibrated = sum(abs(BASELINE_PENALTIES[t]) * SECTOR_CALIBRATION[sector][t] * counts[t][g]
+                                 for t in TACTICS)
+                result['calibration'] = {
+                    'sector': sector,
+                    'raw_score': raw,
+                    'baseline_score': raw - baseline,
+                    'calibrated_score': raw - calibrated,
+                    'classification': classify_calibrated(raw - calibrated),
+                }
+            elif kind == 'whatif':
+                result['weights'] = {c: float(table[g, k]) for k, c in enumerate(CATEGORIES)}
+        except Exception as e:
+            result = {'error': f'could not score request: {e!r}', 'status': 500}
+        responses[i] = result
+    return responses
+
+
+class MicroBatcher:
+    """Coalesces submitted requests and evaluates each batch in `executor`."""
+
+    def __init__(self, executor, max_batch=MAX_BATCH, max_delay_ms=MAX_DELAY_MS):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.queue = asyncio.Queue()
+        self.stats = {'requests': 0, 'batches': 0, 'max_batch': 0}
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def submit(self, kind, payload):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(((kind, payload), future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Keep collecting the next batch while this one is evaluated
+            loop.create_task(self._evaluate(batch))
+
+    async def _evaluate(self, batch):
+        self.stats['requests'] += len(batch)
+        self.stats['batches'] += 1
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+        await self._run(batch)
+
+    async def _run(self, batch):
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, evaluate_batch, [request for request, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                # Re-run the requests one by one so only the failing one gets the error
+                for item in batch:
+                    await self._run([item])
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class ScoringService:
+    """Minimal HTTP/1.1 server (keep-alive, JSON bodies) in front of a MicroBatcher."""
+
+    def __init__(self, host=HOST, port=PORT, workers=1, max_batch=MAX_BATCH, max_delay_ms=MAX_DELAY_MS):
+        self.host, self.port = host, port
+        # Processes for real parallelism; a thread is enough (and starts instantly) for one worker
+        self.executor = ProcessPoolExecutor(workers) if workers > 1 else ThreadPoolExecutor(1)
+        self.batcher = MicroBatcher(self.executor, max_batch, max_delay_ms)
+        self.server = None
+        self.started = time.time()
+
+    async def start(self):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        await self.batcher.stop()
+        self.server.close()
+        await self.server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _dispatch(self, method, path, body):
+        if path == '/health' and method == 'GET':
+            return 200, {'status': 'ok'}
+        if path == '/stats' and method == 'GET':
+            stats = dict(self.batcher.stats, uptime_s=time.time() - self.started)
+            stats['mean_batch'] = stats['requests'] / stats['batches'] if stats['batches'] else 0.0
+            return 200, stats
+        if path not in KINDS:
+            return 404, {'error': f'no endpoint {path}'}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError as e:
+            return 400, {'error': f'invalid JSON: {e}'}
+        try:
+            payload = _validate(KINDS[path], payload)
+        except RequestError as e:
+            return 400, {'error': str(e)}
+        result = await self.batcher.submit(KINDS[path], payload)
+        return (result.pop('status', 400) if 'error' in result else 200), result
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY:
+                    status, result = 413, {'error': 'request body too large'}
+                    await self._respond(writer, status, result, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                try:
+                    status, result = await self._dispatch(method, path.split('?')[0], body)
+                except Exception as e:
+                    status, result = 500, {'error': repr(e)}
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, result, keep_alive=True):
+        body = json.dumps(result).encode('utf-8')
+        head = (f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\n'
+                f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(**kwargs):
+    service = await ScoringService(**kwargs).start()
+    print(f"[+] Scoring service on http://{service.host}:{service.port} "
+          f"(max batch {service.batcher.max_batch}, max delay {service.batcher.max_delay * 1000:.0f} ms)")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local C_Score scoring service.')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=1, help='scoring worker processes')
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH, help='requests per micro-batch')
+    parser.add_argument('--max-delay-ms', type=float, default=MAX_DELAY_MS, help='longest wait to fill a batch')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: SCORING SERVICE")
+    print("=" * 80)
+    try:
+        asyncio.run(serve(host=args.host, port=args.port, workers=args.workers,
+                          max_batch=args.max_batch, max_delay_ms=args.max_delay_ms))
+    except KeyboardInterrupt:
+        print("\n[+] Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,11 @@ import pandas as pd
 import numpy as np
 import json
 import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+from claims_loader import load_claims, print_errors, scoring_frame
+from instrumentation import StageProfiler, write_profile
+from raster_heatmap import draw_heatmap
+from scoring_kernel import exact_sum
 
 # --- 1. DYNAMIC PATH SETUP (Added to fix FileNotFoundError) ---
 # Calculates the root folder 'C_Score-Framework' automatically
@@ -21,21 +24,6 @@ DOCS_DIR = os.path.join(BASE_DIR, 'docs')
 for d in [DATA_DIR, VIS_DIR, DOCS_DIR]:
     os.makedirs(d, exist_ok=True)
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-
-# Load original data (Fixed Path)
-input_path = os.path.join(DATA_DIR, 'morgan_stanley_claims_dataset.csv')
-if os.path.exists(input_path):
-    df = pd.read_csv(input_path)
-else:
-    print(f"[!] Warning: {input_path} not found. Creating empty DataFrame.")
-    df = pd.DataFrame(columns=['weight', 'section'])
-
-print("="*80)
-print("SECTOR-SPECIFIC C_SCORE CALIBRATION FRAMEWORK")
-print("="*80)
-
 # Define sector-specific penalty multipliers
 SECTOR_CALIBRATION = {
     'financial_services': {
@@ -120,78 +108,158 @@ BASELINE_PENALTIES = {
     'OffsetsOnly': -5
 }
 
-print("\n" + "="*80)
-print("SECTOR CALIBRATION TABLE")
-print("="*80)
-
-# Create calibration table
-calibration_data = []
-for sector, multipliers in SECTOR_CALIBRATION.items():
-    for tactic, penalty in BASELINE_PENALTIES.items():
-        multiplier = multipliers.get(tactic, 1.0)
-        adjusted_penalty = penalty * multiplier
-        calibration_data.append({
-            'Sector': sector,
-            'Tactic': tactic,
-            'Baseline_Penalty': penalty,
-            'Multiplier': multiplier,
-            'Adjusted_Penalty': adjusted_penalty
-        })
-
-calibration_df = pd.DataFrame(calibration_data)
-
-# Print formatted table by sector
-for sector in SECTOR_CALIBRATION.keys():
-    sector_data = calibration_df[calibration_df['Sector'] == sector]
-    print(f"\n{sector.upper().replace('_', ' ')}:")
-    print(f"  Rationale: {SECTOR_CALIBRATION[sector]['rationale']}")
-    print(f"  Source: {SECTOR_CALIBRATION[sector]['materiality_source']}")
-    print("\n  Tactic Penalties:")
-    for _, row in sector_data.iterrows():
-        if row['Multiplier'] != 1.0:  # Only show non-baseline
-            change = "increased" if row['Multiplier'] > 1.0 else "decreased"
-            print(f"    {row['Tactic']}: {row['Baseline_Penalty']:.0f} → {row['Adjusted_Penalty']:.0f} ({change} {abs(row['Multiplier']-1.0)*100:.0f}%)")
-
-# Morgan Stanley (Financial Services) Recalculation
-print("\n" + "="*80)
-print("MORGAN STANLEY: FINANCIAL SERVICES CALIBRATION")
-print("="*80)
-
-if not df.empty:
-    # Original calculation
-    original_weighted_sum = df['weight'].sum()
-    original_n_total = len(df)
+
+# Generic tier ladder used for the calibrated score
+def classify_calibrated(score):
+    if score >= 80:
+        return "Exceptional credibility"
+    elif score >= 60:
+        return "High credibility"
+    elif score >= 40:
+        return "Moderate credibility"
+    else:
+        return "Low credibility"
+
+
+def calibration_table():
+    """Baseline penalty x sector multiplier for every sector and tactic."""
+    calibration_data = []
+    for sector, multipliers in SECTOR_CALIBRATION.items():
+        for tactic, penalty in BASELINE_PENALTIES.items():
+            multiplier = multipliers.get(tactic, 1.0)
+            adjusted_penalty = penalty * multiplier
+            calibration_data.append({
+                'Sector': sector,
+                'Tactic': tactic,
+                'Baseline_Penalty': penalty,
+                'Multiplier': multiplier,
+                'Adjusted_Penalty': adjusted_penalty
+            })
+    return pd.DataFrame(calibration_data)
+
+
+def compute_calibration(df, score=None, exact=False):
+    """
+    Morgan Stanley baseline vs financial services calibrated C_Score.
+
+    `score` is the c_score_calculator result for the same claims; when given,
+    its weighted_sum and n_total are reused instead of being re-derived.
+    exact=True uses order-independent fixed-point weight sums.
+    Returns a dict with the calibration table, the section rows and the
+    sector_calibration_results.json payload.
+    """
+    calibration_df = calibration_table()
     original_penalty = -15  # ScopeOmission detected
-    original_c_score_raw = 100 * (original_weighted_sum / original_n_total)
-    original_c_score_final = original_c_score_raw - abs(original_penalty)
+    fs_multiplier = SECTOR_CALIBRATION['financial_services']['ScopeOmission']
+    fs_penalty = BASELINE_PENALTIES['ScopeOmission'] * fs_multiplier
+    sections = []
+    weight_sum = exact_sum if exact else pd.Series.sum
+
+    if not df.empty:
+        # Original calculation
+        if score is not None:
+            original_weighted_sum, original_n_total = score['weighted_sum'], score['n_total']
+        else:
+            original_weighted_sum, original_n_total = weight_sum(df['weight']), len(df)
+        original_c_score_raw = 100 * (original_weighted_sum / original_n_total)
+        original_c_score_final = original_c_score_raw - abs(original_penalty)
+
+        # Financial services calibrated calculation
+        fs_c_score_final = original_c_score_raw - abs(fs_penalty)
+        fs_classification = classify_calibrated(fs_c_score_final)
+
+        # Section-level analysis with calibration
+        for section in df['section'].unique():
+            section_df = df[df['section'] == section]
+            section_score_raw = 100 * (weight_sum(section_df['weight']) / len(section_df))
+            # Apply penalty only to Climate section (where ScopeOmission detected)
+            section_penalty = abs(fs_penalty) if section == "Climate" else 0
+            sections.append((section, section_score_raw, section_penalty, section_score_raw - section_penalty))
+    else:
+        # Defaults for chart generation if data missing
+        original_weighted_sum = original_c_score_raw = None
+        original_c_score_final = 89.0
+        fs_c_score_final = 79.0
+        fs_classification = "High credibility"
+
+    calibration_results = {
+        'sector_calibration_framework': SECTOR_CALIBRATION,
+        'baseline_penalties': BASELINE_PENALTIES,
+        'morgan_stanley_baseline': {
+            'c_score': float(original_c_score_final),
+            'classification': 'Exceptional credibility',
+            'penalty': int(original_penalty)
+        },
+        'morgan_stanley_calibrated': {
+            'c_score': float(fs_c_score_final),
+            'classification': fs_classification,
+            'penalty': float(fs_penalty),
+            'multiplier': float(fs_multiplier)
+        },
+        'impact': {
+            'score_change': float(fs_c_score_final - original_c_score_final),
+            'percentage_change': float((fs_c_score_final - original_c_score_final)/original_c_score_final*100),
+            'classification_change': f'Exceptional → {fs_classification}'
+        }
+    }
+
+    return {
+        'calibration_df': calibration_df,
+        'weighted_sum': original_weighted_sum,
+        'raw_score': original_c_score_raw,
+        'baseline_penalty': original_penalty,
+        'baseline_score': original_c_score_final,
+        'fs_multiplier': fs_multiplier,
+        'fs_penalty': fs_penalty,
+        'fs_score': fs_c_score_final,
+        'fs_classification': fs_classification,
+        'sections': sections,
+        'results': calibration_results,
+    }
+
+
+def print_calibration(cal):
+    calibration_df = cal['calibration_df']
+
+    print("\n" + "="*80)
+    print("SECTOR CALIBRATION TABLE")
+    print("="*80)
+
+    # Print formatted table by sector
+    for sector in SECTOR_CALIBRATION.keys():
+        sector_data = calibration_df[calibration_df['Sector'] == sector]
+        print(f"\n{sector.upper().replace('_', ' ')}:")
+        print(f"  Rationale: {SECTOR_CALIBRATION[sector]['rationale']}")
+        print(f"  Source: {SECTOR_CALIBRATION[sector]['materiality_source']}")
+        print("\n  Tactic Penalties:")
+        for _, row in sector_data.iterrows():
+            if row['Multiplier'] != 1.0:  # Only show non-baseline
+                change = "increased" if row['Multiplier'] > 1.0 else "decreased"
+                print(f"    {row['Tactic']}: {row['Baseline_Penalty']:.0f} → {row['Adjusted_Penalty']:.0f} ({change} {abs(row['Multiplier']-1.0)*100:.0f}%)")
+
+    # Morgan Stanley (Financial Services) Recalculation
+    print("\n" + "="*80)
+    print("MORGAN STANLEY: FINANCIAL SERVICES CALIBRATION")
+    print("="*80)
+
+    if cal['weighted_sum'] is None:
+        return
+
+    original_c_score_final, fs_c_score_final = cal['baseline_score'], cal['fs_score']
+    fs_classification = cal['fs_classification']
 
     print("\nORIGINAL (BASELINE PENALTIES):")
-    print(f"  Weighted sum: {original_weighted_sum:.2f}")
-    print(f"  Raw C_Score: {original_c_score_raw:.2f}")
-    print(f"  ScopeOmission penalty: {original_penalty}")
+    print(f"  Weighted sum: {cal['weighted_sum']:.2f}")
+    print(f"  Raw C_Score: {cal['raw_score']:.2f}")
+    print(f"  ScopeOmission penalty: {cal['baseline_penalty']}")
     print(f"  Final C_Score: {original_c_score_final:.2f}")
     print(f"  Classification: Exceptional credibility")
 
-    # Financial services calibrated calculation
-    fs_multiplier = SECTOR_CALIBRATION['financial_services']['ScopeOmission']
-    fs_penalty = BASELINE_PENALTIES['ScopeOmission'] * fs_multiplier
-    fs_c_score_final = original_c_score_raw - abs(fs_penalty)
-
     print("\nFINANCIAL SERVICES CALIBRATED:")
-    print(f"  Weighted sum: {original_weighted_sum:.2f} (unchanged)")
-    print(f"  Raw C_Score: {original_c_score_raw:.2f} (unchanged)")
-    print(f"  ScopeOmission penalty: {BASELINE_PENALTIES['ScopeOmission']} × {fs_multiplier} = {fs_penalty:.0f}")
+    print(f"  Weighted sum: {cal['weighted_sum']:.2f} (unchanged)")
+    print(f"  Raw C_Score: {cal['raw_score']:.2f} (unchanged)")
+    print(f"  ScopeOmission penalty: {BASELINE_PENALTIES['ScopeOmission']} × {cal['fs_multiplier']} = {cal['fs_penalty']:.0f}")
     print(f"  Final C_Score: {fs_c_score_final:.2f}")
-
-    if fs_c_score_final >= 80:
-        fs_classification = "Exceptional credibility"
-    elif fs_c_score_final >= 60:
-        fs_classification = "High credibility"
-    elif fs_c_score_final >= 40:
-        fs_classification = "Moderate credibility"
-    else:
-        fs_classification = "Low credibility"
-
     print(f"  Classification: {fs_classification}")
 
     print("\nIMPACT OF SECTOR CALIBRATION:")
@@ -205,170 +273,187 @@ if not df.empty:
     print(f"  limited detail on Scope 3 financed emissions reduction pathway.")
     print(f"  For financial services, this constitutes a MATERIAL OMISSION warranting higher penalty.")
 
-    # Section-level analysis with calibration
     print("\n" + "="*80)
     print("SECTION-LEVEL SCORES (FINANCIAL SERVICES CALIBRATION)")
     print("="*80)
 
-    for section in df['section'].unique():
-        section_df = df[df['section'] == section]
-        section_weighted_sum = section_df['weight'].sum()
-        section_count = len(section_df)
-        section_score_raw = 100 * (section_weighted_sum / section_count)
-        
-        # Apply penalty only to Climate section (where ScopeOmission detected)
-        if section == "Climate":
-            section_penalty = abs(fs_penalty)
-        else:
-            section_penalty = 0
-        
-        section_score_final = section_score_raw - section_penalty
-        
+    for section, section_score_raw, section_penalty, section_score_final in cal['sections']:
         print(f"\n{section}:")
         print(f"  Raw score: {section_score_raw:.2f}")
         print(f"  Penalty: {-section_penalty:.0f}" if section_penalty > 0 else f"  Penalty: 0")
         print(f"  Final score: {section_score_final:.2f}")
-else:
-    # Defaults for chart generation if data missing
-    original_c_score_final = 89.0
-    fs_c_score_final = 79.0
-    fs_classification = "High credibility"
-
-# Comparative visualization
-print("\n" + "="*80)
-print("GENERATING VISUALIZATIONS")
-print("="*80)
-
-# Visualization 1: Sector calibration heatmap
-fig, ax = plt.subplots(figsize=(12, 8))
-pivot_data = calibration_df.pivot(index='Sector', columns='Tactic', values='Adjusted_Penalty')
-
-# [MODIFIED] Changed cmap to 'Greens' to match user preference
-# [MODIFIED] Added linecolor and linewidths for professional look
-# [MODIFIED] Changed fmt to '.1f' for cleaner numbers
-sns.heatmap(pivot_data, annot=True, fmt='.1f', cmap='Greens', center=0, 
-            cbar_kws={'label': 'Penalty Value'}, linewidths=1, linecolor='white', ax=ax)
-
-ax.set_title('Sector-Specific Penalty Calibration Heatmap', fontsize=14, fontweight='bold', pad=20)
-ax.set_xlabel('Greenwashing Tactic', fontsize=12, fontweight='bold')
-ax.set_ylabel('Sector', fontsize=12, fontweight='bold')
-plt.xticks(rotation=45, ha='right')
-plt.yticks(rotation=0)
-plt.tight_layout()
-
-# Save to VIS_DIR
-save_path_09 = os.path.join(VIS_DIR, '09_sector_calibration_heatmap.png')
-plt.savefig(save_path_09, dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {save_path_09}")
-
-# Visualization 2: Morgan Stanley baseline vs. calibrated
-fig, ax = plt.subplots(figsize=(10, 6))
-scenarios = ['Baseline\n(Generic)', 'Financial Services\n(Calibrated)']
-scores = [original_c_score_final, fs_c_score_final]
-colors = ['#3498db', '#e74c3c']
-
-bars = ax.bar(scenarios, scores, color=colors, alpha=0.8)
-ax.set_ylabel('C_Score', fontsize=12, fontweight='bold')
-ax.set_title('Morgan Stanley C_Score: Impact of Sector-Specific Calibration', 
-             fontsize=14, fontweight='bold', pad=20)
-ax.axhline(y=80, color='green', linestyle='--', linewidth=1, alpha=0.5, label='Exceptional (80+)')
-ax.axhline(y=60, color='yellow', linestyle='--', linewidth=1, alpha=0.5, label='High (60+)')
-ax.set_ylim([0, 100])
-ax.legend()
-ax.grid(axis='y', alpha=0.3)
-
-# Add value labels
-for i, (bar, score) in enumerate(zip(bars, scores)):
-    ax.text(i, score + 2, f'{score:.1f}', ha='center', va='bottom', fontweight='bold', fontsize=11)
-    if i == 0:
-        ax.text(i, score - 8, 'Exceptional', ha='center', va='top', fontsize=10, style='italic')
-    else:
-        ax.text(i, score - 8, fs_classification, ha='center', va='top', fontsize=10, style='italic')
-
-# Add annotation
-ax.annotate(f'Impact: {fs_c_score_final - original_c_score_final:.1f} pts\n({((fs_c_score_final - original_c_score_final)/original_c_score_final*100):.1f}%)',
-            xy=(0.5, (original_c_score_final + fs_c_score_final)/2),
-            xytext=(0.7, 50),
-            arrowprops=dict(arrowstyle='->', lw=2, color='gray'),
-            fontsize=10, ha='center',
-            bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor='gray'))
-
-plt.tight_layout()
-# Save to VIS_DIR
-save_path_10 = os.path.join(VIS_DIR, '10_morgan_stanley_calibrated.png')
-plt.savefig(save_path_10, dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {save_path_10}")
-
-# Visualization 3: Multiplier comparison across sectors
-fig, ax = plt.subplots(figsize=(14, 8))
-tactics = list(BASELINE_PENALTIES.keys())
-x = np.arange(len(tactics))
-width = 0.12
-
-for i, (sector, multipliers) in enumerate(SECTOR_CALIBRATION.items()):
-    sector_mults = [multipliers.get(tactic, 1.0) for tactic in tactics]
-    offset = (i - len(SECTOR_CALIBRATION)/2 + 0.5) * width
-    ax.bar(x + offset, sector_mults, width, label=sector.replace('_', ' ').title(), alpha=0.8)
-
-ax.set_xlabel('Greenwashing Tactic', fontsize=12, fontweight='bold')
-ax.set_ylabel('Penalty Multiplier', fontsize=12, fontweight='bold')
-ax.set_title('Sector-Specific Penalty Multipliers by Tactic', fontsize=14, fontweight='bold', pad=20)
-ax.set_xticks(x)
-ax.set_xticklabels(tactics, rotation=45, ha='right')
-ax.axhline(y=1.0, color='black', linestyle='--', linewidth=1, alpha=0.5, label='Baseline (1.0×)')
-ax.legend(loc='upper left', ncol=2, fontsize=9)
-ax.grid(axis='y', alpha=0.3)
-
-plt.tight_layout()
-# Save to VIS_DIR
-save_path_11 = os.path.join(VIS_DIR, '11_sector_multipliers.png')
-plt.savefig(save_path_11, dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {save_path_11}")
-
-# Save calibration results
-calibration_results = {
-    'sector_calibration_framework': SECTOR_CALIBRATION,
-    'baseline_penalties': BASELINE_PENALTIES,
-    'morgan_stanley_baseline': {
-        'c_score': float(original_c_score_final),
-        'classification': 'Exceptional credibility',
-        'penalty': int(original_penalty)
-    },
-    'morgan_stanley_calibrated': {
-        'c_score': float(fs_c_score_final),
-        'classification': fs_classification,
-        'penalty': float(fs_penalty),
-        'multiplier': float(fs_multiplier)
-    },
-    'impact': {
-        'score_change': float(fs_c_score_final - original_c_score_final),
-        'percentage_change': float((fs_c_score_final - original_c_score_final)/original_c_score_final*100),
-        'classification_change': f'Exceptional → {fs_classification}'
+
+
+def plot_calibration(cal, vis_dir=VIS_DIR):
+    """Figures 09, 10 and 11."""
+    calibration_df = cal['calibration_df']
+    original_c_score_final, fs_c_score_final = cal['baseline_score'], cal['fs_score']
+    fs_classification = cal['fs_classification']
+
+    print("\n" + "="*80)
+    print("GENERATING VISUALIZATIONS")
+    print("="*80)
+
+    with plt.style.context('seaborn-v0_8-darkgrid', after_reset=True):
+        # Visualization 1: Sector calibration heatmap
+        fig, ax = plt.subplots(figsize=(12, 8))
+        pivot_data = calibration_df.pivot(index='Sector', columns='Tactic', values='Adjusted_Penalty')
+
+        # [MODIFIED] Changed cmap to 'Greens' to match user preference
+        # [MODIFIED] Added linecolor and linewidths for professional look
+        # [MODIFIED] Changed fmt to '.1f' for cleaner numbers
+        # Annotated below ANNOT_LIMIT cells, raster rendering beyond
+        draw_heatmap(pivot_data, ax, fmt='.1f', cmap='Greens', cbar_label='Penalty Value', center=0,
+                     linewidths=1, linecolor='white')
+
+        ax.set_title('Sector-Specific Penalty Calibration Heatmap', fontsize=14, fontweight='bold', pad=20)
+        ax.set_xlabel('Greenwashing Tactic', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Sector', fontsize=12, fontweight='bold')
+        plt.xticks(rotation=45, ha='right')
+        plt.yticks(rotation=0)
+        plt.tight_layout()
+
+        # Save to VIS_DIR
+        save_path_09 = os.path.join(vis_dir, '09_sector_calibration_heatmap.png')
+        plt.savefig(save_path_09, dpi=300, bbox_inches='tight')
+        print(f"✓ Saved: {save_path_09}")
+
+        # Visualization 2: Morgan Stanley baseline vs. calibrated
+        fig, ax = plt.subplots(figsize=(10, 6))
+        scenarios = ['Baseline\n(Generic)', 'Financial Services\n(Calibrated)']
+        scores = [original_c_score_final, fs_c_score_final]
+        colors = ['#3498db', '#e74c3c']
+
+        bars = ax.bar(scenarios, scores, color=colors, alpha=0.8)
+        ax.set_ylabel('C_Score', fontsize=12, fontweight='bold')
+        ax.set_title('Morgan Stanley C_Score: Impact of Sector-Specific Calibration',
+                     fontsize=14, fontweight='bold', pad=20)
+        ax.axhline(y=80, color='green', linestyle='--', linewidth=1, alpha=0.5, label='Exceptional (80+)')
+        ax.axhline(y=60, color='yellow', linestyle='--', linewidth=1, alpha=0.5, label='High (60+)')
+        ax.set_ylim([0, 100])
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+
+        # Add value labels
+        for i, (bar, score) in enumerate(zip(bars, scores)):
+            ax.text(i, score + 2, f'{score:.1f}', ha='center', va='bottom', fontweight='bold', fontsize=11)
+            if i == 0:
+                ax.text(i, score - 8, 'Exceptional', ha='center', va='top', fontsize=10, style='italic')
+            else:
+                ax.text(i, score - 8, fs_classification, ha='center', va='top', fontsize=10, style='italic')
+
+        # Add annotation
+        ax.annotate(f'Impact: {fs_c_score_final - original_c_score_final:.1f} pts\n({((fs_c_score_final - original_c_score_final)/original_c_score_final*100):.1f}%)',
+                    xy=(0.5, (original_c_score_final + fs_c_score_final)/2),
+                    xytext=(0.7, 50),
+                    arrowprops=dict(arrowstyle='->', lw=2, color='gray'),
+                    fontsize=10, ha='center',
+                    bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor='gray'))
+
+        plt.tight_layout()
+        # Save to VIS_DIR
+        save_path_10 = os.path.join(vis_dir, '10_morgan_stanley_calibrated.png')
+        plt.savefig(save_path_10, dpi=300, bbox_inches='tight')
+        print(f"✓ Saved: {save_path_10}")
+
+        # Visualization 3: Multiplier comparison across sectors
+        fig, ax = plt.subplots(figsize=(14, 8))
+        tactics = list(BASELINE_PENALTIES.keys())
+        x = np.arange(len(tactics))
+        width = 0.12
+
+        for i, (sector, multipliers) in enumerate(SECTOR_CALIBRATION.items()):
+            sector_mults = [multipliers.get(tactic, 1.0) for tactic in tactics]
+            offset = (i - len(SECTOR_CALIBRATION)/2 + 0.5) * width
+            ax.bar(x + offset, sector_mults, width, label=sector.replace('_', ' ').title(), alpha=0.8)
+
+        ax.set_xlabel('Greenwashing Tactic', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Penalty Multiplier', fontsize=12, fontweight='bold')
+        ax.set_title('Sector-Specific Penalty Multipliers by Tactic', fontsize=14, fontweight='bold', pad=20)
+        ax.set_xticks(x)
+        ax.set_xticklabels(tactics, rotation=45, ha='right')
+        ax.axhline(y=1.0, color='black', linestyle='--', linewidth=1, alpha=0.5, label='Baseline (1.0×)')
+        ax.legend(loc='upper left', ncol=2, fontsize=9)
+        ax.grid(axis='y', alpha=0.3)
+
+        plt.tight_layout()
+        # Save to VIS_DIR
+        save_path_11 = os.path.join(vis_dir, '11_sector_multipliers.png')
+        plt.savefig(save_path_11, dpi=300, bbox_inches='tight')
+        print(f"✓ Saved: {save_path_11}")
+        plt.close('all')
+
+
+def save_calibration(cal, docs_dir=DOCS_DIR, data_dir=DATA_DIR, profile=None):
+    """Write sector_calibration_results.json and the calibration table CSV."""
+    # Save to DOCS_DIR
+    json_path = os.path.join(docs_dir, 'sector_calibration_results.json')
+    with open(json_path, 'w') as f:
+        json.dump(cal['results'], f, indent=2)
+    if profile:
+        write_profile(json_path, profile)
+
+    # Export calibration table (Fixed Path)
+    cal_csv_path = os.path.join(data_dir, 'sector_calibration_table.csv')
+    cal['calibration_df'].to_csv(cal_csv_path, index=False)
+
+
+def load_calibration(docs_dir=DOCS_DIR, data_dir=DATA_DIR):
+    """The figure inputs of compute_calibration, rebuilt from a saved results JSON and calibration table."""
+    with open(os.path.join(docs_dir, 'sector_calibration_results.json')) as f:
+        results = json.load(f)
+    calibrated = results['morgan_stanley_calibrated']
+    return {
+        'calibration_df': pd.read_csv(os.path.join(data_dir, 'sector_calibration_table.csv'),
+                                      float_precision='round_trip'),
+        'baseline_score': results['morgan_stanley_baseline']['c_score'],
+        'fs_score': calibrated['c_score'],
+        'fs_classification': calibrated['classification'],
+        'results': results,
     }
-}
 
-# Save to DOCS_DIR
-json_path = os.path.join(DOCS_DIR, 'sector_calibration_results.json')
-with open(json_path, 'w') as f:
-    json.dump(calibration_results, f, indent=2)
 
-# Export calibration table (Fixed Path)
-cal_csv_path = os.path.join(DATA_DIR, 'sector_calibration_table.csv')
-calibration_df.to_csv(cal_csv_path, index=False)
+def print_summary():
+    print("\n" + "="*80)
+    print("SECTOR CALIBRATION FRAMEWORK COMPLETE")
+    print("="*80)
 
-print("\n" + "="*80)
-print("SECTOR CALIBRATION FRAMEWORK COMPLETE")
-print("="*80)
+    print()
+    print("  Issue 2 (Industry-specific): ✅ FRAMEWORK PROVIDED")
+    print("    - 7 sector calibration profiles defined")
+    print("    - Morgan Stanley recalculated with FS multipliers")
+    print("    - SASB/CDP sources cited for justification")
+    print("    - Cross-sector empirical validation = future work")
 
+    print("\n" + "="*80)
+    print("="*80)
+
+
+def main():
+    # Load original data (Fixed Path)
+    profiler = StageProfiler()
+    input_path = os.path.join(DATA_DIR, 'morgan_stanley_claims_dataset.csv')
+    if os.path.exists(input_path):
+        with profiler.stage('load'):
+            claims, errors = load_claims(input_path)
+            df = scoring_frame(claims)
+        print_errors(errors)
+    else:
+        print(f"[!] Warning: {input_path} not found. Creating empty DataFrame.")
+        df = pd.DataFrame(columns=['weight', 'section'])
 
+    print("="*80)
+    print("SECTOR-SPECIFIC C_SCORE CALIBRATION FRAMEWORK")
+    print("="*80)
 
+    with profiler.stage('calibrate'):
+        cal = compute_calibration(df)
+    print_calibration(cal)
+    with profiler.stage('calibrate/figures'):
+        plot_calibration(cal)
+    save_calibration(cal, profile=profiler.block(['load', 'calibrate']))
+    print_summary()
 
-print()
-print("  Issue 2 (Industry-specific): ✅ FRAMEWORK PROVIDED")
-print("    - 7 sector calibration profiles defined")
-print("    - Morgan Stanley recalculated with FS multipliers")
-print("    - SASB/CDP sources cited for justification")
-print("    - Cross-sector empirical validation = future work")
 
-print("\n" + "="*80)
-print("="*80)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
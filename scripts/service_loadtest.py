@@ -0,0 +1,164 @@
+"""
+FILE: service_loadtest.py
+PURPOSE: Load test for scoring_service.py using only a local asyncio client.
+         Opens CONCURRENCY keep-alive connections, sends a mix of score,
+         section, calibration and what-if requests built from the claims
+         dataset, and reports p50/p99 latency, throughput and the service's
+         micro-batch statistics. Starts an in-process service unless --url
+         points at a running one. Also checks that /score reproduces
+         c_score_calculator.py on the full dataset.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+from claims_loader import load_claims
+from scoring_service import ScoringService, MAX_BATCH, MAX_DELAY_MS
+from c_score_calculator import compute_scores
+
+CONCURRENCY = 32
+REQUESTS = 2000
+SUBSET_SIZE = 25
+
+ENDPOINTS = ['/score', '/sections', '/calibrate', '/whatif']
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.writer.write((f'{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n'
+                           f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n').encode('latin-1')
+                          + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def claim_payloads(claims):
+    return [{'claim_id': row.claim_id, 'category': row.category, 'section': row.section,
+             'weight': float(row.weight), 'tactic_flags': row.tactic_flags}
+            for row in claims[['claim_id', 'category', 'section', 'weight', 'tactic_flags']].itertuples()]
+
+
+def make_requests(payloads, n, seed=0):
+    """n (path, body) pairs over random claim subsets, cycling the endpoints."""
+    rng = np.random.default_rng(seed)
+    requests = []
+    for i in range(n):
+        subset = [payloads[j] for j in rng.choice(len(payloads), SUBSET_SIZE, replace=False)]
+        path = ENDPOINTS[i % len(ENDPOINTS)]
+        body = {'claims': subset}
+        if path == '/calibrate':
+            body['sector'] = 'financial_services'
+        elif path == '/whatif':
+            body['weights'] = {'VagueTarget': -1.0, 'AmbiguousBaseline': -1.0}
+        requests.append((path, body))
+    return requests
+
+
+async def run_load(host, port, requests, concurrency):
+    latencies = []
+    failures = 0
+    queue = asyncio.Queue()
+    for r in requests:
+        queue.put_nowait(r)
+
+    async def worker():
+        nonlocal failures
+        client = await Client(host, port).connect()
+        try:
+            while not queue.empty():
+                path, body = queue.get_nowait()
+                start = time.perf_counter()
+                status, _ = await client.request('POST', path, body)
+                latencies.append(time.perf_counter() - start)
+                failures += status != 200
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return np.array(latencies), failures, time.perf_counter() - start
+
+
+async def run(args):
+    claims, _ = load_claims()
+    payloads = claim_payloads(claims)
+
+    service = None
+    if args.url:
+        host, port = args.url.replace('http://', '').rstrip('/').split(':')
+        port = int(port)
+    else:
+        service = await ScoringService(port=0, workers=args.workers, max_batch=args.max_batch,
+                                       max_delay_ms=args.max_delay_ms).start()
+        host, port = service.host, service.port
+
+    try:
+        # Correctness: the full dataset through /score matches the calculator
+        client = await Client(host, port).connect()
+        _, served = await client.request('POST', '/score', {'claims': payloads})
+        expected = compute_scores(claims.astype({'category': object, 'section': object}))
+        mismatched = [k for k in ('weighted_sum', 'n_eff', 'final_c_score')
+                      if not np.isclose(served[k], expected[k])]
+        print(f"[+] /score on the full dataset: {served['final_c_score']:.2f} "
+              f"({'matches' if not mismatched else 'DIFFERS from'} c_score_calculator.py)")
+
+        requests = make_requests(payloads, args.requests)
+        latencies, failures, elapsed = await run_load(host, port, requests, args.concurrency)
+        _, stats = await client.request('GET', '/stats')
+        await client.close()
+    finally:
+        if service:
+            await service.stop()
+
+    ms = latencies * 1000
+    print(f"\n  Requests:     {len(latencies)} ({failures} failed), concurrency {args.concurrency}")
+    print(f"  Throughput:   {len(latencies) / elapsed:,.0f} req/s")
+    print(f"  Latency p50:  {np.percentile(ms, 50):.2f} ms")
+    print(f"  Latency p99:  {np.percentile(ms, 99):.2f} ms")
+    print(f"  Batches:      {stats['batches']} (mean {stats['mean_batch']:.1f}, max {stats['max_batch']} requests)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the local scoring service.')
+    parser.add_argument('--url', help='running service, e.g. http://127.0.0.1:8765 (default: start one in-process)')
+    parser.add_argument('--requests', type=int, default=REQUESTS)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH)
+    parser.add_argument('--max-delay-ms', type=float, default=MAX_DELAY_MS)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: SCORING SERVICE LOAD TEST")
+    print("=" * 80)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
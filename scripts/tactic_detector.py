@@ -0,0 +1,198 @@
+"""
+FILE: tactic_detector.py
+PURPOSE: Automated greenwashing tactic-flag detector.
+         Scans each report's claims in one pass and proposes tactic flags
+         (same uint8 bitmask / comma-separated format the penalty stage
+         consumes) together with the evidence span behind each flag.
+"""
+
+import pandas as pd
+import numpy as np
+import re
+from claims_loader import REPORT_COL, TACTICS, TACTIC_BITS, load_claims, format_tactics
+from scoring_kernel import score_report
+from element_extractor import QUANTITY
+
+# --- CLAIM-LEVEL RULES ---
+
+# IntensityTricks: intensity metric (a quantity is reported or targeted) with no absolute figure alongside it
+INTENSITY = re.compile(r'\b(?:carbon|emissions?|ghg|energy|water)[- ]intensity\b|\bintensity[- ]based\b'
+                       r'|\bper (?:unit|employee|revenue|mwh|tonne|\$\s?m(?:illion)?)\b', re.IGNORECASE)
+ABSOLUTE = re.compile(r'\babsolute\b|\b\d[\d,.]*\s*(?:m|k)?t(?:onnes)?\s*co2e?\b|\btco2e?\b', re.IGNORECASE)
+
+# OffsetsOnly: neutrality achieved through offsets, no reduction pathway
+NEUTRALITY = re.compile(r'\b(?:carbon|climate)[- ]neutral(?:ity)?\b|\bnet[- ]zero operations\b'
+                        r'|\boffset(?:s|ting)?\b|\bcarbon credits?\b', re.IGNORECASE)
+REDUCTION = re.compile(r'\breduc(?:e|ed|ing|tion|tions)\b|\brenewable\b|\befficien(?:cy|t)\b'
+                       r'|\bdecarboni[sz]', re.IGNORECASE)
+
+# BaselineManipulation: baseline moved or restated
+REBASELINE = re.compile(r'\bre-?baselin\w*|\brestated? (?:our |the )?base(?:line| year)\b'
+                        r'|\b(?:changed|updated|recalculated|moved) (?:our |the )?base(?:line| year)\b'
+                        r'|\bnew base(?:line| year)\b', re.IGNORECASE)
+
+# WeakTargets: long-dated target (2040+) with no interim milestone
+TARGET = re.compile(r'\b(?:net[- ]zero|target|goal|commit\w*)\b', re.IGNORECASE)
+# ...set by the reporting company itself, not described for its clients
+COMPANY_SUBJECT = re.compile(r'\bwe\b|\bour (?:firm|company|group|bank|operations)\b', re.IGNORECASE)
+# ...and not a goal the company only helps others reach ("help move the world to net-zero")
+FACILITATION = re.compile(r'\bhelp(?:s|ing)?\b|\bsupport(?:s|ing)?\b|\benabl(?:e|es|ing)\b'
+                          r'|\bengag(?:e|es|ing) with\b', re.IGNORECASE)
+YEAR = re.compile(r'\b20\d\d\b')
+# ...where baseline years ("from a 2019 baseline", "compared to 2019 levels") are not target years
+BASELINE_YEAR = re.compile(r'\b20\d\d\s*-?\s*(?:base\s*(?:year|line)|levels?)\b'
+                           r'|\bbase\s*(?:year|line)\s+(?:of\s+)?20\d\d\b'
+                           r'|\b(?:from|against|since|(?:compared|relative)\s+(?:to|with))\s+(?:(?:a|the|our)\s+)?20\d\d\b',
+                           re.IGNORECASE)
+
+# SelectiveDisclosure: results reported for a hand-picked subset
+SELECTIVE = re.compile(r'\bselect(?:ed)? (?:portfolios?|sectors?|clients|operations|facilities|sites)\b'
+                       r'|\ba (?:subset|portion) of\b|\bexclud(?:es|ing)\b|\bcertain (?:sectors|operations|sites)\b',
+                       re.IGNORECASE)
+
+# --- REPORT-LEVEL RULE ---
+
+# ScopeOmission: operational (Scope 1/2) credentials without a quantified Scope 3 / financed pathway
+OPERATIONAL = re.compile(r'\bscopes? 1(?: and |\s*&\s*|,\s*)2\b|\boperational\b|\bcarbon[- ]neutral\b'
+                         r'|\brenewable electricity\b', re.IGNORECASE)
+SCOPE3 = re.compile(r'\bscope 3\b|\bfinanced emissions\b|\bvalue chain\b|\bsupply chain\b', re.IGNORECASE)
+QUANTIFIED_REDUCTION = re.compile(r'\b\d+(?:\.\d+)?\s*%\s*(?:reduction|lower|decrease)|\breduce\w*\b[^.]*?\d+(?:\.\d+)?\s*%',
+                                  re.IGNORECASE)
+
+# Tactics judged across a whole report; the hand flag may sit on any of its claims
+REPORT_LEVEL = ('ScopeOmission',)
+
+EVIDENCE_COLUMNS = [REPORT_COL, 'claim_id', 'tactic', 'start', 'end', 'evidence', 'rule']
+
+
+def _flags(texts, pattern):
+    return texts.str.contains(pattern).to_numpy()
+
+
+def _span(text, pattern):
+    m = pattern.search(text)
+    return (m.start(), m.end()) if m else (0, 0)
+
+
+def detect_tactics(claims):
+    """
+    Propose tactic flags for every claim.
+
+    Returns (mask, evidence): a uint8 tactic mask aligned with `claims` and a
+    DataFrame with one row per flag (report_id, claim_id, tactic, start, end,
+    evidence, rule). Report-level tactics are attached once per report, to
+    the claim that triggered them.
+    """
+    texts = claims['verbatim_text'].astype(str).reset_index(drop=True)
+    claim_ids = claims['claim_id'].astype(str).to_numpy()
+    reports = (claims[REPORT_COL].astype(str).to_numpy() if REPORT_COL in claims
+               else np.full(len(claims), '', dtype=object))
+
+    # One vectorized scan per pattern over the whole corpus. Baseline years are
+    # blanked (same length, so evidence offsets still index the original text)
+    target_text = texts.str.replace(BASELINE_YEAR, lambda m: ' ' * len(m.group()), regex=True)
+    years = target_text.str.findall(YEAR)
+    min_year = years.map(lambda ys: min(map(int, ys)) if ys else 0).to_numpy()
+
+    # tactic -> (hit, evidence pattern, text the pattern is searched in, rule)
+    hits = {
+        'IntensityTricks': (_flags(texts, INTENSITY) & _flags(texts, QUANTITY) & ~_flags(texts, ABSOLUTE), INTENSITY,
+                            texts, 'intensity metric without absolute figure'),
+        'OffsetsOnly': (_flags(texts, NEUTRALITY) & ~_flags(texts, REDUCTION), NEUTRALITY, texts,
+                        'neutrality/offset claim without reduction pathway'),
+        'BaselineManipulation': (_flags(texts, REBASELINE), REBASELINE, texts, 'baseline restated or moved'),
+        'WeakTargets': (_flags(texts, TARGET) & _flags(texts, COMPANY_SUBJECT) & ~_flags(texts, FACILITATION)
+                        & (min_year >= 2040), YEAR, target_text, 'long-dated target without interim milestone'),
+        'SelectiveDisclosure': (_flags(texts, SELECTIVE), SELECTIVE, texts, 'results for a selected subset only'),
+    }
+
+    mask = np.zeros(len(texts), dtype=np.uint8)
+    evidence = []
+    for tactic, (hit, pattern, searched, rule) in hits.items():
+        mask[hit] |= np.uint8(TACTIC_BITS[tactic])
+        for i in np.flatnonzero(hit):
+            start, end = _span(searched[i], pattern)
+            evidence.append((reports[i], claim_ids[i], tactic, start, end, texts[i][start:end], rule))
+
+    # Report-level ScopeOmission, aggregated per report with one groupby
+    frame = pd.DataFrame({
+        'report': reports,
+        'operational': _flags(texts, OPERATIONAL),
+        'scope3_quantified': _flags(texts, SCOPE3) & _flags(texts, QUANTIFIED_REDUCTION),
+    })
+    per_report = frame.groupby('report', sort=False).agg(
+        operational=('operational', 'any'), scope3_quantified=('scope3_quantified', 'any'))
+    omitting = per_report.index[per_report['operational'] & ~per_report['scope3_quantified']]
+    first_operational = frame[frame['operational'] & frame['report'].isin(omitting)].groupby('report', sort=False).head(1)
+    for i in first_operational.index:
+        mask[i] |= np.uint8(TACTIC_BITS['ScopeOmission'])
+        start, end = _span(texts[i], OPERATIONAL)
+        evidence.append((reports[i], claim_ids[i], 'ScopeOmission', start, end, texts[i][start:end],
+                         'operational credentials without quantified Scope 3 / financed emissions pathway'))
+
+    evidence = pd.DataFrame(evidence, columns=EVIDENCE_COLUMNS)
+    order = pd.Categorical(evidence['tactic'], categories=TACTICS)
+    evidence = evidence.assign(_order=order.codes).sort_values([REPORT_COL, 'claim_id', '_order'])
+    return mask, evidence.drop(columns='_order').reset_index(drop=True)
+
+
+def compare_flags(claims, mask):
+    """
+    Per-tactic precision/recall of proposed flags against the hand-entered
+    tactic_mask. Claim-level tactics are compared claim by claim; report-level
+    tactics report by report, since the hand flag may be attached to a
+    different claim of the same report than the one that triggered the rule.
+    """
+    hand = claims['tactic_mask'].to_numpy()
+    reports = (claims[REPORT_COL].astype(str).to_numpy() if REPORT_COL in claims
+               else np.full(len(claims), '', dtype=object))
+    rows = {}
+    for tactic in TACTICS:
+        bit = TACTIC_BITS[tactic]
+        h, p = pd.Series(hand & bit > 0), pd.Series(mask & bit > 0)
+        if tactic in REPORT_LEVEL:
+            h, p = h.groupby(reports).any(), p.groupby(reports).any()
+        tp = int((h & p).sum())
+        rows[tactic] = {
+            'unit': 'report' if tactic in REPORT_LEVEL else 'claim',
+            'hand': int(h.sum()),
+            'proposed': int(p.sum()),
+            'precision': tp / p.sum() if p.any() else np.nan,
+            'recall': tp / h.sum() if h.any() else np.nan,
+            'matches': bool((h == p).all()),
+        }
+    return pd.DataFrame(rows).T
+
+
+def main():
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: TACTIC-FLAG DETECTOR")
+    print("=" * 80)
+
+    claims, _ = load_claims()
+    mask, evidence = detect_tactics(claims)
+    proposed = format_tactics(mask)
+
+    print(f"[+] {int((mask > 0).sum())} claims flagged, {len(evidence)} evidence spans")
+    for _, e in evidence.iterrows():
+        print(f"  {e['claim_id']}: {e['tactic']:22s} '{e['evidence']}' ({e['rule']})")
+
+    hand = claims['tactic_mask'].to_numpy()
+    comparison = compare_flags(claims, mask)
+    print("\nHand-entered vs proposed flags:")
+    print(comparison.drop(columns='matches').to_string(na_rep='-', float_format=lambda x: f"{x:.2f}"))
+    if comparison['matches'].all():
+        print("[+] Proposed flags match the hand flags on the labeled sample")
+    else:
+        print(f"[!] Proposed flags differ from the hand flags for: {', '.join(comparison.index[~comparison['matches']])}")
+
+    codes = claims['category'].cat.codes.to_numpy()
+    hand_score = score_report(codes, claims['weight'], hand)['final_c_score']
+    proposed_score = score_report(codes, claims['weight'], mask)['final_c_score']
+    print(f"\nC_Score with hand flags:     {hand_score:.2f}")
+    print(f"C_Score with proposed flags: {proposed_score:.2f}")
+    print(f"Proposed tactic_flags column: {sorted(set(proposed) - {''})}")
+
+
+if __name__ == "__main__":
+    main()
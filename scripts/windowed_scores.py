@@ -0,0 +1,244 @@
+"""
+FILE: windowed_scores.py
+PURPOSE: Rolling credibility scores over dated claims.
+         Two modes, both per company (report_id; report C_Score with
+         penalties) and per company x section (section score):
+           - trailing window: claims dated within the last window_days;
+           - exponential decay: every claim weighted 0.5 ** (age / half_life).
+         Window aggregates are updated incrementally at each refresh: claims
+         entering the window are added and claims leaving it subtracted, for
+         all companies at once, so a daily refresh costs O(claims changed +
+         companies) instead of rescoring every window. Trailing sums are
+         fixed-point (scoring_kernel exact mode), so adding and removing
+         claims never drifts from a full rescore.
+"""
+
+import pandas as pd
+import numpy as np
+import argparse
+import time
+from claims_loader import NONCLAIM_CODE, REPORT_COL, load_claims
+from scoring_kernel import PENALTY_TABLE, effective_denominator, final_score, from_fixed, group_aggregates
+from results_export import ResultsWriter
+
+DATE_COL = 'disclosure_date'
+REPORT_SECTION = 'ALL'      # section label of the report-level series
+
+WINDOW_DAYS = 365
+HALF_LIFE_DAYS = 180
+
+SERIES_FIELDS = [('date', 'string'), (REPORT_COL, 'string'), ('section', 'string'), ('score', 'float64'),
+                 ('n_total', 'float64'), ('n_eff', 'float64')]
+
+
+class TrailingWindow:
+    """Exact per-group aggregates of the claims currently inside the window."""
+
+    FIELDS = ('n_total', 'n_nc', 'weighted_fixed', 'penalty_fixed')
+
+    def __init__(self, n_groups):
+        self.n_groups = n_groups
+        self.sums = {k: np.zeros(n_groups, dtype=np.int64) for k in self.FIELDS}
+
+    def update(self, groups, category, weight, tactic_mask, sign=1):
+        """Add (sign=1) or remove (sign=-1) a batch of claims."""
+        if len(groups):
+            delta = group_aggregates(groups, self.n_groups, category, weight, tactic_mask, exact=True)
+            for k in self.FIELDS:
+                self.sums[k] += sign * delta[k]
+
+    def aggregates(self):
+        return {
+            'n_total': self.sums['n_total'].astype(np.float64),
+            'n_eff': effective_denominator(self.sums['n_total'], self.sums['n_nc']).astype(np.float64),
+            'weighted_sum': from_fixed(self.sums['weighted_fixed']),
+            'penalty_sum': from_fixed(self.sums['penalty_fixed']),
+        }
+
+
+class DecayedWindow:
+    """
+    Per-group aggregates with every claim weighted 0.5 ** (age / half_life).
+    n_total and n_nc are decayed counts, so n_eff is continuous here: the
+    adaptive rule of effective_denominator without the integer floor.
+    """
+
+    def __init__(self, n_groups, half_life_days=HALF_LIFE_DAYS):
+        self.half_life = half_life_days
+        self.sums = {k: np.zeros(n_groups) for k in ('n_total', 'n_nc', 'weighted_sum', 'penalty_sum')}
+        self.n_groups = n_groups
+
+    def advance(self, days):
+        factor = 0.5 ** (days / self.half_life)
+        for v in self.sums.values():
+            v *= factor
+
+    def update(self, groups, category, weight, tactic_mask, age_days):
+        decay = 0.5 ** (np.asarray(age_days, dtype=np.float64) / self.half_life)
+        n = self.n_groups
+        self.sums['n_total'] += np.bincount(groups, weights=decay, minlength=n)
+        self.sums['n_nc'] += np.bincount(groups, weights=decay * (category == NONCLAIM_CODE), minlength=n)
+        self.sums['weighted_sum'] += np.bincount(groups, weights=decay * weight, minlength=n)
+        self.sums['penalty_sum'] += np.bincount(groups, weights=decay * PENALTY_TABLE[tactic_mask], minlength=n)
+
+    def aggregates(self):
+        s = self.sums
+        n_eff = np.where(s['n_nc'] <= 0.5 * s['n_total'], s['n_total'] - s['n_nc'], 0.5 * s['n_total'])
+        return {'n_total': s['n_total'].copy(), 'n_eff': n_eff,
+                'weighted_sum': s['weighted_sum'].copy(), 'penalty_sum': s['penalty_sum'].copy()}
+
+
+def _prepare(claims):
+    """Claims sorted by date with report and (company, section) group ids."""
+    claims = claims.sort_values(DATE_COL, kind='stable')
+    company_ids, companies = pd.factorize(claims[REPORT_COL].astype(str))
+    pair_ids, pairs = pd.factorize(pd.MultiIndex.from_arrays([company_ids, claims['section'].astype(str)]))
+    return {
+        'days': claims[DATE_COL].to_numpy('datetime64[D]').astype(np.int64),
+        'company': company_ids, 'pair': pair_ids,
+        'category': claims['category'].cat.codes.to_numpy(),
+        'weight': claims['weight'].to_numpy(np.float64),
+        'mask': claims['tactic_mask'].to_numpy(),
+        'companies': np.asarray(companies),
+        'pair_company': np.asarray(companies)[pairs.get_level_values(0)],
+        'pair_section': np.asarray(pairs.get_level_values(1)),
+    }
+
+
+def _series_frame(day, report, sections, data):
+    """Rows for every company / section with claims in the window."""
+    report_scores = final_score(report['weighted_sum'], report['n_eff'], report['penalty_sum'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        section_scores = 100 * sections['weighted_sum'] / sections['n_eff']
+    live_r = report['n_total'] > 1e-9
+    live_s = (sections['n_total'] > 1e-9) & (sections['n_eff'] > 0)
+    date = str(np.datetime64(int(day), 'D'))
+    return pd.DataFrame({
+        'date': date,
+        REPORT_COL: np.concatenate([data['companies'][live_r], data['pair_company'][live_s]]),
+        'section': np.concatenate([np.full(live_r.sum(), REPORT_SECTION, dtype=object), data['pair_section'][live_s]]),
+        'score': np.concatenate([report_scores[live_r], section_scores[live_s]]),
+        'n_total': np.concatenate([report['n_total'][live_r], sections['n_total'][live_s]]),
+        'n_eff': np.concatenate([report['n_eff'][live_r], sections['n_eff'][live_s]]),
+    })
+
+
+def iter_window_scores(claims, refresh_dates, window_days=WINDOW_DAYS, half_life_days=None):
+    """
+    Yield one DataFrame of scores per refresh date (date, report_id, section,
+    score, n_total, n_eff; section 'ALL' is the report C_Score). Trailing
+    window by default; half_life_days switches to exponential decay over
+    all claims dated up to the refresh date.
+    """
+    data = _prepare(claims)
+    days = data['days']
+    n_companies, n_pairs = len(data['companies']), len(data['pair_section'])
+    cols = ('category', 'weight', 'mask')
+
+    def batch(lo, hi):
+        return [data[c][lo:hi] for c in cols]
+
+    if half_life_days is None:
+        report, sections = TrailingWindow(n_companies), TrailingWindow(n_pairs)
+    else:
+        report, sections = DecayedWindow(n_companies, half_life_days), DecayedWindow(n_pairs, half_life_days)
+
+    entered = left = 0          # claims [left, entered) are inside the window
+    previous = None
+    for date in pd.to_datetime(pd.Index(refresh_dates)).to_numpy('datetime64[D]').astype(np.int64):
+        if previous is not None and date < previous:
+            raise ValueError('refresh dates must be increasing')
+        upto = np.searchsorted(days, date, side='right')
+        if half_life_days is None:
+            since = np.searchsorted(days, date - window_days, side='right')
+            for window, key in ((report, 'company'), (sections, 'pair')):
+                window.update(data[key][entered:upto], *batch(entered, upto))
+                window.update(data[key][left:since], *batch(left, since), sign=-1)
+            left = since
+        else:
+            if previous is not None:
+                report.advance(date - previous)
+                sections.advance(date - previous)
+            for window, key in ((report, 'company'), (sections, 'pair')):
+                window.update(data[key][entered:upto], *batch(entered, upto), age_days=date - days[entered:upto])
+        entered, previous = upto, date
+        yield _series_frame(date, report.aggregates(), sections.aggregates(), data)
+
+
+def window_scores(claims, refresh_dates, **kwargs):
+    """All refreshes of iter_window_scores as one DataFrame."""
+    return pd.concat(iter_window_scores(claims, refresh_dates, **kwargs), ignore_index=True)
+
+
+def synthetic_dated_claims(claims, n_companies, start='2022-01-01', days=730, seed=0):
+    """Dated claims for n_companies, resampled from the labeled claims (demo data)."""
+    rng = np.random.default_rng(seed)
+    n = n_companies * len(claims)
+    rows = claims.iloc[rng.integers(0, len(claims), n)].reset_index(drop=True)
+    rows[REPORT_COL] = pd.Series(np.repeat(np.arange(n_companies), len(claims))).map('C{:06d}'.format)
+    # Quarterly disclosures: every company files on a fixed day of each quarter
+    quarter = rng.integers(0, days // 91, n)
+    offset = np.repeat(rng.integers(0, 91, n_companies), len(claims))
+    rows[DATE_COL] = np.datetime64(start) + (quarter * 91 + offset).astype('timedelta64[D]')
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rolling-window and decayed C_Score time series.')
+    parser.add_argument('--companies', type=int, default=5_000, help='synthetic coverage universe')
+    parser.add_argument('--window-days', type=int, default=WINDOW_DAYS)
+    parser.add_argument('--half-life-days', type=float, default=HALF_LIFE_DAYS)
+    parser.add_argument('--out', help='write the daily trailing series (.jsonl, or .arrow with pyarrow)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("C_SCORE FRAMEWORK: ROLLING-WINDOW SCORES")
+    print("=" * 80)
+
+    claims, _ = load_claims()
+    dated = synthetic_dated_claims(claims, args.companies)
+    refresh = pd.date_range('2023-01-01', '2023-12-31', freq='D')
+    print(f"[+] {len(dated):,} dated claims for {args.companies:,} synthetic companies, "
+          f"{len(refresh)} daily refreshes")
+
+    start = time.perf_counter()
+    rows = 0
+    writer = ResultsWriter(args.out, SERIES_FIELDS) if args.out else None
+    for frame in iter_window_scores(dated, refresh, window_days=args.window_days):
+        rows += len(frame)
+        if writer:
+            writer.write(frame)
+        last = frame
+    if writer:
+        writer.close()
+    print(f"[+] Trailing {args.window_days}-day window: {rows:,} series points in "
+          f"{time.perf_counter() - start:.1f}s")
+
+    # Incremental window vs rescoring the last window from scratch
+    final_day = refresh[-1]
+    inside = dated[(dated[DATE_COL] > final_day - pd.Timedelta(days=args.window_days)) &
+                   (dated[DATE_COL] <= final_day)]
+    company_ids, names = pd.factorize(inside[REPORT_COL])
+    agg = group_aggregates(company_ids, len(names), inside['category'].cat.codes.to_numpy(),
+                           inside['weight'].to_numpy(), inside['tactic_mask'].to_numpy(), exact=True)
+    rescored = pd.Series(final_score(agg['weighted_sum'], agg['n_eff'], agg['penalty_sum']), index=names)
+    incremental = last[last['section'] == REPORT_SECTION].set_index(REPORT_COL)['score']
+    same = np.array_equal(incremental.reindex(rescored.index).to_numpy(), rescored.to_numpy())
+    print(f"[+] Incremental window equals a full rescore on {final_day.date()}: {same}")
+
+    start = time.perf_counter()
+    decayed = window_scores(dated, refresh[::7], half_life_days=args.half_life_days)
+    print(f"[+] Decayed (half-life {args.half_life_days:g} days), weekly: {len(decayed):,} points in "
+          f"{time.perf_counter() - start:.1f}s")
+
+    company = dated[REPORT_COL].iloc[0]
+    series = decayed[(decayed[REPORT_COL] == company) & (decayed['section'] == REPORT_SECTION)]
+    trailing = window_scores(dated[dated[REPORT_COL] == company], refresh[::7], window_days=args.window_days)
+    trailing = trailing[trailing['section'] == REPORT_SECTION].set_index('date')['score']
+    print(f"\n{company}: C_Score by week (trailing window / decayed)")
+    for row in series.iloc[::4].itertuples():
+        print(f"  {row.date}  {trailing.get(row.date, np.nan):6.2f}  {row.score:6.2f}")
+
+
+if __name__ == "__main__":
+    main()